@@ -5,6 +5,9 @@ from sqlalchemy import pool
 
 from alembic import context
 from app.models.user_model import Base  # adjust "myapp.models" to the actual location of your Base
+from app.models import refresh_token_model  # noqa: F401 - registers the table with Base.metadata
+from app.models import revoked_token_model  # noqa: F401
+from app.models import users_revision_model  # noqa: F401
 
 
 # this is the Alembic Config object, which provides
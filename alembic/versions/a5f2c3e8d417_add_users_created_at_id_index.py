@@ -0,0 +1,26 @@
+"""add users (created_at, id) index for keyset pagination
+
+Revision ID: a5f2c3e8d417
+Revises: 7c41d0a9b8e2
+Create Date: 2026-10-17 12:20:08.774251
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5f2c3e8d417'
+down_revision: Union[str, None] = '7c41d0a9b8e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_created_at_id', table_name='users')
@@ -0,0 +1,32 @@
+"""add lower() text_pattern_ops indexes for short user search terms
+
+Revision ID: b7e1d4a3c925
+Revises: f4d2c7a91b36
+Create Date: 2026-10-18 10:12:37.481920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1d4a3c925'
+down_revision: Union[str, None] = 'f4d2c7a91b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREFIX_COLUMNS = ('nickname', 'email', 'first_name', 'last_name')
+
+
+def upgrade() -> None:
+    # Serve lower(column) LIKE 'jo%' for terms too short for the trigram indexes.
+    for column in PREFIX_COLUMNS:
+        op.create_index(f'ix_users_{column}_lower_prefix', 'users',
+                        [sa.text(f'lower({column}) text_pattern_ops')], unique=False)
+
+
+def downgrade() -> None:
+    for column in PREFIX_COLUMNS:
+        op.drop_index(f'ix_users_{column}_lower_prefix', table_name='users')
@@ -0,0 +1,33 @@
+"""add pg_trgm GIN indexes for fuzzy user search
+
+Revision ID: c81e4b7f2a90
+Revises: a5f2c3e8d417
+Create Date: 2026-10-17 13:41:27.093512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81e4b7f2a90'
+down_revision: Union[str, None] = 'a5f2c3e8d417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = ('nickname', 'email', 'first_name', 'last_name')
+
+
+def upgrade() -> None:
+    # pg_trgm is a trusted extension since PostgreSQL 13, so the database owner can create it.
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(f'ix_users_{column}_trgm', 'users', [column], unique=False,
+                        postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    for column in TRIGRAM_COLUMNS:
+        op.drop_index(f'ix_users_{column}_trgm', table_name='users')
@@ -0,0 +1,50 @@
+"""add users_revision counter bumped by a statement trigger on users
+
+Revision ID: d2a8f5c6e1b3
+Revises: b7e1d4a3c925
+Create Date: 2026-10-19 09:41:18.204517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a8f5c6e1b3'
+down_revision: Union[str, None] = 'b7e1d4a3c925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of LISTED_USER_COLUMNS at this revision.
+LISTED_COLUMNS = ('nickname', 'email', 'first_name', 'last_name', 'bio', 'profile_picture_url',
+                  'linkedin_profile_url', 'github_profile_url', 'role', 'is_professional', 'created_at')
+
+
+def upgrade() -> None:
+    op.create_table('users_revision',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('revision', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO users_revision (id, revision) VALUES (1, 0)")
+    op.execute("""
+    CREATE OR REPLACE FUNCTION bump_users_revision() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE users_revision SET revision = revision + 1 WHERE id = 1;
+        RETURN NULL;
+    END
+    $$
+    """)
+    op.execute(
+        "CREATE TRIGGER users_revision_bump "
+        f"AFTER INSERT OR DELETE OR TRUNCATE OR UPDATE OF {', '.join(LISTED_COLUMNS)} ON users "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_users_revision()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS users_revision_bump ON users")
+    op.execute("DROP FUNCTION IF EXISTS bump_users_revision()")
+    op.drop_table('users_revision')
@@ -0,0 +1,26 @@
+"""add users.version for optimistic concurrency
+
+Revision ID: e3b9a6d10c54
+Revises: c81e4b7f2a90
+Create Date: 2026-10-17 15:02:44.160382
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9a6d10c54'
+down_revision: Union[str, None] = 'c81e4b7f2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'version')
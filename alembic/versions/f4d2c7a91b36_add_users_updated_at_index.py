@@ -0,0 +1,26 @@
+"""add users updated_at index for list Last-Modified
+
+Revision ID: f4d2c7a91b36
+Revises: e3b9a6d10c54
+Create Date: 2026-10-17 16:42:51.203118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4d2c7a91b36'
+down_revision: Union[str, None] = 'e3b9a6d10c54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_updated_at', 'users', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_updated_at', table_name='users')
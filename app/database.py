@@ -1,21 +1,243 @@
+from builtins import Exception, dict, enumerate, int, str
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.utils.metrics import Histogram, register_metrics
+from settings.config import Settings, get_settings
 
 Base = declarative_base()
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited and how many timed out."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_seconds = Histogram()
+        self.timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_seconds.observe(time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            "timeouts": self.timeouts,
+            "wait_seconds": self.wait_seconds.snapshot(),
+        }
+
+
+def engine_options(database_url: str, settings: Settings) -> dict:
+    """Build ``create_async_engine`` keyword arguments from the pool and driver settings."""
+    options = {
+        "poolclass": InstrumentedAsyncPool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if make_url(database_url).get_driver_name() == "asyncpg":
+        connect_args = {
+            # asyncpg's own cache and SQLAlchemy's adapter cache; both must be 0 behind pgbouncer.
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        }
+        if settings.db_statement_timeout_ms:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+        options["connect_args"] = connect_args
+    return options
+
+
+# session.info key set once a session has written; its reads then stay on the primary.
+PINNED_TO_PRIMARY = "pinned_to_primary"
+_READ_SESSION = "read_session"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _pin_after_write_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[PINNED_TO_PRIMARY] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _pin_after_flush(session, flush_context):
+    session.info[PINNED_TO_PRIMARY] = True
+
+
+_UNIT_OF_WORK = "unit_of_work"
+_ON_COMMIT = "unit_of_work_on_commit"
+
+
+class UnitOfWork:
+    """
+    Request-scoped transaction: one transaction per request, committed once at the end.
+
+    Services call ``UnitOfWork.commit(session)`` where they used to commit. Inside a unit of
+    work that only flushes, so constraint violations still surface at the same point, and
+    the real COMMIT happens in ``finish``. Plain reads never commit. Outside a unit of work
+    (scripts, background tasks, tests using a bare session) ``commit`` commits immediately.
+    """
+    requests = 0
+    commits = 0
+    rollbacks = 0
+    commits_saved = 0
+    saved_per_request = Histogram(buckets=(0, 1, 2, 3, 5, 10, 20))
+
+    @classmethod
+    def begin(cls, session: AsyncSession) -> None:
+        session.info[_UNIT_OF_WORK] = 0
+
+    @classmethod
+    def active(cls, session: AsyncSession) -> bool:
+        return _UNIT_OF_WORK in session.info
+
+    @classmethod
+    def skip_commit(cls, session: AsyncSession) -> None:
+        """Record a read that would have been followed by a COMMIT before units of work existed."""
+        if _UNIT_OF_WORK in session.info:
+            session.info[_UNIT_OF_WORK] += 1
+
+    @classmethod
+    async def commit(cls, session: AsyncSession) -> None:
+        if _UNIT_OF_WORK in session.info:
+            await session.flush()
+            session.info[_UNIT_OF_WORK] += 1
+        else:
+            await session.commit()
+
+    @classmethod
+    def on_commit(cls, session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+        """Await ``callback`` once the unit of work has committed; it is dropped on rollback."""
+        session.info.setdefault(_ON_COMMIT, []).append(callback)
+
+    @classmethod
+    async def after_commit(cls, session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+        """
+        Await ``callback`` once the session's writes are committed: when the unit of work
+        commits, or right away outside one, where ``commit`` has already committed them.
+        """
+        if _UNIT_OF_WORK in session.info:
+            cls.on_commit(session, callback)
+        else:
+            await callback()
+
+    @classmethod
+    async def finish(cls, session: AsyncSession, commit: bool = True) -> None:
+        """End the unit of work: commit if the session wrote anything, otherwise just release it."""
+        deferred = session.info.pop(_UNIT_OF_WORK, None)
+        callbacks = session.info.pop(_ON_COMMIT, [])
+        if deferred is None:
+            return
+        cls.requests += 1
+        if not commit:
+            await session.rollback()
+            cls.rollbacks += 1
+            return
+        if session.info.get(PINNED_TO_PRIMARY):
+            await session.commit()
+            cls.commits += 1
+            deferred -= 1
+        cls.commits_saved += deferred
+        cls.saved_per_request.observe(deferred)
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception as e:
+                # The transaction is already committed; a failed follow-up must not fail the request.
+                logger.error(f"Unit of work on_commit callback failed: {e}")
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {
+            "requests": cls.requests,
+            "commits": cls.commits,
+            "rollbacks": cls.rollbacks,
+            "commits_saved": cls.commits_saved,
+            "saved_per_request": cls.saved_per_request.snapshot(),
+        }
+
 
 class Database:
     """Handles database connections and sessions."""
     _engine = None
     _session_factory = None
+    _replica_engines: List = []
+    _replica_factories: Optional[Iterator] = None
 
     @classmethod
-    def initialize(cls, database_url: str, echo: bool = False):
-        """Initialize the async engine and sessionmaker."""
+    def initialize(cls, database_url: str, echo: bool = False, settings: Optional[Settings] = None):
+        """Initialize the async engine and sessionmaker, taking pool options from ``settings``."""
+        settings = settings or get_settings()
         if cls._engine is None:  # Ensure engine is created once
-            cls._engine = create_async_engine(database_url, echo=echo, future=True)
+            options = engine_options(database_url, settings)
+            cls._engine = create_async_engine(database_url, echo=echo, future=True, **options)
             cls._session_factory = sessionmaker(
                 bind=cls._engine, class_=AsyncSession, expire_on_commit=False, future=True
             )
+            replica_urls = [url.strip() for url in settings.database_replica_urls.split(",") if url.strip()]
+            if replica_urls:
+                cls.initialize_replicas(replica_urls, echo, settings)
+
+    @classmethod
+    def initialize_replicas(cls, replica_urls: List[str], echo: bool = False, settings: Optional[Settings] = None):
+        """Create one engine per read replica; read sessions are handed out round-robin."""
+        settings = settings or get_settings()
+        cls._replica_engines = [
+            create_async_engine(url, echo=echo, future=True, **engine_options(url, settings)) for url in replica_urls
+        ]
+        cls._replica_factories = itertools.cycle([
+            sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False, future=True)
+            for engine in cls._replica_engines
+        ])
+
+    @classmethod
+    async def dispose_replicas(cls):
+        for engine in cls._replica_engines:
+            await engine.dispose()
+        cls._replica_engines, cls._replica_factories = [], None
+
+    @classmethod
+    def read_session_for(cls, session: AsyncSession) -> AsyncSession:
+        """
+        Session to use for a read-only query issued on behalf of ``session``.
+
+        Returns a replica session, created once per primary session, unless no replicas are
+        configured or ``session`` has already written: then reads stay on the primary so the
+        caller sees its own writes despite replication lag. Other sessions may still read
+        slightly stale data from a replica.
+        """
+        if cls._replica_factories is None or session.info.get(PINNED_TO_PRIMARY):
+            return session
+        read_session = session.info.get(_READ_SESSION)
+        if read_session is None:
+            read_session = session.info[_READ_SESSION] = next(cls._replica_factories)()
+        return read_session
+
+    @classmethod
+    async def close_read_session(cls, session: AsyncSession) -> None:
+        read_session = session.info.pop(_READ_SESSION, None)
+        if read_session is not None:
+            await read_session.close()
 
     @classmethod
     def get_session_factory(cls):
@@ -23,3 +245,26 @@ class Database:
         if cls._session_factory is None:
             raise ValueError("Database not initialized. Call `initialize()` first.")
         return cls._session_factory
+
+    @classmethod
+    def get_read_session_factory(cls):
+        """Factory for standalone read-only sessions: the next replica's, or the primary's without replicas."""
+        if cls._replica_factories is not None:
+            return next(cls._replica_factories)
+        return cls.get_session_factory()
+
+    @classmethod
+    def pool_stats(cls) -> dict:
+        """Live connection pool statistics, or an empty dict before initialization."""
+        if cls._engine is None:
+            return {}
+        return cls._engine.pool.stats()
+
+    @classmethod
+    def replica_pool_stats(cls) -> dict:
+        return {f"replica_{i}": engine.pool.stats() for i, engine in enumerate(cls._replica_engines)}
+
+
+register_metrics("db_pool", Database.pool_stats)
+register_metrics("db_replica_pools", Database.replica_pool_stats)
+register_metrics("unit_of_work", UnitOfWork.stats)
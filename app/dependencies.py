@@ -2,31 +2,52 @@ from builtins import Exception, dict, str
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import Database
-from app.utils.template_manager import TemplateManager
+from app.database import Database, UnitOfWork
+from app.utils.template_manager import template_manager
 from app.services.email_service import EmailService
-from app.services.jwt_service import decode_token
-from settings.config import Settings
+from app.services.jwt_service import decode_token_cached
+from app.services.revocation_service import revocation_store
+from settings.config import get_settings
 from fastapi import Depends
 
-def get_settings() -> Settings:
-    """Return application settings."""
-    return Settings()
-
 def get_email_service() -> EmailService:
-    template_manager = TemplateManager()
     return EmailService(template_manager=template_manager)
 
 async def get_db() -> AsyncSession:
-    """Dependency that provides a database session for each request."""
+    """
+    Dependency that provides a database session for each request.
+
+    The request runs as one unit of work: services flush instead of committing and the
+    transaction commits once after the endpoint returns. HTTP errors raised by the endpoint
+    keep the work already done (e.g. a counted failed login before a 401); any other error
+    rolls it back and propagates unchanged to the app's exception handlers (WorkerPoolFull
+    becomes a 503 there).
+    """
     async_session_factory = Database.get_session_factory()
     async with async_session_factory() as session:
+        UnitOfWork.begin(session)
         try:
             yield session
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+            await UnitOfWork.finish(session)
+        except HTTPException:
+            await UnitOfWork.finish(session)
+            raise
+        except Exception:
+            await UnitOfWork.finish(session, commit=False)
+            raise
+        finally:
+            await Database.close_read_session(session)
         
 
+def get_read_session_factory():
+    """
+    Session factory for read-only work that outlives the request's ``get_db`` session.
+
+    Dependencies with ``yield`` are finalized before a streaming response body is sent, so
+    endpoints that stream from the database open their own session from this factory.
+    """
+    return Database.get_read_session_factory()
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
 def get_current_user(token: str = Depends(oauth2_scheme)):
@@ -35,8 +56,8 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    payload = decode_token(token)
-    if payload is None:
+    payload = decode_token_cached(token)
+    if payload is None or payload.get("type") == "refresh" or revocation_store.is_revoked(payload):
         raise credentials_exception
     user_id: str = payload.get("sub")
     user_role: str = payload.get("role")
@@ -1,11 +1,24 @@
-from builtins import Exception
+from builtins import AttributeError, Exception, NotImplementedError
+import asyncio
+import logging
+import signal
 from fastapi import FastAPI
+from pydantic import ValidationError
 from starlette.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware  # Import the CORSMiddleware
 from app.database import Database
 from app.dependencies import get_settings
-from app.routers import user_routes
+from app.routers import metrics_routes, user_routes
+from app.services.existence_filter import user_existence_filter
+from app.services.revocation_service import RevocationService
+from app.services.write_behind import last_login_buffer
 from app.utils.api_description import getDescription
+from app.utils.security import calibrate_default_hasher, get_default_hasher, shutdown_hash_pool
+from app.utils.worker_pool import WorkerPoolFull
+from settings.config import reload_settings
+
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="User Management",
     description=getDescription(),
@@ -28,15 +41,56 @@ app.add_middleware(
     allow_headers=["*"],  # Allowed HTTP headers
 )
 
+def _reload_settings_on_signal() -> None:
+    try:
+        changed = reload_settings()
+    except ValidationError as e:
+        logger.error(f"Settings reload rejected, keeping the current settings: {e.error_count()} invalid values")
+        return
+    logger.info(f"Settings reloaded; changed: {', '.join(changed) or 'nothing'}")
+
 @app.on_event("startup")
 async def startup_event():
     settings = get_settings()
-    Database.initialize(settings.database_url, settings.debug)
+    Database.initialize(settings.database_url, settings.debug, settings)
+    # Refuse to start with an unusable password_hash_algorithm rather than failing every login.
+    get_default_hasher()
+    if settings.password_hash_calibrate:
+        await asyncio.to_thread(calibrate_default_hasher, settings.password_hash_target_ms)
+    if settings.last_login_write_behind:
+        last_login_buffer.start(settings.last_login_flush_interval_seconds)
+    RevocationService.start(settings.token_revocation_reload_seconds)
+    if settings.existence_filter_enabled:
+        user_existence_filter.start(settings.existence_filter_rebuild_seconds,
+                                    settings.existence_filter_false_positive_rate,
+                                    settings.existence_filter_growth)
+    try:
+        # `kill -HUP <pid>` re-reads the environment and .env, like POST /settings/reload.
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, _reload_settings_on_signal)
+    except (AttributeError, NotImplementedError):
+        pass  # No SIGHUP or loop signal handlers on this platform.
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    try:
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+    except (AttributeError, NotImplementedError):
+        pass
+    await RevocationService.stop()
+    await user_existence_filter.stop()
+    await last_login_buffer.stop()
+    shutdown_hash_pool()
+
+@app.exception_handler(WorkerPoolFull)
+async def worker_pool_full_handler(request, exc):
+    # Shed load instead of queueing unbounded bcrypt work behind a login storm.
+    return JSONResponse(status_code=503, content={"message": "Server is busy, please retry."}, headers={"Retry-After": "1"})
 
 @app.exception_handler(Exception)
 async def exception_handler(request, exc):
     return JSONResponse(status_code=500, content={"message": "An unexpected error occurred."})
 
 app.include_router(user_routes.router)
+app.include_router(metrics_routes.router)
 
 
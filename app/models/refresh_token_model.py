@@ -0,0 +1,35 @@
+from datetime import datetime
+import uuid
+from sqlalchemy import Column, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class RefreshToken(Base):
+    """
+    Server-side record of an issued refresh token, corresponding to the 'refresh_tokens' table.
+
+    Every rotation marks the presented token as used and issues a new one in the same family.
+    Presenting a token that was already used means it leaked, so the whole family is revoked.
+
+    Attributes:
+        jti (UUID): Token identifier, also carried in the token's ``jti`` claim.
+        family_id (UUID): Shared by all tokens descending from one login.
+        user_id (UUID): Owner of the token.
+        expires_at (datetime): Expiry, mirrored from the token's ``exp`` claim.
+        created_at (datetime): Timestamp when the token was issued.
+        used_at (datetime): Set when the token was exchanged for a new pair.
+        revoked_at (datetime): Set when the token's family was revoked.
+    """
+    __tablename__ = "refresh_tokens"
+
+    jti: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    family_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), nullable=False, index=True)
+    user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
+    used_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    revoked_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<RefreshToken {self.jti}, family: {self.family_id}>"
@@ -0,0 +1,30 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, String, func
+from sqlalchemy.orm import Mapped
+from app.database import Base
+
+class RevokedToken(Base):
+    """
+    Persistent copy of an access-token revocation, corresponding to the 'revoked_tokens' table.
+
+    Checks are answered from memory; this table lets a restarted worker warm its revocation
+    store and lets workers pick up each other's revocations on reload. Rows are useless once
+    ``expires_at`` has passed and are purged by the reload task.
+
+    Attributes:
+        kind (str): ``jti`` for a single token, ``sub`` for every token of a subject.
+        key (str): The token id or the subject (user id or email, matching the ``sub`` claim).
+        not_before (datetime): For subject revocations, tokens issued at or before this time are rejected.
+        expires_at (datetime): When the revoked token(s) would have expired anyway.
+        created_at (datetime): Timestamp when the revocation was recorded.
+    """
+    __tablename__ = "revoked_tokens"
+
+    kind: Mapped[str] = Column(String(8), primary_key=True)
+    key: Mapped[str] = Column(String(255), primary_key=True)
+    not_before: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<RevokedToken {self.kind}:{self.key}>"
@@ -1,12 +1,13 @@
-from builtins import bool, int, str
+from builtins import bool, int, str, tuple
 from datetime import datetime
 from enum import Enum
 import uuid
 from sqlalchemy import (
-    Column, String, Integer, DateTime, Boolean, func, Enum as SQLAlchemyEnum
+    Column, String, Integer, DateTime, Boolean, Index, func, Enum as SQLAlchemyEnum
 )
 from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import column
 from app.database import Base
 
 class UserRole(Enum):
@@ -16,6 +17,32 @@ class UserRole(Enum):
     MANAGER = "MANAGER"
     ADMIN = "ADMIN"
 
+# Columns searched by POST /users/search; see UserService.fuzzy_clause.
+SEARCH_COLUMNS = ("nickname", "email", "first_name", "last_name")
+
+def _pg_trgm_installed(ddl, target, bind, **kw) -> bool:
+    """Only create the trigram indexes where pg_trgm exists; the migration installs it first."""
+    if bind is None:
+        return True
+    return bind.exec_driver_sql("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'").first() is not None
+
+def _search_indexes() -> tuple:
+    """
+    Indexes behind search, so autogenerate keeps them: ``lower(col) text_pattern_ops`` for
+    prefix matches of short terms, trigram GIN for fuzzy matches of longer ones.
+    """
+    prefix = tuple(
+        Index(f"ix_users_{name}_lower_prefix", func.lower(column(name)).label(f"{name}_lower"),
+              postgresql_ops={f"{name}_lower": "text_pattern_ops"})
+        for name in SEARCH_COLUMNS
+    )
+    trigram = tuple(
+        Index(f"ix_users_{name}_trgm", name, postgresql_using="gin", postgresql_ops={name: "gin_trgm_ops"})
+        .ddl_if(dialect="postgresql", callable_=_pg_trgm_installed)
+        for name in SEARCH_COLUMNS
+    )
+    return prefix + trigram
+
 class User(Base):
     """
     Represents a user within the application, corresponding to the 'users' table in the database.
@@ -42,6 +69,7 @@ class User(Base):
         is_locked (bool): Flag indicating if the account is locked.
         created_at (datetime): Timestamp when the user was created, set by the server.
         updated_at (datetime): Timestamp of the last update, set by the server.
+        version (int): Incremented by every change to the user's public profile; exposed as the ETag.
 
     Methods:
         lock_account(): Locks the user account.
@@ -52,6 +80,8 @@ class User(Base):
     """
     __tablename__ = "users"
     __mapper_args__ = {"eager_defaults": True}
+    # Keyset pagination order for GET /users/?cursor=..., then the search indexes.
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"), *_search_indexes())
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     nickname: Mapped[str] = Column(String(50), unique=True, nullable=False, index=True)
@@ -69,10 +99,12 @@ class User(Base):
     failed_login_attempts: Mapped[int] = Column(Integer, default=0)
     is_locked: Mapped[bool] = Column(Boolean, default=False)
     created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Indexed so max(updated_at), the Last-Modified of user lists, is a single index lookup.
+    updated_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
     verification_token = Column(String, nullable=True)
     email_verified: Mapped[bool] = Column(Boolean, default=False, nullable=False)
     hashed_password: Mapped[str] = Column(String(255), nullable=False)
+    version: Mapped[int] = Column(Integer, nullable=False, default=1, server_default="1")
 
 
     def __repr__(self) -> str:
@@ -0,0 +1,53 @@
+from builtins import int
+from sqlalchemy import BigInteger, Column, DDL, Integer, event
+from sqlalchemy.orm import Mapped
+from app.database import Base
+from app.models.user_model import User
+
+# Columns whose changes can alter a user list page: what UserResponse shows plus the sort key.
+# Keep in sync with USER_RESPONSE_COLUMNS; login bookkeeping (last_login_at, failed attempts,
+# lock state, password hash) and updated_at are deliberately absent.
+LISTED_USER_COLUMNS = (
+    "nickname", "email", "first_name", "last_name", "bio", "profile_picture_url",
+    "linkedin_profile_url", "github_profile_url", "role", "is_professional", "created_at",
+)
+
+class UsersRevision(Base):
+    """
+    Single-row counter of changes to listed user data, corresponding to the 'users_revision' table.
+
+    A statement-level trigger on ``users`` bumps ``revision`` in the writing transaction on
+    every INSERT, DELETE, TRUNCATE and UPDATE of LISTED_USER_COLUMNS, whoever issues it (API,
+    bulk import, manual SQL), so it becomes visible together with the change. The list ETag is
+    built from it. Writes that create, delete or edit users briefly serialize on this row;
+    logins and other bookkeeping updates never touch it.
+
+    Attributes:
+        id (int): Always 1.
+        revision (int): Incremented by every statement that changes listed user data.
+    """
+    __tablename__ = "users_revision"
+
+    id: Mapped[int] = Column(Integer, primary_key=True)
+    revision: Mapped[int] = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+
+BUMP_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION bump_users_revision() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE users_revision SET revision = revision + 1 WHERE id = 1;
+    RETURN NULL;
+END
+$$
+""")
+BUMP_TRIGGER = DDL(
+    "CREATE TRIGGER users_revision_bump "
+    f"AFTER INSERT OR DELETE OR TRUNCATE OR UPDATE OF {', '.join(LISTED_USER_COLUMNS)} ON users "
+    "FOR EACH STATEMENT EXECUTE FUNCTION bump_users_revision()"
+)
+
+# create_all (tests, fresh databases) gets the same row and trigger as the migration.
+event.listen(UsersRevision.__table__, "after_create",
+             DDL("INSERT INTO users_revision (id, revision) VALUES (1, 0)"))
+event.listen(User.__table__, "after_create", BUMP_FUNCTION.execute_if(dialect="postgresql"))
+event.listen(User.__table__, "after_create", BUMP_TRIGGER.execute_if(dialect="postgresql"))
@@ -0,0 +1,39 @@
+"""
+Operational endpoints, restricted to administrators.
+
+Metrics for sizing worker pools, caches and connection pools: each subsystem registers a
+provider with app.utils.metrics and this router exposes the collected snapshot. Settings can
+be reloaded here without a restart.
+"""
+
+from builtins import dict, str
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import ValidationError
+from app.dependencies import require_role
+from app.utils.metrics import collect_metrics
+from settings.config import reload_settings
+
+router = APIRouter()
+
+@router.get("/metrics", name="get_metrics", tags=["Monitoring Requires (Admin Role)"])
+async def get_metrics(current_user: dict = Depends(require_role(["ADMIN"]))):
+    """
+    Return a snapshot of every registered in-process metric, keyed by subsystem.
+    """
+    return collect_metrics()
+
+@router.post("/settings/reload", name="reload_settings", tags=["Monitoring Requires (Admin Role)"])
+async def reload_settings_endpoint(current_user: dict = Depends(require_role(["ADMIN"]))):
+    """
+    Re-read the environment and .env and atomically replace the settings snapshot, as SIGHUP does.
+
+    Returns the names of the changed settings; values are never echoed since some are secrets.
+    Invalid values are rejected with 400 and the current settings stay in effect. Settings used
+    to build long-lived objects (database pools, worker pools, cache sizes) need a restart.
+    """
+    try:
+        changed = reload_settings()
+    except ValidationError as e:
+        invalid = [".".join(str(part) for part in error["loc"]) for error in e.errors()]
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid settings: {', '.join(invalid)}")
+    return {"changed": changed}
@@ -20,17 +20,31 @@ Key Highlights:
 
 from builtins import dict, int, len, str
 from datetime import timedelta
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Response, status, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Response, status, Request
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.dependencies import get_current_user, get_db, get_email_service, require_role
+from app.database import UnitOfWork
+from app.dependencies import get_current_user, get_db, get_email_service, get_read_session_factory, require_role
 from app.schemas.pagination_schema import EnhancedPagination
-from app.schemas.token_schema import TokenResponse
-from app.schemas.user_schemas import LoginRequest, UserBase, UserCreate, UserListResponse, UserResponse, UserUpdate
-from app.services.user_service import UserService
-from app.services.jwt_service import create_access_token
-from app.utils.link_generation import create_user_links, generate_pagination_links
+from app.schemas.token_schema import RefreshTokenRequest, TokenResponse
+from app.schemas.user_schemas import (LoginRequest, UserBase, UserCreate, UserImportError, UserImportResponse, UserListResponse,
+                                      UserResponse, UserUpdate)
+from app.services.count_service import user_count_provider
+from app.services.existence_filter import user_existence_filter
+from app.services.import_service import UserImportService
+from app.services.user_service import (USER_CURSOR_COLUMNS, USER_EXPORT_COLUMNS, USER_RESPONSE_COLUMNS,
+                                       LoginStatus, StaleVersionError, UserFilter, UserService)
+from app.services.jwt_service import create_access_token, decode_token_cached
+from app.services.revocation_service import RevocationService
+from app.services.token_service import RefreshTokenService
+from app.utils.cursor import decode_cursor, encode_cursor
+from app.utils.etag import format_http_date, if_none_match, make_etag, make_list_etag, parse_http_date, parse_if_match
+from app.utils.link_generation import create_user_links, generate_cursor_links, generate_pagination_links
+from app.utils.rate_limiter import get_login_throttle
+from app.utils.record_stream import csv_chunks, iter_csv_records, iter_jsonl_records, ndjson_chunks
 from app.dependencies import get_settings
 from app.services.email_service import EmailService
 
@@ -42,9 +56,75 @@ from datetime import date, datetime
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
-settings = get_settings()
+def _user_response(user) -> UserResponse:
+    """Build a UserResponse from a User or a USER_RESPONSE_COLUMNS row; database values skip re-validation."""
+    return UserResponse.model_construct(**{column.key: getattr(user, column.key) for column in USER_RESPONSE_COLUMNS})
+
+def _validator_headers(etag: str, last_modified: Optional[datetime]) -> dict:
+    # Clients may keep the body but must revalidate it, which costs them a 304 when nothing changed.
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_http_date(last_modified)
+    return headers
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when there is no If-None-Match."""
+    tags = request.headers.get("if-none-match")
+    if tags is not None:
+        return if_none_match(tags, etag)
+    since = parse_http_date(request.headers.get("if-modified-since"))
+    # HTTP dates have whole seconds, so compare at that precision; the ETag is exact.
+    return since is not None and last_modified is not None and last_modified.replace(microsecond=0) <= since
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+# Encoder and media type per export format.
+EXPORT_ENCODERS = {
+    ExportFormat.ndjson: (ndjson_chunks, "application/x-ndjson"),
+    ExportFormat.csv: (csv_chunks, "text/csv"),
+}
+
+async def _export_chunks(session_factory, user_filter: UserFilter, encoder):
+    fields = [column.key for column in USER_EXPORT_COLUMNS]
+    async with session_factory() as session:
+        batches = UserService.stream(session, user_filter, USER_EXPORT_COLUMNS, get_settings().user_export_batch_size)
+        async for chunk in encoder(batches, fields):
+            yield chunk
+
+# Declared before /users/{user_id} so "export" is not taken for a user id.
+@router.get("/users/export", name="export_users", tags=["User Management Requires (Admin or Manager Roles)"],
+            responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}})
+async def export_users(
+    format: ExportFormat = Query(ExportFormat.ndjson, description="Output format: JSON Lines or CSV with a header row."),
+    nickname: str = Query(None, description="Only the user with this nickname."),
+    email: str = Query(None, description="Only the user with this email."),
+    role: UserRole = Query(None, description="Only users with this role."),
+    q: str = Query(None, min_length=2, description="Fuzzy match on nickname, email, first and last name; 2-character terms match prefixes."),
+    session_factory=Depends(get_read_session_factory),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"])),
+):
+    """
+    Stream every user matching the same filters as search (all users without filters) in
+    creation order, for analytics.
+
+    Rows are read through a server-side cursor on a read replica when one is configured, one
+    batch at a time, and each batch is only fetched once the client has taken the previous
+    one, so memory stays flat however large the export. The response has no total; it ends
+    when the last row has been sent.
+    """
+    encoder, media_type = EXPORT_ENCODERS[format]
+    user_filter = UserFilter().nickname(nickname).email(email).role(role).fuzzy(q)
+    return StreamingResponse(
+        _export_chunks(session_factory, user_filter, encoder),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{format.value}"'},
+    )
+
 @router.get("/users/{user_id}", response_model=UserResponse, name="get_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def get_user(user_id: UUID, request: Request, response: Response, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
     Endpoint to fetch a user by their unique identifier (UUID).
 
@@ -57,26 +137,16 @@ async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(g
         db: Dependency that provides an AsyncSession for database access.
         token: The OAuth2 access token obtained through OAuth2PasswordBearer dependency.
     """
-    user = await UserService.get_by_id(db, user_id)
+    # Served from the user cache when enabled; a 304 then costs neither a query nor serialization.
+    user = await UserService.get_profile(db, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    return UserResponse.model_construct(
-        id=user.id,
-        nickname=user.nickname,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        bio=user.bio,
-        profile_picture_url=user.profile_picture_url,
-        github_profile_url=user.github_profile_url,
-        linkedin_profile_url=user.linkedin_profile_url,
-        role=user.role,
-        email=user.email,
-        last_login_at=user.last_login_at,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-        links=create_user_links(user.id, request)  
-    )
+    validator_headers = _validator_headers(make_etag(user.version), user.updated_at)
+    if _not_modified(request, validator_headers["ETag"], user.updated_at):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers)
+    response.headers.update(validator_headers)
+    return _user_response(user)
 
 # Additional endpoints for update, delete, create, and list users follow a similar pattern, using
 # asynchronous database operations, handling security with OAuth2PasswordBearer, and enhancing response
@@ -91,60 +161,25 @@ async def search_users(
     nickname: str = Query(None, description = "Search by user's nickname."),
     email: str = Query(None, description = "Search by user's email."),
     role: UserRole = Query(None, description = "Search by user's role."),
+    q: str = Query(None, min_length=2, description = "Fuzzy search over nickname, email, first and last name, best matches first; 2-character terms match prefixes."),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(require_role(['ADMIN','MANAGER'])),
-    skip: int = Query(0, description="Number of records to skip (pagination)", include_in_schema = False),
-    limit: int = Query(10, description="Number of records to return (pagination)", include_in_schema = False)
+    skip: int = Query(0, ge=0, description="Number of records to skip (pagination)", include_in_schema = False),
+    limit: int = Query(10, ge=1, description="Number of records to return (pagination)", include_in_schema = False)
     
 ):
-    
-    users = []
-    if nickname:
-        user = await UserService.get_by_nickname(db, nickname)
-        if user:
-            users.append(user)
-    if email:
-        user = await UserService.get_by_email(db, email)
-        if user:
-            users.append(user)
-    if role:
-        role_users = await UserService.get_by_role(db, role)
-        if role_users:
-            users.extend(role_users)
-    if not users:
+    user_filter = UserFilter().nickname(nickname).email(email).role(role).fuzzy(q)
+    # No criteria, or an email the existence filter rules out, cannot match anyone.
+    if not user_filter or (email and not user_existence_filter.might_have_email(email)):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    users, total_users = await UserService.search(db, user_filter, skip, limit, USER_RESPONSE_COLUMNS)
+    if not total_users:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    if (nickname and email and not all(u.nickname == nickname and u.email == email for u in users)) or \
-    (nickname and role and not all (u.nickname == nickname and u.role == role for u in users)) or \
-    (email and role and not all(u.email == email and u.role == role for u in users)):
-        raise HTTPException(status_code = status.HTTP_404_NOT_FOUND, detail= 'No users found.')
-   
-    updated_users = {user.id: user for user in users}.values()
-    users = list(updated_users)
-
-    user_responses = [
-        UserResponse.model_construct(
-            id=user.id,
-            nickname=user.nickname,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            bio=user.bio,
-            profile_picture_url=user.profile_picture_url,
-            github_profile_url=user.github_profile_url,
-            linkedin_profile_url=user.linkedin_profile_url,
-            role=user.role,
-            email=user.email,
-            last_login_at=user.last_login_at,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
-            links=create_user_links(user.id, request)
-        )
-        for user in users
-    ]
+    user_responses = [_user_response(user) for user in users]
 
     page = skip // limit + 1
     size = len(user_responses)
-    total_users = len(users)
     pagination_links = generate_pagination_links(request, skip, limit, total_users)
 
     return UserListResponse(
@@ -156,34 +191,26 @@ async def search_users(
     )
 
 @router.put("/users/{user_id}", response_model=UserResponse, name="update_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def update_user(user_id: UUID, user_update: UserUpdate, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def update_user(user_id: UUID, user_update: UserUpdate, request: Request, response: Response, if_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
     Update user information.
 
     - **user_id**: UUID of the user to update.
     - **user_update**: UserUpdate model with updated user information.
+    - **If-Match**: Optional ETag from a previous GET or PUT. The update is then only applied if the
+      user has not changed since, otherwise 412 is returned. The response carries the new ETag.
     """
     user_data = user_update.model_dump(exclude_unset=True)
-    updated_user = await UserService.update(db, user_id, user_data)
+    expected_versions = parse_if_match(if_match) if if_match is not None else None
+    try:
+        updated_user = await UserService.update(db, user_id, user_data, expected_versions)
+    except StaleVersionError:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="User was modified by another request; fetch it again and retry.")
     if not updated_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    return UserResponse.model_construct(
-        id=updated_user.id,
-        bio=updated_user.bio,
-        first_name=updated_user.first_name,
-        last_name=updated_user.last_name,
-        nickname=updated_user.nickname,
-        email=updated_user.email,
-        role=updated_user.role,
-        last_login_at=updated_user.last_login_at,
-        profile_picture_url=updated_user.profile_picture_url,
-        github_profile_url=updated_user.github_profile_url,
-        linkedin_profile_url=updated_user.linkedin_profile_url,
-        created_at=updated_user.created_at,
-        updated_at=updated_user.updated_at,
-        links=create_user_links(updated_user.id, request)
-    )
+    response.headers.update(_validator_headers(make_etag(updated_user.version), updated_user.updated_at))
+    return _user_response(updated_user)
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT, name="delete_user", tags=["User Management Requires (Admin or Manager Roles)"])
@@ -206,7 +233,7 @@ async def create_user(user: UserCreate, request: Request, db: AsyncSession = Dep
     Create a new user.
 
     This endpoint creates a new user with the provided information. If the email
-    already exists, it returns a 400 error. On successful creation, it returns the
+    or nickname already exists, it returns a 400 error. On successful creation, it returns the
     newly created user's information along with links to related actions.
 
     Parameters:
@@ -217,13 +244,11 @@ async def create_user(user: UserCreate, request: Request, db: AsyncSession = Dep
     Returns:
     - UserResponse: The newly created user's information along with navigation links.
     """
-    existing_user = await UserService.get_by_email(db, user.email)
-    if existing_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
-    
+    # UserService.create does the duplicate check (skipping the query when the existence
+    # filter rules the email out); the input is already validated, so None means a duplicate.
     created_user = await UserService.create(db, user.model_dump(), email_service)
     if not created_user:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create user")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email or nickname already exists")
     
     
     return UserResponse.model_construct(
@@ -242,20 +267,69 @@ async def create_user(user: UserCreate, request: Request, db: AsyncSession = Dep
     )
 
 
+# Upload media types accepted by POST /users/import and their record parsers.
+IMPORT_PARSERS = {
+    "text/csv": iter_csv_records,
+    "application/x-ndjson": iter_jsonl_records,
+    "application/jsonl": iter_jsonl_records,
+    "application/x-jsonlines": iter_jsonl_records,
+}
+
+@router.post("/users/import", response_model=UserImportResponse, name="import_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def import_users(request: Request, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN"]))):
+    """
+    Bulk-create users from a CSV (``text/csv``, with a header row) or JSON Lines
+    (``application/x-ndjson``) request body of UserCreate records.
+
+    The body is parsed as it streams in and loaded in batches. Invalid records and records
+    whose email or nickname is taken are skipped and listed with their line number; the
+    rest are created. Verification emails are sent after the response.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    parser = IMPORT_PARSERS.get(media_type)
+    if parser is None:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            detail=f"Upload one of: {', '.join(IMPORT_PARSERS)}")
+    report = await UserImportService.import_users(db, parser(request.stream()), get_settings().user_import_chunk_size)
+    if report.created:
+        background_tasks.add_task(UserImportService.send_verification_emails, email_service, report.created)
+    return UserImportResponse(
+        received=report.received,
+        created=len(report.created),
+        failed=len(report.errors),
+        errors=[UserImportError(**error._asdict()) for error in report.errors],
+    )
+
+
 @router.get("/users/", response_model=UserListResponse, tags=["User Management Requires (Admin or Manager Roles)"])
 async def list_users(
     request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next/prev link; send it empty for the first page. Switches to keyset pagination, where skip is ignored."),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
 ):
-    total_users = await UserService.count(db)
-    users = await UserService.list_users(db, skip, limit)
+    """
+    List users by offset (``skip``/``limit``) or, with ``cursor``, by keyset.
+
+    Pages carry an ETag derived from the collection's revision counter, which only listed
+    data moves; a matching If-None-Match gets a 304 after that one lookup, without counting
+    or fetching the page. There is no Last-Modified: deleting a user removes it from pages
+    without moving any timestamp, so If-Modified-Since cannot be answered safely.
+    """
+    validator_headers = _validator_headers(make_list_etag(await UserService.list_revision(db)), None)
+    if _not_modified(request, validator_headers["ETag"], None):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers)
+    response.headers.update(validator_headers)
+    total_users, total_source = await user_count_provider.count(db)
 
-    user_responses = [
-        UserResponse.model_validate(user) for user in users
-    ]
+    if cursor is not None:
+        return await _list_users_by_cursor(request, cursor, limit, db, total_users, total_source)
+    users = await UserService.list_users(db, skip, limit, USER_RESPONSE_COLUMNS)
+
+    user_responses = [_user_response(user) for user in users]
     
     pagination_links = generate_pagination_links(request, skip, limit, total_users)
     
@@ -265,9 +339,40 @@ async def list_users(
         total=total_users,
         page=skip // limit + 1,
         size=len(user_responses),
+        total_source=total_source,
         links=pagination_links  # Ensure you have appropriate logic to create these links
     )
 
+async def _list_users_by_cursor(request: Request, cursor: str, limit: int, db: AsyncSession,
+                                total: int, total_source: str) -> UserListResponse:
+    if limit < 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Limit must be at least 1.")
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+
+    going_back = position is not None and position[2] == "prev"
+    if going_back:
+        users, has_more = await UserService.list_users_keyset(db, limit, before=position[:2], columns=USER_CURSOR_COLUMNS)
+    else:
+        users, has_more = await UserService.list_users_keyset(db, limit, after=position[:2] if position else None,
+                                                              columns=USER_CURSOR_COLUMNS)
+
+    # Coming back from a later page guarantees a next page; a cursor going forward guarantees a previous one.
+    has_next = has_more or going_back
+    has_prev = has_more if going_back else position is not None
+    next_cursor = encode_cursor(users[-1].created_at, users[-1].id) if users and has_next else None
+    prev_cursor = encode_cursor(users[0].created_at, users[0].id, "prev") if users and has_prev else None
+
+    return UserListResponse(
+        items=[_user_response(user) for user in users],
+        total=total,
+        size=len(users),
+        total_source=total_source,
+        links=generate_cursor_links(request, limit, next_cursor, prev_cursor),
+    )
+
 @router.post("/users/date", response_model=UserListResponse, tags=["User Management Requires (Admin or Manager Roles)"])
 async def filter_by_date(
     request: Request, 
@@ -275,8 +380,8 @@ async def filter_by_date(
     end_date: str = Query(None, description = "Insert the end date in the format: YYYY-MM-DD."),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(require_role(['ADMIN','MANAGER'])),
-    skip: int = Query(0, description="Number of records to skip (pagination)", include_in_schema = False),
-    limit: int = Query(10, description="Number of records to return (pagination)", include_in_schema = False)
+    skip: int = Query(0, ge=0, description="Number of records to skip (pagination)", include_in_schema = False),
+    limit: int = Query(10, ge=1, description="Number of records to return (pagination)", include_in_schema = False)
 ):
 
     if start_date:
@@ -294,35 +399,17 @@ async def filter_by_date(
     if start_date and end_date and start_date > end_date:
         raise HTTPException(status_code = 400, detail = "Start date cannot be after the end date.")
     
-    users = await UserService.get_by_date(db, start_date, end_date)
+    # Either bound may be omitted; paging and the total are computed by the database.
+    users, total_users = await UserService.search(db, UserFilter().created_between(start_date, end_date), skip, limit, USER_RESPONSE_COLUMNS)
 
-    if not users:
+    if not total_users:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail = "No users created within that range.")
 
     
-    user_responses = [
-        UserResponse.model_construct(
-            id=user.id,
-            nickname=user.nickname,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            bio=user.bio,
-            profile_picture_url=user.profile_picture_url,
-            github_profile_url=user.github_profile_url,
-            linkedin_profile_url=user.linkedin_profile_url,
-            role=user.role,
-            email=user.email,
-            last_login_at=user.last_login_at,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
-            links=create_user_links(user.id, request)
-        )
-        for user in users
-    ]
+    user_responses = [_user_response(user) for user in users]
 
     page = skip // limit + 1
     size = len(user_responses)
-    total_users = len(users)
     pagination_links = generate_pagination_links(request, skip, limit, total_users)
 
 
@@ -343,38 +430,62 @@ async def register(user_data: UserCreate, session: AsyncSession = Depends(get_db
     raise HTTPException(status_code=400, detail="Email already exists")
 
 @router.post("/login/", response_model=TokenResponse, tags=["Login and Registration"])
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
-    if await UserService.is_account_locked(session, form_data.username):
-        raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
+    throttle = get_login_throttle()
+    client_ip = request.client.host if request.client else "unknown"
+    attempt = await throttle.begin_attempt(client_ip, form_data.username) if throttle else None
+    if throttle and attempt is None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts. Try again later.",
+            headers={"Retry-After": str(throttle.window_seconds)},
+        )
 
-    user = await UserService.login_user(session, form_data.username, form_data.password)
-    if user:
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    login_status, user = await UserService.authenticate(session, form_data.username, form_data.password)
+    if throttle and login_status is LoginStatus.SUCCESS:
+        await throttle.record_success(client_ip, form_data.username, attempt)
+    if login_status is LoginStatus.LOCKED:
+        raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
+    if login_status is LoginStatus.SUCCESS:
+        access_token_expires = timedelta(minutes=get_settings().access_token_expire_minutes)
 
         access_token = create_access_token(
             data={"sub": user.email, "role": str(user.role.name)},
             expires_delta=access_token_expires
         )
 
-        return {"access_token": access_token, "token_type": "bearer"}
+        refresh_token = await RefreshTokenService.issue(session, user.id)
+
+        return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
     raise HTTPException(status_code=401, detail="Incorrect email or password.")
 
-@router.post("/login/", include_in_schema=False, response_model=TokenResponse, tags=["Login and Registration"])
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
-    if await UserService.is_account_locked(session, form_data.username):
-        raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
+@router.post("/token/refresh", response_model=TokenResponse, tags=["Login and Registration"])
+async def refresh_token(body: RefreshTokenRequest, session: AsyncSession = Depends(get_db)):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
 
-    user = await UserService.login_user(session, form_data.username, form_data.password)
-    if user:
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    Each refresh token can be used once. Reusing one revokes every token issued from the same login.
+    """
+    rotated = await RefreshTokenService.rotate(session, body.refresh_token)
+    if not rotated:
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token.", headers={"WWW-Authenticate": "Bearer"})
+    owner, new_refresh_token = rotated
+    access_token = create_access_token(
+        data={"sub": owner.email, "role": str(owner.role.name)},
+        expires_delta=timedelta(minutes=get_settings().access_token_expire_minutes)
+    )
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": new_refresh_token}
 
-        access_token = create_access_token(
-            data={"sub": user.email, "role": str(user.role.name)},
-            expires_delta=access_token_expires
-        )
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT, tags=["Login and Registration"])
+async def logout(token: str = Depends(oauth2_scheme), current_user: dict = Depends(get_current_user), session: AsyncSession = Depends(get_db)):
+    """
+    Revoke the presented access token before it expires.
 
-        return {"access_token": access_token, "token_type": "bearer"}
-    raise HTTPException(status_code=401, detail="Incorrect email or password.")
+    Refresh tokens are not affected; discarding them client-side ends the session.
+    """
+    await RevocationService.revoke_token(session, decode_token_cached(token))
+    await UnitOfWork.commit(session)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get("/verify-email/{user_id}/{token}", status_code=status.HTTP_200_OK, name="verify_email", tags=["Login and Registration"])
@@ -7,6 +7,7 @@ import uuid
 import re
 from app.models.user_model import UserRole
 from app.utils.nickname_gen import generate_nickname
+from app.schemas.pagination_schema import PaginationLink
 
 
 def validate_url(url: Optional[str]) -> Optional[str]:
@@ -79,5 +80,18 @@ class UserListResponse(BaseModel):
         "github_profile_url": "https://github.com/johndoe"
     }])
     total: int = Field(..., example=100)
-    page: int = Field(..., example=1)
+    page: Optional[int] = Field(None, example=1, description="Page number; not set in cursor mode")
     size: int = Field(..., example=10)
+    total_source: str = Field("exact", example="exact", description="How total was obtained: 'exact', 'cached' or 'estimated'")
+    links: List[PaginationLink] = Field(default_factory=list)
+
+class UserImportError(BaseModel):
+    line: int = Field(..., example=3, description="Line of the uploaded file the rejected record starts on")
+    email: Optional[str] = Field(None, example="john.doe@example.com")
+    error: str = Field(..., example="Email or nickname already exists")
+
+class UserImportResponse(BaseModel):
+    received: int = Field(..., example=1000, description="Records read from the upload")
+    created: int = Field(..., example=998)
+    failed: int = Field(..., example=2)
+    errors: List[UserImportError] = Field(default_factory=list)
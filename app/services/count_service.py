@@ -0,0 +1,81 @@
+from builtins import dict, float, int, str
+import time
+from typing import NamedTuple, Optional
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import Database
+from app.models.user_model import User
+from app.utils.metrics import register_metrics
+from settings.config import get_settings
+
+
+class CountResult(NamedTuple):
+    total: int
+    source: str  # "exact", "cached" or "estimated"
+
+
+class UserCountProvider:
+    """
+    Total user count for list endpoints, selected by the ``user_count_mode`` setting.
+
+    - ``exact``: ``SELECT count(*)`` on every call.
+    - ``cached``: an exact count reused for ``user_count_cache_ttl_seconds``; creates and
+      deletes through UserService invalidate it, other writers are only seen after the TTL.
+    - ``estimated``: the planner's ``pg_class.reltuples`` estimate once it reaches
+      ``user_count_estimate_threshold`` rows; below that the cached exact count is used,
+      since small tables are cheap to count and estimates are least accurate there.
+    """
+
+    def __init__(self):
+        self._cached: Optional[int] = None
+        self._expires_at = 0.0
+        self.exact_counts = 0
+        self.cache_hits = 0
+        self.estimates = 0
+
+    def invalidate(self) -> None:
+        self._cached = None
+
+    async def _exact(self, session: AsyncSession) -> int:
+        self.exact_counts += 1
+        return (await session.execute(select(func.count()).select_from(User))).scalar()
+
+    async def _cached_exact(self, session: AsyncSession) -> CountResult:
+        if self._cached is not None and time.monotonic() < self._expires_at:
+            self.cache_hits += 1
+            return CountResult(self._cached, "cached")
+        total = await self._exact(session)
+        self._cached, self._expires_at = total, time.monotonic() + get_settings().user_count_cache_ttl_seconds
+        return CountResult(total, "exact")
+
+    async def _estimate(self, session: AsyncSession) -> int:
+        query = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+        estimate = (await session.execute(query, {"table": User.__tablename__})).scalar()
+        # -1 (or NULL) until the table has been vacuumed or analyzed at least once.
+        return estimate if estimate is not None else -1
+
+    async def count(self, session: AsyncSession) -> CountResult:
+        session = Database.read_session_for(session)
+        settings = get_settings()
+        mode = settings.user_count_mode
+        if mode == "estimated":
+            estimate = await self._estimate(session)
+            if estimate >= settings.user_count_estimate_threshold:
+                self.estimates += 1
+                return CountResult(estimate, "estimated")
+            return await self._cached_exact(session)
+        if mode == "cached":
+            return await self._cached_exact(session)
+        return CountResult(await self._exact(session), "exact")
+
+    def stats(self) -> dict:
+        return {
+            "mode": get_settings().user_count_mode,
+            "exact_counts": self.exact_counts,
+            "cache_hits": self.cache_hits,
+            "estimates": self.estimates,
+        }
+
+
+user_count_provider = UserCountProvider()
+register_metrics("user_count", user_count_provider.stats)
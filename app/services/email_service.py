@@ -1,12 +1,13 @@
 # email_service.py
 from builtins import ValueError, dict, str
-from settings.config import settings
+from settings.config import get_settings
 from app.utils.smtp_connection import SMTPClient
 from app.utils.template_manager import TemplateManager
 from app.models.user_model import User
 
 class EmailService:
     def __init__(self, template_manager: TemplateManager):
+        settings = get_settings()
         if not settings.smtp_server or not settings.smtp_port or not settings.smtp_username or not settings.smtp_password:
             print("SMTP settings not configured. Email service will not work.")
             self.smtp_client = None
@@ -37,7 +38,7 @@ class EmailService:
     async def send_verification_email(self, user: User):
         if not self.smtp_client:
             return
-        verification_url = f"{settings.server_base_url}verify-email/{user.id}/{user.verification_token}"
+        verification_url = f"{get_settings().server_base_url}verify-email/{user.id}/{user.verification_token}"
         await self.send_user_email({
             "name": user.first_name,
             "verification_url": verification_url,
@@ -0,0 +1,130 @@
+from builtins import Exception, bool, dict, float, int, max, str
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import Database
+from app.models.user_model import User
+from app.utils.bloom_filter import BloomFilter
+from app.utils.metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip while streaming the table into the filters.
+BUILD_BATCH_SIZE = 5000
+
+
+class UserExistenceFilter:
+    """
+    In-process Bloom filters of existing user emails and nicknames.
+
+    A negative answer means no user has that value, so the lookup can skip the database.
+    Until the first build completes every answer is "maybe". Deletes are not removed from
+    the filters; they only add false positives until the next rebuild.
+
+    Each worker only learns of its own inserts between rebuilds, so with several workers a
+    user created elsewhere may be reported missing until ``rebuild_seconds`` have passed.
+    """
+
+    def __init__(self):
+        self.emails: Optional[BloomFilter] = None
+        self.nicknames: Optional[BloomFilter] = None
+        self._building = False
+        self._added_during_build: List[Tuple[Optional[str], Optional[str]]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.skipped_lookups = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.emails is not None
+
+    async def build(self, session: AsyncSession, false_positive_rate: float, growth: float) -> None:
+        """Size the filters from the table count and fill them with a streaming scan."""
+        total = (await session.execute(select(func.count()).select_from(User))).scalar() or 0
+        capacity = max(1000, int(total * growth))
+        emails = BloomFilter(capacity, false_positive_rate)
+        nicknames = BloomFilter(capacity, false_positive_rate)
+        self._building = True
+        self._added_during_build = []
+        try:
+            result = await session.stream(
+                select(User.email, User.nickname).execution_options(yield_per=BUILD_BATCH_SIZE)
+            )
+            async for email, nickname in result:
+                emails.add(email)
+                nicknames.add(nickname)
+            for email, nickname in self._added_during_build:
+                if email:
+                    emails.add(email)
+                if nickname:
+                    nicknames.add(nickname)
+        finally:
+            self._building = False
+            self._added_during_build = []
+        self.emails, self.nicknames = emails, nicknames
+        logger.info(f"User existence filter built for {total} users ({emails.memory_bytes + nicknames.memory_bytes} bytes).")
+
+    def add(self, email: Optional[str] = None, nickname: Optional[str] = None) -> None:
+        if self._building:
+            self._added_during_build.append((email, nickname))
+        if self.ready:
+            if email:
+                self.emails.add(email)
+            if nickname:
+                self.nicknames.add(nickname)
+
+    def might_have_email(self, email: str) -> bool:
+        if not self.ready or email in self.emails:
+            return True
+        self.skipped_lookups += 1
+        return False
+
+    def might_have_nickname(self, nickname: str) -> bool:
+        if not self.ready or nickname in self.nicknames:
+            return True
+        self.skipped_lookups += 1
+        return False
+
+    def reset(self) -> None:
+        self.emails = self.nicknames = None
+
+    async def _run(self, interval: float, false_positive_rate: float, growth: float) -> None:
+        while True:
+            try:
+                async with Database.get_session_factory()() as session:
+                    await self.build(session, false_positive_rate, growth)
+            except Exception as e:
+                logger.error(f"Failed to build user existence filter: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float, false_positive_rate: float, growth: float) -> None:
+        """Build now and rebuild every ``interval`` seconds in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval, false_positive_rate, growth))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        if not self.ready:
+            return {"ready": False, "skipped_lookups": self.skipped_lookups}
+        return {
+            "ready": True,
+            "skipped_lookups": self.skipped_lookups,
+            "items": self.emails.count,
+            "capacity": self.emails.capacity,
+            "email_false_positive_rate": self.emails.false_positive_rate,
+            "nickname_false_positive_rate": self.nicknames.false_positive_rate,
+            "memory_bytes": self.emails.memory_bytes + self.nicknames.memory_bytes,
+        }
+
+
+user_existence_filter = UserExistenceFilter()
+register_metrics("user_existence_filter", user_existence_filter.stats)
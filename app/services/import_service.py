@@ -0,0 +1,180 @@
+from builtins import BaseException, Exception, ValueError, classmethod, dict, int, isinstance, len, list, set, str, zip
+import asyncio
+import logging
+import uuid
+from typing import AsyncIterator, List, NamedTuple, Optional, Sequence
+from pydantic import ValidationError
+from sqlalchemy import Row, column, select, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import UnitOfWork
+from app.models.user_model import User
+from app.schemas.user_schemas import UserCreate
+from app.services.count_service import user_count_provider
+from app.services.email_service import EmailService
+from app.services.existence_filter import user_existence_filter
+from app.utils.nickname_gen import generate_nickname
+from app.utils.record_stream import ParsedRecord
+from app.utils.security import generate_verification_token, get_hash_pool, hash_password_async
+
+logger = logging.getLogger(__name__)
+
+# Per-transaction temp table the chunks are COPYed into before being merged into users.
+STAGING_TABLE = "users_import"
+# Columns loaded per row; created_at, updated_at and version take their server defaults.
+IMPORT_COLUMNS = (
+    "id", "nickname", "email", "first_name", "last_name", "bio", "profile_picture_url",
+    "linkedin_profile_url", "github_profile_url", "role", "hashed_password", "verification_token",
+    "email_verified", "is_professional", "is_locked", "failed_login_attempts",
+)
+
+
+class ImportRowError(NamedTuple):
+    line: int
+    email: Optional[str]
+    error: str
+
+
+class ImportReport:
+    """Outcome of one import: how many records were read, the users created and the rejected rows."""
+
+    def __init__(self):
+        self.received = 0
+        self.created: List[Row] = []
+        self.errors: List[ImportRowError] = []
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in e['loc']) or 'record'}: {e['msg']}" for e in error.errors())
+
+
+class UserImportService:
+    """
+    Bulk user creation for partner onboarding.
+
+    Records are validated with UserCreate as they stream in and loaded in chunks: passwords
+    are hashed concurrently on the shared hash pool, the chunk is COPYed into a temp staging
+    table and merged with one ``INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING``.
+    Rows that collide with existing users, or with each other, are reported instead of
+    failing the import.
+    """
+
+    @classmethod
+    async def _hash_passwords(cls, passwords: Sequence[str]) -> list:
+        """Hash on the shared pool with at most one call per worker in flight, so logins can still queue."""
+        slots = asyncio.Semaphore(get_hash_pool().max_workers)
+
+        async def hash_one(password: str) -> str:
+            async with slots:
+                return await hash_password_async(password)
+
+        return await asyncio.gather(*(hash_one(password) for password in passwords), return_exceptions=True)
+
+    @classmethod
+    async def _load_chunk(cls, session: AsyncSession, chunk: List[tuple], report: ImportReport) -> None:
+        hashes = await cls._hash_passwords([data.pop("password") for _, data in chunk])
+        rows, lines = [], {}
+        for (line, data), hashed_password in zip(chunk, hashes):
+            if isinstance(hashed_password, BaseException):
+                if not isinstance(hashed_password, ValueError):
+                    raise hashed_password
+                report.errors.append(ImportRowError(line, data["email"], str(hashed_password)))
+                continue
+            lines[data["email"]] = line
+            rows.append((
+                uuid.uuid4(), data["nickname"], data["email"], data["first_name"], data["last_name"], data["bio"],
+                data["profile_picture_url"], data["linkedin_profile_url"], data["github_profile_url"],
+                data["role"].name, hashed_password, generate_verification_token(), False, False, False, 0,
+            ))
+        if not rows:
+            return
+        # ON COMMIT DROP cleans up after a real commit; within a unit of work the table is reused.
+        await session.execute(text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (LIKE users INCLUDING DEFAULTS) ON COMMIT DROP"
+        ))
+        await session.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+        connection = await (await session.connection()).get_raw_connection()
+        await connection.driver_connection.copy_records_to_table(STAGING_TABLE, records=rows, columns=IMPORT_COLUMNS)
+        staging = table(STAGING_TABLE, *(column(name) for name in IMPORT_COLUMNS))
+        result = await session.execute(
+            insert(User)
+            .from_select(IMPORT_COLUMNS, select(staging))
+            .on_conflict_do_nothing()
+            .returning(User.id, User.email, User.nickname, User.first_name, User.verification_token)
+        )
+        created = result.all()
+        await UnitOfWork.commit(session)
+        for user in created:
+            del lines[user.email]
+
+        async def announce() -> None:
+            for user in created:
+                user_existence_filter.add(email=user.email, nickname=user.nickname)
+
+        await UnitOfWork.after_commit(session, announce)
+        report.created.extend(created)
+        report.errors.extend(ImportRowError(line, email, "Email or nickname already exists") for email, line in lines.items())
+
+    @classmethod
+    async def import_users(cls, session: AsyncSession, records: AsyncIterator[ParsedRecord], chunk_size: int) -> ImportReport:
+        """
+        Create users from parsed records, ``chunk_size`` at a time.
+
+        Inside a request's unit of work the whole import is one transaction; elsewhere each
+        chunk commits on its own.
+        """
+        report = ImportReport()
+        emails, nicknames = set(), set()
+        chunk: List[tuple] = []
+        async for line, record, error in records:
+            report.received += 1
+            if error is not None:
+                report.errors.append(ImportRowError(line, None, error))
+                continue
+            email = record.get("email")
+            try:
+                data = UserCreate.model_validate(record).model_dump()
+            except ValidationError as e:
+                report.errors.append(ImportRowError(line, str(email) if email is not None else None, _describe(e)))
+                continue
+            if data["nickname"] is None:
+                data["nickname"] = generate_nickname()
+                while data["nickname"] in nicknames:
+                    data["nickname"] = generate_nickname()
+            if data["email"] in emails or data["nickname"] in nicknames:
+                report.errors.append(ImportRowError(line, data["email"], "Duplicate email or nickname in this file"))
+                continue
+            emails.add(data["email"])
+            nicknames.add(data["nickname"])
+            chunk.append((line, data))
+            if len(chunk) >= chunk_size:
+                await cls._load_chunk(session, chunk, report)
+                chunk = []
+        if chunk:
+            await cls._load_chunk(session, chunk, report)
+        if report.created:
+
+            async def recount() -> None:
+                user_count_provider.invalidate()
+
+            await UnitOfWork.after_commit(session, recount)
+        report.errors.sort()
+        return report
+
+    @classmethod
+    async def _send_all(cls, email_service: EmailService, users: Sequence[Row]) -> None:
+        for user in users:
+            try:
+                await email_service.send_verification_email(user)
+            except Exception as e:
+                logger.error(f"Failed to send verification email to {user.email}: {e}")
+
+    @classmethod
+    async def send_verification_emails(cls, email_service: EmailService, users: Sequence[Row]) -> None:
+        """
+        Send the verification emails of imported users after the response has gone out.
+
+        SMTP sends are blocking, so the batch runs on its own event loop in a worker thread
+        rather than stalling every other request on this one.
+        """
+        await asyncio.to_thread(asyncio.run, cls._send_all(email_service, users))
@@ -1,22 +1,76 @@
 # app/services/jwt_service.py
-from builtins import dict, str
+from builtins import dict, min, str
+import hashlib
+import time
 import jwt
 from datetime import datetime, timedelta
-from settings.config import settings
+from typing import Optional
+from uuid import uuid4
+from settings.config import get_settings
+from app.utils.metrics import register_metrics
+from app.utils.ttl_cache import LRUTTLCache
+
+# Verified claims keyed by a digest of the token, so raw tokens are never held in memory.
+_claims_cache = LRUTTLCache(maxsize=get_settings().jwt_cache_size, ttl=get_settings().jwt_cache_ttl_seconds)
+register_metrics("jwt_claims_cache", _claims_cache.stats)
 
 def create_access_token(*, data: dict, expires_delta: timedelta = None):
+    settings = get_settings()
     to_encode = data.copy()
     # Convert role to uppercase before encoding the JWT
     if 'role' in to_encode:
         to_encode['role'] = to_encode['role'].upper()
     expire = datetime.utcnow() + (expires_delta if expires_delta else timedelta(minutes=settings.access_token_expire_minutes))
-    to_encode.update({"exp": expire})
+    # jti identifies the token for revocation; a fractional iat orders it against "not before" revocations.
+    to_encode.setdefault("jti", uuid4().hex)
+    to_encode.update({"exp": expire, "iat": time.time()})
     encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
     return encoded_jwt
 
+def create_refresh_token(*, subject: str, jti: str, family_id: str, expires_at: datetime) -> str:
+    """Encode a refresh token; it is only accepted by the refresh endpoint, never as an access token."""
+    to_encode = {"sub": subject, "jti": jti, "fam": family_id, "type": "refresh", "exp": expires_at}
+    settings = get_settings()
+    return jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+
 def decode_token(token: str):
+    settings = get_settings()
     try:
         decoded = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
         return decoded
     except jwt.PyJWTError:
         return None
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
+def decode_token_cached(token: str) -> Optional[dict]:
+    """
+    Decode a token, reusing previously verified claims for repeated tokens.
+
+    Entries never outlive the token's ``exp`` claim. Invalid tokens are not cached, and the
+    cache can be disabled with ``jwt_cache_enabled`` so every request pays a full verify.
+    The returned dict is shared between callers and must not be modified.
+    """
+    settings = get_settings()
+    if not settings.jwt_cache_enabled:
+        return decode_token(token)
+    key = _token_key(token)
+    claims = _claims_cache.get(key)
+    if claims is not None:
+        return claims
+    claims = decode_token(token)
+    if claims is None:
+        return None
+    ttl = settings.jwt_cache_ttl_seconds
+    if "exp" in claims:
+        ttl = min(ttl, claims["exp"] - time.time())
+    _claims_cache.set(key, claims, ttl=ttl)
+    return claims
+
+def invalidate_cached_token(token: str) -> None:
+    """Drop a token's cached claims so its next use is fully verified."""
+    _claims_cache.delete(_token_key(token))
+
+def clear_token_cache() -> None:
+    _claims_cache.clear()
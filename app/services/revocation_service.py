@@ -0,0 +1,111 @@
+from builtins import Exception, classmethod, dict, len, str
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import Database
+from app.models.revoked_token_model import RevokedToken
+from app.utils.metrics import register_metrics
+from app.utils.revocation_store import RevocationStore
+from settings.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+revocation_store = RevocationStore(granularity=get_settings().token_revocation_granularity_seconds)
+register_metrics("token_revocations", revocation_store.stats)
+
+
+class RevocationService:
+    """
+    Records access-token revocations in memory for O(1) checks and in ``revoked_tokens`` for
+    warm starts and other workers. The write methods do not commit; callers commit with the
+    change that caused the revocation.
+    """
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def revoke_token(cls, session: AsyncSession, claims: dict) -> None:
+        """Revoke one token (e.g. on logout) until its own ``exp``."""
+        jti, exp = claims.get("jti"), claims.get("exp")
+        if jti is None or exp is None:
+            return
+        revocation_store.revoke_token(jti, exp)
+        await session.execute(
+            insert(RevokedToken)
+            .values(kind="jti", key=jti, expires_at=datetime.fromtimestamp(exp, timezone.utc))
+            .on_conflict_do_nothing()
+        )
+
+    @classmethod
+    async def revoke_subjects(cls, session: AsyncSession, subjects: Iterable[str]) -> None:
+        """
+        Reject every access token already issued to these subjects.
+
+        Pass both the user id and the email, since either may be a token's ``sub``. The entry
+        is kept for one access-token lifetime, after which all older tokens have expired.
+        """
+        now = time.time()
+        not_before = datetime.fromtimestamp(now, timezone.utc)
+        expires_at = not_before + timedelta(minutes=get_settings().access_token_expire_minutes)
+        rows = [{"kind": "sub", "key": str(subject), "not_before": not_before, "expires_at": expires_at}
+                for subject in subjects if subject]
+        if not rows:
+            return
+        for row in rows:
+            revocation_store.revoke_subject(row["key"], now, expires_at.timestamp())
+        query = insert(RevokedToken).values(rows)
+        await session.execute(
+            query.on_conflict_do_update(
+                index_elements=[RevokedToken.kind, RevokedToken.key],
+                set_={
+                    "not_before": func.greatest(RevokedToken.not_before, query.excluded.not_before),
+                    "expires_at": func.greatest(RevokedToken.expires_at, query.excluded.expires_at),
+                },
+            )
+        )
+
+    @classmethod
+    async def load(cls, session: AsyncSession) -> int:
+        """Purge expired rows and merge the live ones into the in-memory store."""
+        await session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= func.now()))
+        await session.commit()
+        result = await session.execute(
+            select(RevokedToken.kind, RevokedToken.key, RevokedToken.not_before, RevokedToken.expires_at)
+        )
+        rows = result.all()
+        for row in rows:
+            if row.kind == "jti":
+                revocation_store.revoke_token(row.key, row.expires_at.timestamp())
+            else:
+                revocation_store.revoke_subject(row.key, row.not_before.timestamp(), row.expires_at.timestamp())
+        return len(rows)
+
+    @classmethod
+    async def _run(cls, interval: float) -> None:
+        while True:
+            try:
+                async with Database.get_session_factory()() as session:
+                    await cls.load(session)
+            except Exception as e:
+                logger.error(f"Failed to reload revoked tokens: {e}")
+            await asyncio.sleep(interval)
+
+    @classmethod
+    def start(cls, interval: float) -> None:
+        """Load revocations now and reload them every ``interval`` seconds in the background."""
+        if cls._task is None:
+            cls._task = asyncio.create_task(cls._run(interval))
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
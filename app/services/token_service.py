@@ -0,0 +1,89 @@
+from builtins import classmethod, str
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from uuid import UUID, uuid4
+import logging
+from sqlalchemy import Row, func, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from settings.config import get_settings
+from app.database import UnitOfWork
+from app.models.refresh_token_model import RefreshToken
+from app.models.user_model import User
+from app.services.jwt_service import create_refresh_token, decode_token
+
+logger = logging.getLogger(__name__)
+
+class RefreshTokenService:
+    """
+    Issues and rotates refresh tokens.
+
+    Renewing a session costs a signature check plus one UPDATE on the token's primary key,
+    joined to the owning user, instead of a password verify.
+    """
+
+    @classmethod
+    async def _insert(cls, session: AsyncSession, user_id: UUID, family_id: UUID) -> str:
+        jti = uuid4()
+        expires_at = datetime.now(timezone.utc) + timedelta(minutes=get_settings().refresh_token_expire_minutes)
+        await session.execute(
+            insert(RefreshToken).values(jti=jti, family_id=family_id, user_id=user_id, expires_at=expires_at)
+        )
+        return create_refresh_token(subject=str(user_id), jti=str(jti), family_id=str(family_id), expires_at=expires_at)
+
+    @classmethod
+    async def issue(cls, session: AsyncSession, user_id: UUID) -> str:
+        """Start a new token family for a fresh login and return its first refresh token."""
+        token = await cls._insert(session, user_id, uuid4())
+        await UnitOfWork.commit(session)
+        return token
+
+    @classmethod
+    async def revoke_family(cls, session: AsyncSession, family_id: UUID) -> None:
+        await session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    @classmethod
+    async def rotate(cls, session: AsyncSession, token: str) -> Optional[Tuple[Row, str]]:
+        """
+        Exchange a refresh token for a new one in the same family.
+
+        :return: The owner's (email, role) row and the new refresh token, or None if the token
+            is invalid, expired, already used, revoked, or its owner is locked. Presenting an
+            already used token revokes every token in its family.
+        """
+        claims = decode_token(token)
+        if claims is None or claims.get("type") != "refresh":
+            return None
+        try:
+            jti, family_id = UUID(claims["jti"]), UUID(claims["fam"])
+        except (KeyError, ValueError):
+            return None
+
+        tokens, users = RefreshToken.__table__, User.__table__
+        # Core UPDATE ... FROM users: marks the token used and reads its owner in one round trip.
+        query = (
+            update(tokens)
+            .where(
+                tokens.c.jti == jti,
+                tokens.c.user_id == users.c.id,
+                tokens.c.used_at.is_(None),
+                tokens.c.revoked_at.is_(None),
+            )
+            .values(used_at=func.now())
+            .returning(tokens.c.user_id, users.c.email, users.c.role, users.c.is_locked)
+        )
+        owner = (await session.execute(query)).first()
+        if owner is None or owner.is_locked:
+            if owner is None:
+                logger.warning(f"Refresh token {jti} reused or unknown; revoking family {family_id}.")
+            await cls.revoke_family(session, family_id)
+            await UnitOfWork.commit(session)
+            return None
+
+        new_token = await cls._insert(session, owner.user_id, family_id)
+        await UnitOfWork.commit(session)
+        return owner, new_token
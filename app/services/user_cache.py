@@ -0,0 +1,138 @@
+from builtins import bool, dict, float, int, len, str
+from abc import ABC, abstractmethod
+from typing import Any
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import UnitOfWork
+from app.utils.metrics import register_metrics
+from app.utils.plugins import import_class
+from app.utils.ttl_cache import LRUTTLCache
+from settings.config import get_settings
+
+
+class UserCacheBackend(ABC):
+    """
+    Storage for cached user profiles, keyed ``user:profile:<id>``.
+
+    With the local backend a write only invalidates the worker that made it; the others serve
+    the old profile until its TTL runs out. A shared implementation must expire entries after
+    the ``ttl`` given to ``set`` and drop every key passed to ``delete``. It is named by the
+    ``user_cache_backend`` setting and built without arguments.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+
+class LocalUserCacheBackend(UserCacheBackend):
+    """In-process LRU + TTL storage."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Any:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.delete(key)
+
+    def stats(self) -> dict:
+        stats = self._cache.stats()
+        return {name: stats[name] for name in ("size", "maxsize", "evictions", "expirations")}
+
+
+class UserCache:
+    """
+    Read-through cache of user profiles behind ``UserService.get_profile`` (GET /users/{id}).
+
+    Entries hold only the public USER_VERSIONED_COLUMNS of a user (what UserResponse shows plus
+    its ETag and Last-Modified validators), never password hashes or verification tokens, so a
+    shared backend stores nothing secret. Values are opaque to the cache; UserService decides
+    their shape.
+
+    UserService invalidates the id on every write, and again after the request's unit of work
+    commits, so a concurrent read cannot put the pre-commit row back. Writes made elsewhere
+    (other workers with the local backend, manual SQL) are seen once ``ttl`` has passed.
+
+    Args:
+        backend (UserCacheBackend): Storage for the entries.
+        ttl (float): Seconds an entry is served.
+        enabled (bool): When False every lookup misses without touching the backend.
+    """
+
+    def __init__(self, backend: UserCacheBackend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(user_id: Any) -> str:
+        return f"user:profile:{user_id}"
+
+    async def get(self, user_id: UUID) -> Any:
+        """Return the cached profile of ``user_id``, or None on a miss."""
+        if not self.enabled:
+            return None
+        profile = await self.backend.get(self._key(user_id))
+        if profile is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return profile
+
+    async def put(self, user_id: UUID, profile: Any) -> None:
+        """Cache a profile just read from the database."""
+        if self.enabled:
+            await self.backend.set(self._key(user_id), profile, self.ttl)
+
+    async def invalidate(self, session: AsyncSession, *user_ids: UUID) -> None:
+        """Drop these users now and, inside a unit of work, again after it commits."""
+        if not self.enabled or not user_ids:
+            return
+        keys = [self._key(user_id) for user_id in user_ids]
+        self.invalidations += len(keys)
+        await self.backend.delete(*keys)
+        if UnitOfWork.active(session):
+            UnitOfWork.on_commit(session, lambda: self.backend.delete(*keys))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            **self.backend.stats(),
+        }
+
+
+def _load_backend() -> UserCacheBackend:
+    settings = get_settings()
+    path = settings.user_cache_backend
+    if not path:
+        return LocalUserCacheBackend(settings.user_cache_size, settings.user_cache_ttl_seconds)
+    return import_class(path, UserCacheBackend)()
+
+
+user_cache = UserCache(_load_backend(), ttl=get_settings().user_cache_ttl_seconds, enabled=get_settings().user_cache_enabled)
+register_metrics("user_cache", user_cache.stats)
@@ -1,34 +1,147 @@
-from builtins import Exception, bool, classmethod, int, str
-from datetime import datetime, timezone
+from builtins import Exception, bool, classmethod, int, len, list, str
+from datetime import datetime, time, timedelta, timezone
 import secrets
-from typing import Optional, Dict, List
+from typing import Any, AsyncIterator, Optional, Dict, List, NamedTuple, Sequence, Tuple
+from enum import Enum
 from pydantic import ValidationError
-from sqlalchemy import func, null, update, select
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import Row, Select, case, delete, func, null, or_, select, text, tuple_, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.sql import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies import get_email_service, get_settings
+from app.database import Database, UnitOfWork
 from app.models.user_model import User
+from app.models.users_revision_model import UsersRevision
 from app.schemas.user_schemas import UserCreate, UserUpdate
 from app.utils.nickname_gen import generate_nickname
-from app.utils.security import generate_verification_token, hash_password, verify_password
+from app.utils.worker_pool import WorkerPoolFull
+from app.utils.security import generate_verification_token, hash_password_async, password_needs_rehash, verify_password_async
 from uuid import UUID
 from app.services.email_service import EmailService
+from app.services.count_service import user_count_provider
+from app.services.existence_filter import user_existence_filter
+from app.services.revocation_service import RevocationService
+from app.services.user_cache import user_cache
+from app.services.write_behind import last_login_buffer
 from app.models.user_model import UserRole
 import logging
 
 from datetime import date
-from sqlalchemy import cast, Date
 
 
-settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Only what login needs; avoids hydrating the full user row on the hottest write path.
+AUTH_COLUMNS = (
+    User.id, User.email, User.role, User.hashed_password,
+    User.email_verified, User.is_locked, User.failed_login_attempts,
+)
+
+# Columns rendered by UserResponse. Read endpoints select these instead of hydrating whole
+# User rows, so password hashes and verification tokens never leave the database for them.
+USER_RESPONSE_COLUMNS = (
+    User.id, User.email, User.nickname, User.first_name, User.last_name, User.bio,
+    User.profile_picture_url, User.linkedin_profile_url, User.github_profile_url,
+    User.role, User.is_professional,
+)
+# Cache validators of a single user: the version is its ETag, updated_at its Last-Modified.
+USER_VALIDATOR_COLUMNS = (User.version, User.updated_at)
+# Single-user reads and writes also return the validators.
+USER_VERSIONED_COLUMNS = USER_RESPONSE_COLUMNS + USER_VALIDATOR_COLUMNS
+# A cached USER_VERSIONED_COLUMNS row; plain values, so shared cache backends can pickle it.
+UserProfile = NamedTuple("UserProfile", [(column.key, Any) for column in USER_VERSIONED_COLUMNS])
+# Exports add the account state and timestamps analytics needs; still no secrets.
+USER_EXPORT_COLUMNS = USER_RESPONSE_COLUMNS + (
+    User.email_verified, User.is_locked, User.created_at, User.updated_at, User.last_login_at,
+)
+# Keyset pages also need the sort key of their boundary rows to build cursors.
+USER_CURSOR_COLUMNS = USER_RESPONSE_COLUMNS + (User.created_at,)
+
+class StaleVersionError(Exception):
+    """The user exists but no longer has the version the caller based its change on."""
+
+class LoginStatus(Enum):
+    SUCCESS = "success"
+    INVALID = "invalid"
+    UNVERIFIED = "unverified"
+    LOCKED = "locked"
+
+FUZZY_SEARCH_COLUMNS = (User.nickname, User.email, User.first_name, User.last_name)
+# pg_trgm extracts no trigram from shorter terms, so its GIN indexes would be scanned in full;
+# such terms are matched as prefixes through the lower(column) text_pattern_ops indexes instead.
+TRIGRAM_MIN_LENGTH = 3
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+class UserFilter:
+    """
+    Composable search criteria for the users table.
+
+    Each method adds one condition and returns the builder, so criteria chain:
+    ``UserFilter().nickname(n).role(r)``. All conditions are AND-ed into one WHERE clause
+    that ``UserService.search`` uses for both the page and its count.
+    """
+
+    def __init__(self):
+        self.clauses: List[ColumnElement] = []
+        self.fuzzy_term: Optional[str] = None
+
+    def nickname(self, nickname: Optional[str]) -> "UserFilter":
+        if nickname:
+            self.clauses.append(User.nickname == nickname)
+        return self
+
+    def email(self, email: Optional[str]) -> "UserFilter":
+        if email:
+            self.clauses.append(User.email == email)
+        return self
+
+    def role(self, role: Optional[UserRole]) -> "UserFilter":
+        if role:
+            self.clauses.append(User.role == role)
+        return self
+
+    def created_between(self, start_date: Optional[date], end_date: Optional[date]) -> "UserFilter":
+        """
+        Users created on ``start_date`` through ``end_date`` (UTC days, both inclusive, either open).
+
+        Written as the half-open range ``start 00:00 <= created_at < (end + 1 day) 00:00`` on the
+        raw column, so the (created_at, id) index serves it; casting the column to a date would not.
+        """
+        if start_date:
+            self.clauses.append(User.created_at >= datetime.combine(start_date, time.min, timezone.utc))
+        if end_date:
+            self.clauses.append(User.created_at < datetime.combine(end_date + timedelta(days=1), time.min, timezone.utc))
+        return self
+
+    def fuzzy(self, term: Optional[str]) -> "UserFilter":
+        """
+        Case-insensitive fuzzy match on nickname, email, first or last name.
+
+        The condition depends on the term and the database, so UserService builds it (see
+        ``UserService.fuzzy_clause``) and ranks the results.
+        """
+        if term:
+            self.fuzzy_term = term
+        return self
+
+    def where(self, clause: ColumnElement) -> "UserFilter":
+        self.clauses.append(clause)
+        return self
+
+    def __bool__(self) -> bool:
+        return bool(self.clauses or self.fuzzy_term)
+
 class UserService:
     @classmethod
     async def _execute_query(cls, session: AsyncSession, query):
         try:
             result = await session.execute(query)
-            await session.commit()
+            if isinstance(query, Select):
+                UnitOfWork.skip_commit(session)
+            else:
+                await UnitOfWork.commit(session)
             return result
         except SQLAlchemyError as e:
             logger.error(f"Database error: {e}")
@@ -41,35 +154,161 @@ class UserService:
         result = await cls._execute_query(session, query)
         return result.scalars().first() if result else None
 
+    @classmethod
+    async def _fetch_rows(cls, session: AsyncSession, query, columns: Optional[Sequence]) -> list:
+        """
+        Run a query built on ``select(*columns)`` or ``select(User)`` and return rows or User objects.
+
+        Column rows are plain values, not bound to the session that loaded them, so those
+        queries may be served by a read replica.
+        """
+        if columns:
+            session = Database.read_session_for(session)
+        result = await cls._execute_query(session, query)
+        if not result:
+            return []
+        return list(result.all() if columns else result.scalars().all())
+
+    @staticmethod
+    def _select(columns: Optional[Sequence]):
+        return select(*columns) if columns else select(User)
+
     @classmethod
     async def get_by_id(cls, session: AsyncSession, user_id: UUID) -> Optional[User]:
         return await cls._fetch_user(session, id=user_id)
 
+    @classmethod
+    async def get_row_by_id(cls, session: AsyncSession, user_id: UUID, columns: Sequence = USER_RESPONSE_COLUMNS) -> Optional[Row]:
+        """Fetch only ``columns`` of a user, for read-only endpoints."""
+        rows = await cls._fetch_rows(session, select(*columns).where(User.id == user_id), columns)
+        return rows[0] if rows else None
+
+    @classmethod
+    async def get_profile(cls, session: AsyncSession, user_id: UUID) -> Optional[UserProfile]:
+        """
+        The user's public profile and validators, served from the user cache when possible.
+
+        Misses read the primary, never a replica: a lagging replica would put an old profile
+        in the cache after its invalidation, where it would stay for the whole TTL.
+        """
+        profile = await user_cache.get(user_id)
+        if profile is None:
+            result = await cls._execute_query(session, select(*USER_VERSIONED_COLUMNS).where(User.id == user_id))
+            row = result.first() if result else None
+            if row is None:
+                return None
+            profile = UserProfile(*row)
+            await user_cache.put(user_id, profile)
+        return profile
+
     @classmethod
     async def get_by_nickname(cls, session: AsyncSession, nickname: str) -> Optional[User]:
+        if not user_existence_filter.might_have_nickname(nickname):
+            return None
         return await cls._fetch_user(session, nickname=nickname)
 
     @classmethod
     async def get_by_email(cls, session: AsyncSession, email: str) -> Optional[User]:
+        if not user_existence_filter.might_have_email(email):
+            return None
         return await cls._fetch_user(session, email=email)
 
-    @classmethod 
-    async def get_by_role(cls, session: AsyncSession, role: UserRole) -> Optional[User]:
-        result = await session.execute(select(User).filter(User.role == role))
-        user = result.scalars().all()
-        return user 
-    
+    _trigram_available: Optional[bool] = None
 
     @classmethod
-    async def get_by_date(cls, db:AsyncSession, start_date: date, end_date: date):
-        stmt = select(User).filter(
-            cast(User.created_at, Date) >= start_date,
-            cast(User.created_at, Date) <= end_date
-        )        
+    async def trigram_available(cls, session: AsyncSession) -> bool:
+        """Whether pg_trgm is installed; checked once per process, False on other databases."""
+        if cls._trigram_available is None:
+            if session.bind.dialect.name != "postgresql":
+                cls._trigram_available = False
+            else:
+                query = text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+                cls._trigram_available = bool((await session.execute(query)).scalar())
+        return cls._trigram_available
 
-        result = await db.execute(stmt)
-        return result.scalars().all()
-        
+    @classmethod
+    async def fuzzy_clause(cls, session: AsyncSession, term: str) -> ColumnElement:
+        """
+        The WHERE condition for ``UserFilter.fuzzy``, chosen so an index bounds the candidates.
+
+        - Terms shorter than TRIGRAM_MIN_LENGTH: case-insensitive prefix match, served by the
+          ``lower(column) text_pattern_ops`` indexes.
+        - Longer terms with pg_trgm: ``column %> term``, i.e. word similarity above
+          ``pg_trgm.word_similarity_threshold`` (0.6 unless the database sets it). The GIN
+          indexes return only those candidates, which tolerates typos and matches word
+          prefixes, rather than every row containing the term.
+        - Longer terms without pg_trgm (test and non-Postgres databases): ``ILIKE '%term%'``.
+        """
+        if len(term) < TRIGRAM_MIN_LENGTH:
+            prefix = f"{_escape_like(term.lower())}%"
+            return or_(*(func.lower(column).like(prefix, escape="\\") for column in FUZZY_SEARCH_COLUMNS))
+        if await cls.trigram_available(session):
+            return or_(*(column.op("%>")(term) for column in FUZZY_SEARCH_COLUMNS))
+        pattern = f"%{_escape_like(term)}%"
+        return or_(*(column.ilike(pattern, escape="\\") for column in FUZZY_SEARCH_COLUMNS))
+
+    @classmethod
+    async def _where(cls, session: AsyncSession, user_filter: UserFilter) -> List[ColumnElement]:
+        if not user_filter.fuzzy_term:
+            return user_filter.clauses
+        return [*user_filter.clauses, await cls.fuzzy_clause(session, user_filter.fuzzy_term)]
+
+    @classmethod
+    async def _relevance(cls, session: AsyncSession, user_filter: UserFilter) -> List[ColumnElement]:
+        term = user_filter.fuzzy_term
+        if not term or len(term) < TRIGRAM_MIN_LENGTH:
+            return []
+        if await cls.trigram_available(session):
+            # Only computed for the candidates above the similarity threshold, not every substring match.
+            return [func.greatest(*(func.word_similarity(term, column) for column in FUZZY_SEARCH_COLUMNS)).desc()]
+        # Without pg_trgm, rank prefix matches ahead of other substring matches.
+        prefix = f"{_escape_like(term)}%"
+        return [case((or_(*(column.ilike(prefix, escape="\\") for column in FUZZY_SEARCH_COLUMNS)), 0), else_=1)]
+
+    @classmethod
+    async def search(cls, session: AsyncSession, user_filter: UserFilter, skip: int = 0, limit: int = 10,
+                     columns: Optional[Sequence] = None) -> Tuple[list, int]:
+        """
+        Return one page of users matching every criterion of ``user_filter`` and the total match count.
+
+        Filtering, ordering and paging happen in a single statement, so only ``limit`` rows are
+        loaded however many users match. The count is skipped when the page already shows
+        every match. With ``columns``, only those columns are selected and rows are returned.
+        """
+        clauses = await cls._where(session, user_filter)
+        query = (
+            cls._select(columns)
+            .where(*clauses)
+            .order_by(*await cls._relevance(session, user_filter), User.created_at, User.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        users = await cls._fetch_rows(session, query, columns)
+        if len(users) < limit and (users or skip == 0):
+            return users, skip + len(users)
+        count_query = select(func.count()).select_from(User).where(*clauses)
+        total = (await Database.read_session_for(session).execute(count_query)).scalar()
+        return users, total
+
+    @classmethod
+    async def stream(cls, session: AsyncSession, user_filter: UserFilter, columns: Sequence,
+                     batch_size: int) -> AsyncIterator[list]:
+        """
+        Yield every user matching ``user_filter`` as lists of at most ``batch_size`` rows.
+
+        Rows come from a server-side cursor in (created_at, id) order, so memory holds one
+        batch however many users match, and the next batch is only fetched once the caller
+        asks for it.
+        """
+        query = (
+            select(*columns)
+            .where(*await cls._where(session, user_filter))
+            .order_by(User.created_at, User.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            yield rows
 
     @classmethod
     async def create(cls, session: AsyncSession, user_data: Dict[str, str], email_service: EmailService) -> Optional[User]:
@@ -79,7 +318,7 @@ class UserService:
             if existing_user:
                 logger.error("User with given email already exists.")
                 return None
-            validated_data['hashed_password'] = hash_password(validated_data.pop('password'))
+            validated_data['hashed_password'] = await hash_password_async(validated_data.pop('password'))
             new_user = User(**validated_data)
             new_user.verification_token = generate_verification_token()
             # new_nickname = generate_nickname()
@@ -87,9 +326,23 @@ class UserService:
             #     new_nickname = generate_nickname()
             # new_user.nickname = new_nickname
             session.add(new_user)
-            await session.commit()
-            if email_service:
-                await email_service.send_verification_email(new_user)
+            try:
+                await UnitOfWork.commit(session)
+            except IntegrityError as e:
+                # Unique nickname/email violations, including a concurrent insert of the same email.
+                logger.error(f"Integrity error during user creation: {e.orig}")
+                await session.rollback()
+                return None
+
+            async def announce() -> None:
+                # Only once the row is committed: a rollback must not leave a verification
+                # email, a filter entry or a fresh count behind for a user who does not exist.
+                user_existence_filter.add(email=new_user.email, nickname=new_user.nickname)
+                user_count_provider.invalidate()
+                if email_service:
+                    await email_service.send_verification_email(new_user)
+
+            await UnitOfWork.after_commit(session, announce)
             return new_user
         
         except ValidationError as e:
@@ -97,42 +350,100 @@ class UserService:
             return None
 
     @classmethod
-    async def update(cls, session: AsyncSession, user_id: UUID, update_data: Dict[str, str]) -> Optional[User]:
+    async def update(cls, session: AsyncSession, user_id: UUID, update_data: Dict[str, str],
+                     expected_versions: Optional[Sequence[int]] = None) -> Optional[Row]:
+        """
+        Apply a partial update with one UPDATE ... RETURNING and return the new USER_VERSIONED_COLUMNS row.
+
+        With ``expected_versions`` the statement is a compare-and-swap on ``version``: if the
+        user changed in the meantime nothing is written and StaleVersionError is raised.
+
+        :return: The updated row, or None if the data is invalid or the user does not exist.
+        """
         try:
-            # validated_data = UserUpdate(**update_data).dict(exclude_unset=True)
             validated_data = UserUpdate(**update_data).dict(exclude_unset=True)
 
             if 'password' in validated_data:
-                validated_data['hashed_password'] = hash_password(validated_data.pop('password'))
-            query = update(User).where(User.id == user_id).values(**validated_data).execution_options(synchronize_session="fetch")
-            await cls._execute_query(session, query)
-            updated_user = await cls.get_by_id(session, user_id)
-            if updated_user:
-                session.refresh(updated_user)  # Explicitly refresh the updated user object
-                logger.info(f"User {user_id} updated successfully.")
-                return updated_user
-            else:
-                logger.error(f"User {user_id} not found after update attempt.")
-            return None
+                validated_data['hashed_password'] = await hash_password_async(validated_data.pop('password'))
+            current = None
+            if 'role' in validated_data:
+                # Locked so the role compared below is the one this UPDATE replaces.
+                query = select(User.role, User.email).where(User.id == user_id).with_for_update()
+                current = (await session.execute(query)).first()
+            query = (
+                update(User)
+                .where(User.id == user_id)
+                .values(**validated_data, version=User.version + 1)
+                .returning(*USER_VERSIONED_COLUMNS)
+                .execution_options(synchronize_session=False)
+            )
+            if expected_versions is not None:
+                query = query.where(User.version.in_(expected_versions))
+            result = await cls._execute_query(session, query)
+            updated_user = result.first() if result else None
+            if updated_user is None:
+                if expected_versions is not None and await cls.get_row_by_id(session, user_id, (User.id,)):
+                    raise StaleVersionError(f"User {user_id} was modified concurrently.")
+                logger.error(f"User {user_id} not found for update.")
+                return None
+            if current and current.role != updated_user.role:
+                # Tokens carry the role claim, so tokens issued under the old role must stop working.
+                await RevocationService.revoke_subjects(session, [str(user_id), current.email])
+            await user_cache.invalidate(session, user_id)
+            user_existence_filter.add(email=validated_data.get('email'), nickname=validated_data.get('nickname'))
+            logger.info(f"User {user_id} updated successfully.")
+            return updated_user
+        except (WorkerPoolFull, StaleVersionError):
+            raise
         except Exception as e:  # Broad exception handling for debugging
             logger.error(f"Error during user update: {e}")
             return None
 
     @classmethod
     async def delete(cls, session: AsyncSession, user_id: UUID) -> bool:
-        user = await cls.get_by_id(session, user_id)
-        if not user:
+        result = await cls._execute_query(session, delete(User).where(User.id == user_id).returning(User.id))
+        if not result or result.first() is None:
             logger.info(f"User with ID {user_id} not found.")
             return False
-        await session.delete(user)
-        await session.commit()
+        await user_cache.invalidate(session, user_id)
+
+        async def recount() -> None:
+            user_count_provider.invalidate()
+
+        await UnitOfWork.after_commit(session, recount)
         return True
 
     @classmethod
-    async def list_users(cls, session: AsyncSession, skip: int = 0, limit: int = 10) -> List[User]:
-        query = select(User).offset(skip).limit(limit)
-        result = await cls._execute_query(session, query)
-        return result.scalars().all() if result else []
+    async def list_users(cls, session: AsyncSession, skip: int = 0, limit: int = 10, columns: Optional[Sequence] = None) -> list:
+        query = cls._select(columns).offset(skip).limit(limit)
+        return await cls._fetch_rows(session, query, columns)
+
+    @classmethod
+    async def list_users_keyset(cls, session: AsyncSession, limit: int, after: Optional[Tuple[datetime, UUID]] = None,
+                                before: Optional[Tuple[datetime, UUID]] = None,
+                                columns: Optional[Sequence] = None) -> Tuple[list, bool]:
+        """
+        Fetch a page ordered by (created_at, id) starting right after or right before a position.
+
+        The row comparison is answered by the (created_at, id) index, so every page costs the same
+        however deep it is, unlike OFFSET which reads and discards all skipped rows.
+
+        :return: The page in ascending order and whether more rows exist in the direction of travel.
+        """
+        key = tuple_(User.created_at, User.id)
+        query = cls._select(columns)
+        if before is not None:
+            query = query.where(key < tuple_(*before)).order_by(User.created_at.desc(), User.id.desc())
+        else:
+            if after is not None:
+                query = query.where(key > tuple_(*after))
+            query = query.order_by(User.created_at, User.id)
+        users = await cls._fetch_rows(session, query.limit(limit + 1), columns)
+        has_more = len(users) > limit
+        users = users[:limit]
+        if before is not None:
+            users.reverse()
+        return users, has_more
 
     @classmethod
     async def register_user(cls, session: AsyncSession, user_data: Dict[str, str], get_email_service) -> Optional[User]:
@@ -140,57 +451,108 @@ class UserService:
     
 
     @classmethod
-    async def login_user(cls, session: AsyncSession, email: str, password: str) -> Optional[User]:
-        user = await cls.get_by_email(session, email)
-        if user:
-            if user.email_verified is False:
-                return None
-            if user.is_locked:
-                return None
-            if verify_password(password, user.hashed_password):
-                user.failed_login_attempts = 0
-                user.last_login_at = datetime.now(timezone.utc)
-                session.add(user)
-                await session.commit()
-                return user
-            else:
-                user.failed_login_attempts += 1
-                if user.failed_login_attempts >= settings.max_login_attempts:
-                    user.is_locked = True
-                session.add(user)
-                await session.commit()
-        return None
+    async def authenticate(cls, session: AsyncSession, email: str, password: str) -> Tuple[LoginStatus, Optional[Row]]:
+        """
+        Check credentials with one SELECT of the auth columns and one atomic UPDATE.
+
+        Failed attempts are counted with ``failed_login_attempts = failed_login_attempts + 1``
+        in the database, so concurrent attempts cannot lose increments and the lock is
+        applied by the same statement that crosses ``max_login_attempts``.
+
+        :return: The login status and, on success, a row with the AUTH_COLUMNS of the user.
+        """
+        if not user_existence_filter.might_have_email(email):
+            return LoginStatus.INVALID, None
+        result = await session.execute(select(*AUTH_COLUMNS).where(User.email == email))
+        user = result.first()
+        if user is None:
+            return LoginStatus.INVALID, None
+        if user.is_locked:
+            return LoginStatus.LOCKED, None
+        if user.email_verified is False:
+            return LoginStatus.UNVERIFIED, None
+
+        if await verify_password_async(password, user.hashed_password):
+            now = datetime.now(timezone.utc)
+            values = {}
+            if password_needs_rehash(user.hashed_password):
+                # Upgrade hashes from an older algorithm or cost while we hold the plain password.
+                values["hashed_password"] = await hash_password_async(password)
+            if get_settings().last_login_write_behind and not user.failed_login_attempts and not values:
+                # Nothing lockout-related to reset, so the row write can be batched.
+                last_login_buffer.record(user.id, now)
+                return LoginStatus.SUCCESS, user
+            values.update(failed_login_attempts=0, last_login_at=now)
+            query = (
+                update(User)
+                .where(User.id == user.id, func.coalesce(User.is_locked, False).is_(False))
+                .values(**values)
+                .returning(User.id)
+            )
+            updated = (await session.execute(query)).first()
+            await UnitOfWork.commit(session)
+            await user_cache.invalidate(session, user.id)
+            # No row means the account was locked by a concurrent attempt after our SELECT.
+            return (LoginStatus.SUCCESS, user) if updated else (LoginStatus.LOCKED, None)
+
+        attempts = func.coalesce(User.failed_login_attempts, 0) + 1
+        query = (
+            update(User)
+            .where(User.id == user.id)
+            .values(
+                failed_login_attempts=attempts,
+                is_locked=or_(func.coalesce(User.is_locked, False), attempts >= get_settings().max_login_attempts),
+            )
+            .returning(User.is_locked)
+        )
+        is_locked = (await session.execute(query)).scalar()
+        if is_locked:
+            # This attempt locked the account (it was unlocked when selected): cut off its live tokens.
+            await RevocationService.revoke_subjects(session, [str(user.id), user.email])
+        await UnitOfWork.commit(session)
+        await user_cache.invalidate(session, user.id)
+        return (LoginStatus.LOCKED if is_locked else LoginStatus.INVALID), None
 
     @classmethod
-    async def is_account_locked(cls, session: AsyncSession, email: str) -> bool:
-        user = await cls.get_by_email(session, email)
-        return user.is_locked if user else False
+    async def login_user(cls, session: AsyncSession, email: str, password: str) -> Optional[Row]:
+        """Return the authenticated user's AUTH_COLUMNS row, or None if the login failed for any reason."""
+        login_status, user = await cls.authenticate(session, email, password)
+        return user if login_status is LoginStatus.SUCCESS else None
 
+    @classmethod
+    async def _update_where(cls, session: AsyncSession, user_id: UUID, *criteria, **values) -> bool:
+        """Apply ``values`` to the user in one conditional UPDATE; False if no row matched ``criteria``."""
+        query = update(User).where(User.id == user_id, *criteria).values(**values).returning(User.id)
+        result = await cls._execute_query(session, query)
+        if not result or result.first() is None:
+            return False
+        await user_cache.invalidate(session, user_id)
+        return True
 
     @classmethod
     async def reset_password(cls, session: AsyncSession, user_id: UUID, new_password: str) -> bool:
-        hashed_password = hash_password(new_password)
-        user = await cls.get_by_id(session, user_id)
-        if user:
-            user.hashed_password = hashed_password
-            user.failed_login_attempts = 0  # Resetting failed login attempts
-            user.is_locked = False  # Unlocking the user account, if locked
-            session.add(user)
-            await session.commit()
-            return True
-        return False
+        hashed_password = await hash_password_async(new_password)
+        # Also clears failed attempts and unlocks the account, if locked.
+        return await cls._update_where(session, user_id, hashed_password=hashed_password,
+                                       failed_login_attempts=0, is_locked=False)
 
     @classmethod
     async def verify_email_with_token(cls, session: AsyncSession, user_id: UUID, token: str) -> bool:
-        user = await cls.get_by_id(session, user_id)
-        if user and user.verification_token == token:
-            user.email_verified = True
-            user.verification_token = None  # Clear the token once used
-            user.role = UserRole.AUTHENTICATED
-            session.add(user)
-            await session.commit()
-            return True
-        return False
+        # Matching the token in the UPDATE itself makes a replayed or concurrent link a no-op.
+        return await cls._update_where(
+            session, user_id, User.verification_token == token,
+            email_verified=True, verification_token=None, role=UserRole.AUTHENTICATED, version=User.version + 1,
+        )
+
+    @classmethod
+    async def list_revision(cls, session: AsyncSession) -> int:
+        """
+        Revision of the listed user data, bumped by a trigger on ``users``; see UsersRevision.
+
+        A single-row primary key lookup, so validating a cached page never scans ``users``.
+        """
+        query = select(UsersRevision.revision).where(UsersRevision.id == 1)
+        return (await Database.read_session_for(session).execute(query)).scalar_one()
 
     @classmethod
     async def count(cls, session: AsyncSession) -> int:
@@ -201,17 +563,10 @@ class UserService:
         :return: The count of users.
         """
         query = select(func.count()).select_from(User)
-        result = await session.execute(query)
+        result = await Database.read_session_for(session).execute(query)
         count = result.scalar()
         return count
     
     @classmethod
     async def unlock_user_account(cls, session: AsyncSession, user_id: UUID) -> bool:
-        user = await cls.get_by_id(session, user_id)
-        if user and user.is_locked:
-            user.is_locked = False
-            user.failed_login_attempts = 0  # Optionally reset failed login attempts
-            session.add(user)
-            await session.commit()
-            return True
-        return False
+        return await cls._update_where(session, user_id, User.is_locked.is_(True), is_locked=False, failed_login_attempts=0)
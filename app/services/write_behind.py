@@ -0,0 +1,119 @@
+from builtins import Exception, dict, float, int, len, list, range
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID as PyUUID
+from sqlalchemy import DateTime, column, or_, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import Database
+from app.models.user_model import User
+from app.services.user_cache import user_cache
+from app.utils.metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+# Rows per UPDATE ... FROM (VALUES ...) statement; two bind parameters each.
+FLUSH_CHUNK_SIZE = 5000
+
+
+class LastLoginBuffer:
+    """
+    Write-behind buffer for ``users.last_login_at``.
+
+    Successful logins record their timestamp here instead of updating the row; a background
+    task writes all pending timestamps as one ``UPDATE ... FROM (VALUES ...)`` per interval.
+    Only last_login_at goes through the buffer: lockout fields are always written synchronously.
+    """
+
+    def __init__(self):
+        self._pending: Dict[PyUUID, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.failed_flushes = 0
+        self.last_flush_seconds = 0.0
+
+    def record(self, user_id: PyUUID, logged_in_at: datetime) -> None:
+        previous = self._pending.get(user_id)
+        if previous is None or logged_in_at > previous:
+            self._pending[user_id] = logged_in_at
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def _write(self, session: AsyncSession, batch: list) -> None:
+        users = User.__table__
+        for start in range(0, len(batch), FLUSH_CHUNK_SIZE):
+            rows = values(
+                column("id", UUID(as_uuid=True)),
+                column("last_login_at", DateTime(timezone=True)),
+                name="pending_logins",
+            ).data(batch[start:start + FLUSH_CHUNK_SIZE])
+            await session.execute(
+                update(users)
+                .where(users.c.id == rows.c.id)
+                # Never move the timestamp backwards if a newer value was written meanwhile.
+                .where(or_(users.c.last_login_at.is_(None), users.c.last_login_at < rows.c.last_login_at))
+                .values(last_login_at=rows.c.last_login_at)
+            )
+        await session.commit()
+        await user_cache.invalidate(session, *(user_id for user_id, _ in batch))
+
+    async def flush(self, session: Optional[AsyncSession] = None) -> int:
+        """Write every pending timestamp and return the number of users flushed."""
+        if not self._pending:
+            return 0
+        batch, self._pending = list(self._pending.items()), {}
+        started = time.perf_counter()
+        try:
+            if session is not None:
+                await self._write(session, batch)
+            else:
+                async with Database.get_session_factory()() as own_session:
+                    await self._write(own_session, batch)
+        except Exception as e:
+            logger.error(f"Failed to flush {len(batch)} last_login_at updates: {e}")
+            self.failed_flushes += 1
+            for user_id, logged_in_at in batch:
+                self.record(user_id, logged_in_at)
+            return 0
+        self.flushes += 1
+        self.rows_flushed += len(batch)
+        self.last_flush_seconds = time.perf_counter() - started
+        return len(batch)
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+    def start(self, interval: float) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        """Stop the background task and flush whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "rows_flushed": self.rows_flushed,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_seconds": self.last_flush_seconds,
+        }
+
+
+last_login_buffer = LastLoginBuffer()
+register_metrics("last_login_write_behind", last_login_buffer.stats)
@@ -0,0 +1,51 @@
+from builtins import ValueError, all, bool, float, int, len, max, range, round, str
+import hashlib
+import math
+from typing import Iterator
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    ``item in bloom`` is False only if the item was never added; True means "possibly added".
+    Sized for ``capacity`` items at ``false_positive_rate``; the rate degrades as more are added.
+
+    Args:
+        capacity (int): Expected number of items.
+        false_positive_rate (float): Target false positive probability at capacity.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        if capacity < 1 or not 0 < false_positive_rate < 1:
+            raise ValueError("capacity must be positive and false_positive_rate within (0, 1)")
+        self.capacity = capacity
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing (Kirsch-Mitzenmacher): k positions from one 128-bit digest.
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Expected false positive rate for the number of items added so far."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
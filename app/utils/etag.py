@@ -0,0 +1,58 @@
+from builtins import ValueError, any, bool, int, len, str
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import List, Optional
+
+
+def make_etag(version: int) -> str:
+    """Strong entity tag for a row version."""
+    return f'"{version}"'
+
+
+def make_list_etag(revision: int) -> str:
+    """
+    Strong entity tag for a page of a collection, from the collection's revision counter.
+
+    The counter moves with every change that can alter a page, so it changes the tag of
+    every page, and it stays put for writes no page shows (logins, lockouts).
+    """
+    return f'"r{revision}"'
+
+
+def if_none_match(header: str, etag: str) -> bool:
+    """Whether an If-None-Match header lists ``etag``; weak comparison, as If-None-Match requires."""
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def format_http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an HTTP date header; None if it is missing or malformed."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def parse_if_match(header: str) -> Optional[List[int]]:
+    """
+    Versions listed in an If-Match header, or None for ``*`` (any current version).
+
+    If-Match uses strong comparison, so weak tags never match, and neither do tags this API
+    did not issue. An empty list therefore means the precondition cannot hold.
+    """
+    if header.strip() == "*":
+        return None
+    versions = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if len(tag) >= 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit():
+            versions.append(int(tag[1:-1]))
+    return versions
@@ -1,6 +1,6 @@
-from builtins import dict, int, max, str
-from typing import List, Callable
-from urllib.parse import urlencode
+from builtins import dict, frozenset, int, max, str
+from typing import List, Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from uuid import UUID
 
 from fastapi import Request
@@ -11,10 +11,16 @@ from app.schemas.pagination_schema import PaginationLink
 def create_link(rel: str, href: str, method: str = "GET", action: str = None) -> Link:
     return Link(rel=rel, href=href, method=method, action=action)
 
+# Query parameters that pagination links set themselves; any others (filters) are carried over.
+PAGING_PARAMS = frozenset({"skip", "limit", "cursor"})
+
+def _with_query(base_url: str, query_string: str) -> str:
+    return f"{base_url}{'&' if '?' in base_url else '?'}{query_string}"
+
 def create_pagination_link(rel: str, base_url: str, params: dict) -> PaginationLink:
     # Ensure parameters are added in a specific order
     query_string = f"skip={params['skip']}&limit={params['limit']}"
-    return PaginationLink(rel=rel, href=f"{base_url}?{query_string}")
+    return PaginationLink(rel=rel, href=_with_query(base_url, query_string))
 
 def create_user_links(user_id: UUID, request: Request) -> List[Link]:
     """
@@ -30,8 +36,14 @@ def create_user_links(user_id: UUID, request: Request) -> List[Link]:
         for rel, action, method, action_desc in actions
     ]
 
+def _base_url(request: Request) -> str:
+    """The request URL without its paging parameters, keeping filters such as ``role`` or ``q``."""
+    parts = urlsplit(str(request.url))
+    kept = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key not in PAGING_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(kept)))
+
 def generate_pagination_links(request: Request, skip: int, limit: int, total_items: int) -> List[PaginationLink]:
-    base_url = str(request.url)
+    base_url = _base_url(request)
     total_pages = (total_items + limit - 1) // limit
     links = [
         create_pagination_link("self", base_url, {'skip': skip, 'limit': limit}),
@@ -46,3 +58,17 @@ def generate_pagination_links(request: Request, skip: int, limit: int, total_ite
         links.append(create_pagination_link("prev", base_url, {'skip': max(skip - limit, 0), 'limit': limit}))
 
     return links
+
+def generate_cursor_links(request: Request, limit: int, next_cursor: Optional[str], prev_cursor: Optional[str]) -> List[PaginationLink]:
+    """Links for keyset pagination; next and prev are only present when there is such a page."""
+    base_url = _base_url(request)
+    current = request.query_params.get("cursor", "")
+    links = [
+        PaginationLink(rel="self", href=_with_query(base_url, urlencode({'cursor': current, 'limit': limit}))),
+        PaginationLink(rel="first", href=_with_query(base_url, urlencode({'cursor': '', 'limit': limit}))),
+    ]
+    if next_cursor:
+        links.append(PaginationLink(rel="next", href=_with_query(base_url, urlencode({'cursor': next_cursor, 'limit': limit}))))
+    if prev_cursor:
+        links.append(PaginationLink(rel="prev", href=_with_query(base_url, urlencode({'cursor': prev_cursor, 'limit': limit}))))
+    return links
@@ -0,0 +1,59 @@
+from builtins import dict, float, int, len, list, str, tuple, zip
+from bisect import bisect_left
+from threading import Lock
+from typing import Callable, Dict, Sequence
+
+# Default bucket upper bounds in seconds, suited to lock/queue waits and short DB calls.
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_providers: Dict[str, Callable[[], dict]] = {}
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with running count, sum and max.
+
+    Buckets are upper bounds; observations above the last bound land in the overflow bucket.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self._count += 1
+            self._sum += value
+            if value > self._max:
+                self._max = value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            buckets = {f"le_{bound}": count for bound, count in zip(self.buckets, self._counts)}
+            buckets["le_inf"] = self._counts[-1]
+            return {
+                "count": self._count,
+                "sum": self._sum,
+                "avg": self._sum / self._count if self._count else 0.0,
+                "max": self._max,
+                "buckets": buckets,
+            }
+
+
+def register_metrics(name: str, provider: Callable[[], dict]) -> None:
+    """Register a callable returning a JSON-serialisable dict under ``name``."""
+    _providers[name] = provider
+
+
+def unregister_metrics(name: str) -> None:
+    _providers.pop(name, None)
+
+
+def collect_metrics() -> Dict[str, dict]:
+    """Return a snapshot of every registered metrics provider."""
+    return {name: provider() for name, provider in list(_providers.items())}
@@ -0,0 +1,243 @@
+from builtins import ValueError, bool, dict, float, int, isinstance, len, range, str, tuple
+import base64
+import hashlib
+import hmac
+import secrets
+import time
+from abc import ABC, abstractmethod
+from logging import getLogger
+from typing import Callable, Dict, Iterator, List, Optional
+import argon2
+import bcrypt
+from argon2.exceptions import InvalidHashError, VerificationError
+
+logger = getLogger(__name__)
+
+
+class PasswordHasher(ABC):
+    """
+    Base class for a password hashing scheme.
+
+    Subclasses encode every parameter they need to verify into the hash string itself,
+    so a hash produced at one cost can still be verified after the configured cost changes.
+    """
+    name: str = ""
+    prefixes: tuple = ()
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        ...
+
+    @abstractmethod
+    def verify(self, password: str, hashed_password: str) -> bool:
+        ...
+
+    def identify(self, hashed_password: str) -> bool:
+        return hashed_password.startswith(self.prefixes)
+
+    @abstractmethod
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Return True when ``hashed_password`` was produced with weaker parameters than these.
+
+        Stronger hashes are kept: workers calibrate independently and may settle on different
+        costs, and rehashing on any difference would make them rewrite each other's hashes.
+        """
+
+    @abstractmethod
+    def cost_variants(self) -> Iterator["PasswordHasher"]:
+        """Yield instances of this scheme in increasing cost, used by calibration."""
+
+
+class BcryptHasher(PasswordHasher):
+    name = "bcrypt"
+    prefixes = ("$2a$", "$2b$", "$2y$")
+    min_rounds = 10
+    max_rounds = 16
+
+    def __init__(self, rounds: int = 12):
+        self.rounds = rounds
+
+    def hash(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        try:
+            return int(hashed_password.split('$')[2]) < self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def cost_variants(self) -> Iterator["BcryptHasher"]:
+        for rounds in range(self.min_rounds, self.max_rounds + 1):
+            yield BcryptHasher(rounds)
+
+    def __repr__(self) -> str:
+        return f"BcryptHasher(rounds={self.rounds})"
+
+
+class ScryptHasher(PasswordHasher):
+    """scrypt from the standard library, stored as ``$scrypt$ln=<log2 n>,r=<r>,p=<p>$<salt>$<hash>``."""
+    name = "scrypt"
+    prefixes = ("$scrypt$",)
+    min_n_log2 = 14
+    max_n_log2 = 20
+
+    def __init__(self, n_log2: int = 14, r: int = 8, p: int = 1):
+        self.n_log2 = n_log2
+        self.r = r
+        self.p = p
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, n_log2: int, r: int, p: int) -> bytes:
+        n = 2 ** n_log2
+        return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * n * r * p + 2 ** 20, dklen=32)
+
+    @staticmethod
+    def _b64(data: bytes) -> str:
+        return base64.b64encode(data).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def _unb64(data: str) -> bytes:
+        return base64.b64decode(data + '=' * (-len(data) % 4))
+
+    def _parse(self, hashed_password: str) -> tuple:
+        _, _, params, salt, digest = hashed_password.split('$')
+        values = dict(item.split('=') for item in params.split(','))
+        return int(values['ln']), int(values['r']), int(values['p']), self._unb64(salt), self._unb64(digest)
+
+    def hash(self, password: str) -> str:
+        salt = secrets.token_bytes(16)
+        digest = self._derive(password, salt, self.n_log2, self.r, self.p)
+        return f"$scrypt$ln={self.n_log2},r={self.r},p={self.p}${self._b64(salt)}${self._b64(digest)}"
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        n_log2, r, p, salt, digest = self._parse(hashed_password)
+        return hmac.compare_digest(self._derive(password, salt, n_log2, r, p), digest)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        try:
+            n_log2, r, p, _, _ = self._parse(hashed_password)
+        except (KeyError, ValueError):
+            return True
+        return n_log2 < self.n_log2 or r < self.r or p < self.p
+
+    def cost_variants(self) -> Iterator["ScryptHasher"]:
+        for n_log2 in range(self.min_n_log2, self.max_n_log2 + 1):
+            yield ScryptHasher(n_log2, self.r, self.p)
+
+    def __repr__(self) -> str:
+        return f"ScryptHasher(n_log2={self.n_log2}, r={self.r}, p={self.p})"
+
+
+class Argon2Hasher(PasswordHasher):
+    """argon2id through ``argon2-cffi``."""
+    name = "argon2id"
+    prefixes = ("$argon2id$",)
+    min_time_cost = 2
+    max_time_cost = 12
+
+    def __init__(self, time_cost: int = 3, memory_cost: int = 65536, parallelism: int = 4):
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+        self._hasher = argon2.PasswordHasher(time_cost=time_cost, memory_cost=memory_cost,
+                                             parallelism=parallelism, type=argon2.Type.ID)
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        try:
+            return self._hasher.verify(hashed_password, password)
+        except VerificationError:
+            return False
+        except InvalidHashError as e:
+            raise ValueError("Invalid argon2 hash") from e
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        try:
+            params = argon2.extract_parameters(hashed_password)
+        except InvalidHashError:
+            return True
+        return (params.type is not argon2.Type.ID or params.version < argon2.low_level.ARGON2_VERSION
+                or params.time_cost < self.time_cost or params.memory_cost < self.memory_cost)
+
+    def cost_variants(self) -> Iterator["Argon2Hasher"]:
+        for time_cost in range(self.min_time_cost, self.max_time_cost + 1):
+            yield Argon2Hasher(time_cost, self.memory_cost, self.parallelism)
+
+    def __getstate__(self) -> dict:
+        # Keep the hasher picklable for process pools; the argon2 helper is rebuilt on load.
+        return {"time_cost": self.time_cost, "memory_cost": self.memory_cost, "parallelism": self.parallelism}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+    def __repr__(self) -> str:
+        return f"Argon2Hasher(time_cost={self.time_cost}, memory_cost={self.memory_cost}, parallelism={self.parallelism})"
+
+
+_registry: Dict[str, Callable[..., PasswordHasher]] = {}
+_verifiers: List[PasswordHasher] = []
+
+
+def register_hasher(name: str, factory: Callable[..., PasswordHasher], verifier: Optional[PasswordHasher] = None) -> None:
+    """
+    Register a hashing scheme under ``name``.
+
+    Args:
+        name (str): Value accepted by the ``password_hash_algorithm`` setting.
+        factory (Callable): Builds a configured hasher from keyword parameters.
+        verifier (PasswordHasher): Instance used to verify existing hashes of this scheme.
+    """
+    _registry[name] = factory
+    if verifier is not None:
+        _verifiers.append(verifier)
+
+
+def create_hasher(name: str, **params) -> PasswordHasher:
+    try:
+        factory = _registry[name]
+    except KeyError:
+        raise ValueError(f"Unknown password hash algorithm: {name}")
+    return factory(**params)
+
+
+def identify_hasher(hashed_password: str) -> Optional[PasswordHasher]:
+    """Return a hasher able to verify ``hashed_password``, or None if no scheme matches."""
+    if not isinstance(hashed_password, str):
+        return None
+    for hasher in _verifiers:
+        if hasher.identify(hashed_password):
+            return hasher
+    return None
+
+
+def calibrate(hasher: PasswordHasher, target_ms: float, password: str = "calibration-password") -> PasswordHasher:
+    """
+    Pick the most expensive variant of ``hasher``'s scheme whose verify time stays within
+    ``target_ms`` on this machine. The cheapest variant is kept as a floor even when it is slower.
+    """
+    chosen = None
+    for candidate in hasher.cost_variants():
+        hashed = candidate.hash(password)
+        started = time.perf_counter()
+        candidate.verify(password, hashed)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info("Password hasher calibration: %r verifies in %.1f ms", candidate, elapsed_ms)
+        if chosen is not None and elapsed_ms > target_ms:
+            break
+        chosen = candidate
+        if elapsed_ms > target_ms:
+            break
+    return chosen or hasher
+
+
+register_hasher("bcrypt", BcryptHasher, BcryptHasher())
+register_hasher("scrypt", ScryptHasher, ScryptHasher())
+register_hasher("argon2id", Argon2Hasher, Argon2Hasher())
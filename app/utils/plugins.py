@@ -0,0 +1,23 @@
+from builtins import AttributeError, ImportError, ValueError, isinstance, issubclass, str, type
+import importlib
+
+
+def import_class(path: str, base: type) -> type:
+    """
+    Import a pluggable implementation named by a setting such as ``user_cache_backend``.
+
+    Args:
+        path (str): Dotted path of the class, e.g. ``"myapp.redis_backends.RedisUserCache"``.
+        base (type): The interface the class must implement.
+
+    Raises:
+        ValueError: If the path does not name a subclass of ``base``.
+    """
+    module_name, _, class_name = path.rpartition(".")
+    try:
+        cls = getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError, ValueError) as e:
+        raise ValueError(f"Cannot import {path!r}: {e}") from e
+    if not isinstance(cls, type) or not issubclass(cls, base):
+        raise ValueError(f"{path!r} is not a {base.__name__}")
+    return cls
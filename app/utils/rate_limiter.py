@@ -0,0 +1,212 @@
+from builtins import bool, dict, float, int, iter, len, next, range, str, sum, tuple
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from typing import Dict, Optional
+from settings.config import get_settings
+from app.utils.metrics import register_metrics
+from app.utils.plugins import import_class
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for sliding-window attempt counters, keyed ``ip:<address>`` and ``acct:<email>``.
+
+    The in-memory backend counts only its own worker's attempts, so with N workers a client
+    gets up to N times the limit. A shared implementation (e.g. time-bucketed counters that
+    expire after one window) is named by the ``login_rate_limit_backend`` setting and built
+    with the window length in seconds.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, now: float) -> None:
+        ...
+
+    @abstractmethod
+    async def count(self, key: str, now: float) -> int:
+        ...
+
+    @abstractmethod
+    async def unhit(self, key: str, at: float) -> None:
+        """Take back one hit recorded at ``at``, if it is still inside the window."""
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+
+class _Window:
+    """A ring of per-bucket counters plus the absolute index of the newest bucket."""
+    __slots__ = ("head", "counts")
+
+    def __init__(self, head: int, buckets: int):
+        self.head = head
+        self.counts = array("I", bytes(4 * buckets))
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Sliding-window counters held as fixed-size arrays of time buckets per key.
+
+    Memory per key is constant (one unsigned int per bucket) no matter how many events
+    arrive; the window slides with bucket granularity, i.e. window_seconds / buckets.
+
+    Keys are kept in least-recently-hit order, so reclaiming idle keys only ever looks at the
+    front. Keys with hits inside the window are never dropped: if all ``max_keys`` are active,
+    the table grows past it until they age out (counted as ``over_capacity`` in stats).
+
+    Args:
+        window_seconds (float): Length of the sliding window.
+        buckets (int): Number of time buckets the window is split into.
+        max_keys (int): Keys tracked before idle ones are reclaimed.
+    """
+
+    def __init__(self, window_seconds: float, buckets: int = 10, max_keys: int = 100000):
+        self.window_seconds = window_seconds
+        self.buckets = buckets
+        self.bucket_width = window_seconds / buckets
+        self.max_keys = max_keys
+        self.over_capacity = 0
+        self._windows: "OrderedDict[str, _Window]" = OrderedDict()
+
+    def _advance(self, window: _Window, index: int) -> None:
+        steps = index - window.head
+        if steps <= 0:
+            return
+        if steps >= self.buckets:
+            for i in range(self.buckets):
+                window.counts[i] = 0
+        else:
+            for i in range(window.head + 1, index + 1):
+                window.counts[i % self.buckets] = 0
+        window.head = index
+
+    def _reclaim(self, index: int) -> None:
+        # The front key was hit least recently; once it still has counts, every key does.
+        while len(self._windows) >= self.max_keys:
+            key, window = next(iter(self._windows.items()))
+            self._advance(window, index)
+            if sum(window.counts):
+                self.over_capacity += 1
+                return
+            del self._windows[key]
+
+    async def hit(self, key: str, now: float) -> None:
+        index = int(now // self.bucket_width)
+        window = self._windows.get(key)
+        if window is None:
+            self._reclaim(index)
+            window = self._windows[key] = _Window(index, self.buckets)
+        else:
+            self._windows.move_to_end(key)
+        self._advance(window, index)
+        window.counts[index % self.buckets] += 1
+
+    async def count(self, key: str, now: float) -> int:
+        window = self._windows.get(key)
+        if window is None:
+            return 0
+        self._advance(window, int(now // self.bucket_width))
+        return sum(window.counts)
+
+    async def unhit(self, key: str, at: float) -> None:
+        window = self._windows.get(key)
+        index = int(at // self.bucket_width)
+        if window is not None and 0 <= window.head - index < self.buckets and window.counts[index % self.buckets]:
+            window.counts[index % self.buckets] -= 1
+
+    async def reset(self, key: str) -> None:
+        self._windows.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "tracked_keys": len(self._windows),
+            "bytes_per_key": self.buckets * 4,
+            "over_capacity": self.over_capacity,
+        }
+
+
+class LoginThrottle:
+    """
+    Per-IP and per-account limit on login attempts, checked before any bcrypt or database work.
+
+    An attempt is counted when it starts, not when it fails, so concurrent requests for one
+    account cannot all pass the check while their passwords are still being verified. A
+    successful login takes its attempt back and clears the account's count.
+
+    Args:
+        backend (RateLimitBackend): Counter storage.
+        per_ip (int): Failed logins allowed per client IP within the window.
+        per_account (int): Failed logins allowed per account within the window.
+        window_seconds (float): Window length, also used as the Retry-After hint.
+    """
+
+    def __init__(self, backend: RateLimitBackend, per_ip: int, per_account: int, window_seconds: float):
+        self.backend = backend
+        self.per_ip = per_ip
+        self.per_account = per_account
+        self.window_seconds = window_seconds
+        self.rejected = 0
+
+    @staticmethod
+    def _keys(ip: str, account: str) -> tuple:
+        return f"ip:{ip}", f"acct:{account.strip().lower()}"
+
+    async def begin_attempt(self, ip: str, account: str) -> Optional[float]:
+        """
+        Count a login attempt, or refuse it if either limit is reached.
+
+        Returns:
+            The attempt's timestamp, to pass to record_success; None if the attempt is blocked.
+        """
+        now = time.time()
+        ip_key, account_key = self._keys(ip, account)
+        if (await self.backend.count(ip_key, now) >= self.per_ip
+                or await self.backend.count(account_key, now) >= self.per_account):
+            self.rejected += 1
+            return None
+        await self.backend.hit(ip_key, now)
+        await self.backend.hit(account_key, now)
+        return now
+
+    async def record_success(self, ip: str, account: str, started: float) -> None:
+        ip_key, account_key = self._keys(ip, account)
+        # The account's failures are forgiven; a shared NAT address only gets this attempt back.
+        await self.backend.reset(account_key)
+        await self.backend.unhit(ip_key, started)
+
+    def stats(self) -> dict:
+        return {"rejected": self.rejected, "per_ip": self.per_ip, "per_account": self.per_account,
+                "window_seconds": self.window_seconds, **self.backend.stats()}
+
+
+def _load_backend() -> RateLimitBackend:
+    settings = get_settings()
+    path = settings.login_rate_limit_backend
+    if not path:
+        return InMemoryRateLimitBackend(settings.login_rate_limit_window_seconds, settings.login_rate_limit_buckets)
+    return import_class(path, RateLimitBackend)(settings.login_rate_limit_window_seconds)
+
+
+_login_throttle: Optional[LoginThrottle] = None
+
+def get_login_throttle() -> Optional[LoginThrottle]:
+    """Return the shared login throttle, or None when login rate limiting is disabled."""
+    global _login_throttle
+    settings = get_settings()
+    if not settings.login_rate_limit_enabled:
+        return None
+    if _login_throttle is None:
+        _login_throttle = LoginThrottle(
+            _load_backend(),
+            per_ip=settings.login_rate_limit_per_ip,
+            per_account=settings.login_rate_limit_per_account,
+            window_seconds=settings.login_rate_limit_window_seconds,
+        )
+    return _login_throttle
+
+register_metrics("login_throttle", lambda: _login_throttle.stats() if _login_throttle else {})
@@ -0,0 +1,114 @@
+from builtins import bytes, dict, int, isinstance, len, list, str, zip
+import codecs
+import csv
+import io
+import json
+from datetime import date
+from enum import Enum
+from typing import Any, AsyncIterator, Optional, Sequence, Tuple
+
+# (line number, parsed record or None, error message or None)
+ParsedRecord = Tuple[int, Optional[dict], Optional[str]]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of UTF-8 byte chunks (a leading BOM is dropped) into lines without reading it all.
+
+    Lines end at LF only, a CR before it is dropped, and each is yielded ending in LF.
+    ``str.splitlines`` would also break on U+2028 and other separators that are valid inside
+    JSON strings, and count a CRLF cut by a chunk boundary as two lines.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        # The last piece is a line cut in half by the chunk boundary, or empty.
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.removesuffix("\r") + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+async def iter_jsonl_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRecord]:
+    """Parse JSON Lines: one object per line, blank lines skipped."""
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, record, None
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRecord]:
+    """
+    Parse CSV with a header row. Empty cells become None.
+
+    Quoted cells may span lines; a record is complete once its quotes are balanced.
+    Records are numbered by the line they start on, the header being line 1.
+    """
+    header: Optional[list] = None
+    line_number = 0
+    record, record_line = "", 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not record:
+            record_line = line_number
+        record += line
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield record_line, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield record_line, {name: value if value != "" else None for name, value in zip(header, values)}, None
+    if record.strip():
+        yield record_line, None, "Unterminated quoted field"
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    plain = _plain(value)
+    return str(plain) if plain is value else plain
+
+
+async def ndjson_chunks(batches: AsyncIterator[Sequence[tuple]], fields: Sequence[str]) -> AsyncIterator[bytes]:
+    """Encode batches of rows as JSON Lines, one output chunk per batch."""
+    async for rows in batches:
+        yield "".join(json.dumps(dict(zip(fields, row)), default=_json_default) + "\n" for row in rows).encode()
+
+
+async def csv_chunks(batches: AsyncIterator[Sequence[tuple]], fields: Sequence[str]) -> AsyncIterator[bytes]:
+    """Encode batches of rows as CSV with a header row, one output chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue().encode()
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_plain(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
@@ -0,0 +1,101 @@
+from builtins import bool, dict, float, int, len, max, set, str, tuple
+import time
+from typing import Dict, Optional, Set, Tuple
+
+
+class RevocationStore:
+    """
+    In-memory set of revoked token ids and subjects whose entries expire on their own.
+
+    Entries are indexed by expiry in a timing wheel: one slot per ``granularity`` seconds.
+    Once a slot lies entirely in the past, every token it refers to has expired anyway and
+    the whole slot is dropped, so lookups and expiry are both O(1) amortized and the store
+    only ever holds revocations for tokens that could still be presented.
+
+    Two kinds of entries are kept:
+
+    - token revocations by ``jti`` (e.g. logout), and
+    - subject revocations ("not before"): every token of a subject issued at or before the
+      revocation time is rejected, used when an account is locked or its role changes.
+
+    Args:
+        granularity (float): Width of a wheel slot in seconds; entries live at most this
+            much longer than the tokens they revoke.
+    """
+
+    def __init__(self, granularity: float = 60.0):
+        self.granularity = granularity
+        self._tokens: Dict[str, float] = {}
+        self._subjects: Dict[str, Tuple[float, float]] = {}
+        self._wheel: Dict[int, Set[Tuple[str, str]]] = {}
+        self._cursor: Optional[int] = None
+        self.expired = 0
+
+    def _slot(self, expires_at: float) -> int:
+        return int(expires_at // self.granularity)
+
+    def _schedule(self, kind: str, key: str, expires_at: float) -> None:
+        slot = self._slot(expires_at)
+        if self._cursor is None or slot < self._cursor:
+            self._cursor = slot
+        self._wheel.setdefault(slot, set()).add((kind, key))
+
+    def _expire(self, now: float) -> None:
+        current = self._slot(now)
+        if not self._wheel:
+            self._cursor = current
+            return
+        while self._cursor < current:
+            for kind, key in self._wheel.pop(self._cursor, ()):
+                entries = self._tokens if kind == "jti" else self._subjects
+                entry = entries.get(key)
+                if entry is None:
+                    continue
+                expires_at = entry if kind == "jti" else entry[1]
+                # A later revocation of the same key may have moved it to a later slot.
+                if self._slot(expires_at) <= self._cursor:
+                    del entries[key]
+                    self.expired += 1
+            self._cursor += 1
+
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        if expires_at <= time.time():
+            return
+        if expires_at > self._tokens.get(jti, 0.0):
+            self._tokens[jti] = expires_at
+            self._schedule("jti", jti, expires_at)
+
+    def revoke_subject(self, subject: str, not_before: float, expires_at: float) -> None:
+        if expires_at <= time.time():
+            return
+        previous_not_before, previous_expires_at = self._subjects.get(subject, (0.0, 0.0))
+        self._subjects[subject] = (max(not_before, previous_not_before), max(expires_at, previous_expires_at))
+        if expires_at > previous_expires_at:
+            self._schedule("sub", subject, expires_at)
+
+    def is_revoked(self, claims: dict) -> bool:
+        self._expire(time.time())
+        if not self._tokens and not self._subjects:
+            return False
+        if claims.get("jti") in self._tokens:
+            return True
+        entry = self._subjects.get(str(claims.get("sub")))
+        # Tokens without an iat claim predate revocation support and are treated as old.
+        return entry is not None and claims.get("iat", 0) <= entry[0]
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._subjects.clear()
+        self._wheel.clear()
+        self._cursor = None
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._subjects)
+
+    def stats(self) -> dict:
+        return {
+            "revoked_tokens": len(self._tokens),
+            "revoked_subjects": len(self._subjects),
+            "wheel_slots": len(self._wheel),
+            "expired": self.expired,
+        }
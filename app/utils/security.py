@@ -1,19 +1,59 @@
 # app/security.py
-from builtins import Exception, ValueError, bool, int, str
+from builtins import Exception, ValueError, bool, dict, float, int, str
 import secrets
-import bcrypt
+from typing import Optional
 from logging import getLogger
+from settings.config import get_settings
+from app.utils.metrics import register_metrics
+from app.utils.password_hashers import BcryptHasher, PasswordHasher, calibrate, create_hasher, identify_hasher
+from app.utils.worker_pool import WorkerPool
 
 # Set up logging
 logger = getLogger(__name__)
 
-def hash_password(password: str, rounds: int = 12) -> str:
+_default_hasher: Optional[PasswordHasher] = None
+
+def _hasher_from_settings() -> PasswordHasher:
+    settings = get_settings()
+    algorithm = settings.password_hash_algorithm
+    if algorithm == "bcrypt":
+        return create_hasher(algorithm, rounds=settings.bcrypt_rounds)
+    if algorithm == "scrypt":
+        return create_hasher(algorithm, n_log2=settings.scrypt_n_log2, r=settings.scrypt_r, p=settings.scrypt_p)
+    if algorithm == "argon2id":
+        return create_hasher(algorithm, time_cost=settings.argon2_time_cost,
+                             memory_cost=settings.argon2_memory_cost, parallelism=settings.argon2_parallelism)
+    return create_hasher(algorithm)
+
+def get_default_hasher() -> PasswordHasher:
+    """Return the hasher used for new hashes, built from settings on first use."""
+    global _default_hasher
+    if _default_hasher is None:
+        _default_hasher = _hasher_from_settings()
+    return _default_hasher
+
+def set_default_hasher(hasher: Optional[PasswordHasher]) -> None:
+    """Replace the hasher used for new hashes; None rebuilds it from settings on next use."""
+    global _default_hasher
+    _default_hasher = hasher
+
+def calibrate_default_hasher(target_ms: float) -> PasswordHasher:
     """
-    Hashes a password using bcrypt with a specified cost factor.
+    Tune the configured algorithm's cost to the verify latency target on this hardware
+    and install the result as the default hasher.
+    """
+    hasher = calibrate(_hasher_from_settings(), target_ms)
+    logger.info("Password hasher calibrated to %r for a %s ms target", hasher, target_ms)
+    set_default_hasher(hasher)
+    return hasher
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """
+    Hashes a password with the default hasher, or with bcrypt at an explicit cost factor.
     
     Args:
         password (str): The plain text password to hash.
-        rounds (int): The cost factor that determines the computational cost of hashing.
+        rounds (int): Optional bcrypt cost factor; when omitted the configured hasher is used.
 
     Returns:
         str: The hashed password.
@@ -22,20 +62,19 @@ def hash_password(password: str, rounds: int = 12) -> str:
         ValueError: If hashing the password fails.
     """
     try:
-        salt = bcrypt.gensalt(rounds=rounds)
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed_password.decode('utf-8')
+        hasher = BcryptHasher(rounds) if rounds is not None else get_default_hasher()
+        return hasher.hash(password)
     except Exception as e:
         logger.error("Failed to hash password: %s", e)
         raise ValueError("Failed to hash password") from e
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verifies a plain text password against a hashed password.
+    Verifies a plain text password against a hashed password of any registered scheme.
     
     Args:
         plain_password (str): The plain text password to verify.
-        hashed_password (str): The bcrypt hashed password.
+        hashed_password (str): The hashed password, e.g. bcrypt, scrypt or argon2id.
 
     Returns:
         bool: True if the password is correct, False otherwise.
@@ -44,10 +83,72 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         ValueError: If the hashed password format is incorrect or the function fails to verify.
     """
     try:
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        hasher = identify_hasher(hashed_password)
+        if hasher is None:
+            raise ValueError("Unrecognised password hash format")
+        return hasher.verify(plain_password, hashed_password)
     except Exception as e:
         logger.error("Error verifying password: %s", e)
         raise ValueError("Authentication process encountered an unexpected error") from e
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Return True if the hash uses another algorithm than the default hasher, or weaker parameters."""
+    hasher = get_default_hasher()
+    return not hasher.identify(hashed_password) or hasher.needs_rehash(hashed_password)
+
+def _hash_with(hasher: PasswordHasher, password: str) -> str:
+    try:
+        return hasher.hash(password)
+    except Exception as e:
+        logger.error("Failed to hash password: %s", e)
+        raise ValueError("Failed to hash password") from e
+
+_hash_pool: Optional[WorkerPool] = None
+
+def get_hash_pool() -> WorkerPool:
+    """Return the shared password hashing pool, creating it from settings on first use."""
+    global _hash_pool
+    if _hash_pool is None:
+        settings = get_settings()
+        _hash_pool = WorkerPool(
+            max_workers=settings.password_hash_workers,
+            max_queue=settings.password_hash_max_queue,
+            kind=settings.password_hash_pool_kind,
+        )
+    return _hash_pool
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown()
+        _hash_pool = None
+
+def _hash_pool_stats() -> dict:
+    return _hash_pool.stats() if _hash_pool is not None else {}
+
+register_metrics("password_hash_pool", _hash_pool_stats)
+
+async def hash_password_async(password: str, rounds: Optional[int] = None) -> str:
+    """
+    Hashes a password on the worker pool so the event loop stays responsive.
+
+    Raises:
+        ValueError: If hashing the password fails.
+        WorkerPoolFull: If the pool's wait queue is at capacity.
+    """
+    # Resolve the hasher here so process workers use this process's (possibly calibrated) parameters.
+    hasher = BcryptHasher(rounds) if rounds is not None else get_default_hasher()
+    return await get_hash_pool().run(_hash_with, hasher, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifies a password on the worker pool so the event loop stays responsive.
+
+    Raises:
+        ValueError: If the hashed password format is incorrect or the function fails to verify.
+        WorkerPoolFull: If the pool's wait queue is at capacity.
+    """
+    return await get_hash_pool().run(verify_password, plain_password, hashed_password)
+
 def generate_verification_token():
     return secrets.token_urlsafe(16)  # Generates a secure 16-byte URL-safe token
\ No newline at end of file
@@ -3,7 +3,6 @@ from builtins import Exception, int, str
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from settings.config import settings
 import logging
 
 class SMTPClient:
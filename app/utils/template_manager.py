@@ -1,11 +1,38 @@
-import markdown2
+from builtins import dict, int, len, list, range, str, tuple, zip
+import html
+import uuid
 from pathlib import Path
+from string import Formatter
+from typing import List, NamedTuple, Optional, Tuple
+import markdown2
+from app.utils.metrics import register_metrics
+
+class CompiledTemplate(NamedTuple):
+    """Pre-styled HTML split around its placeholders: ``literals`` has one more item than ``fields``."""
+    literals: Tuple[str, ...]
+    # (field name, conversion, format spec) per placeholder, as parsed by string.Formatter
+    fields: Tuple[Tuple[str, Optional[str], str], ...]
+    mtimes: Tuple[int, ...]
 
 class TemplateManager:
+    """
+    Renders the markdown email templates as styled HTML.
+
+    Each template is compiled once, together with the header and footer: placeholders are
+    swapped for unique markers, the document goes through markdown2 and the inline styles,
+    and the HTML is split at the markers. Rendering then only joins the pieces with the
+    HTML-escaped context values. A compiled template is reused until the modification time
+    of one of its three files changes.
+    """
+    _formatter = Formatter()
+
     def __init__(self):
         # Dynamically determine the root path of the project
         self.root_dir = Path(__file__).resolve().parent.parent.parent  # Adjust this depending on the structure
         self.templates_dir = self.root_dir / 'email_templates'
+        self._compiled = {}
+        self.compiles = 0
+        self.renders = 0
 
     def _read_template(self, filename: str) -> str:
         """Private method to read template content."""
@@ -32,15 +59,65 @@ class TemplateManager:
                 styled_html = styled_html.replace(f'<{tag}>', f'<{tag} style="{style}">')
         return styled_html
 
+    def _filenames(self, template_name: str) -> Tuple[str, str, str]:
+        return ('header.md', f'{template_name}.md', 'footer.md')
+
+    def _mtimes(self, filenames: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple((self.templates_dir / filename).stat().st_mtime_ns for filename in filenames)
+
+    def _compile(self, filenames: Tuple[str, ...], mtimes: Tuple[int, ...]) -> CompiledTemplate:
+        header, main_template, footer = (self._read_template(filename) for filename in filenames)
+        # Alphanumeric markers pass through markdown unchanged, in text and in link targets alike.
+        marker = f'tmpl{uuid.uuid4().hex}slot'
+        fields: List[tuple] = []
+        parts = []
+        for literal, field_name, format_spec, conversion in self._formatter.parse(main_template):
+            parts.append(literal)
+            if field_name is not None:
+                parts.append(f'{marker}{len(fields)}x')
+                fields.append((field_name, conversion, format_spec or ''))
+        full_markdown = f"{header}\n{''.join(parts)}\n{footer}"
+        styled_html = self._apply_email_styles(markdown2.markdown(full_markdown))
+        literals = []
+        for index in range(len(fields)):
+            literal, _, styled_html = styled_html.partition(f'{marker}{index}x')
+            literals.append(literal)
+        literals.append(styled_html)
+        self.compiles += 1
+        return CompiledTemplate(tuple(literals), tuple(fields), mtimes)
+
+    def get_template(self, template_name: str) -> CompiledTemplate:
+        """Return the compiled template, recompiling it if one of its files changed on disk."""
+        filenames = self._filenames(template_name)
+        mtimes = self._mtimes(filenames)
+        compiled = self._compiled.get(template_name)
+        if compiled is None or compiled.mtimes != mtimes:
+            compiled = self._compiled[template_name] = self._compile(filenames, mtimes)
+        return compiled
+
     def render_template(self, template_name: str, **context) -> str:
-        """Render a markdown template with given context, applying advanced email styles."""
-        header = self._read_template('header.md')
-        footer = self._read_template('footer.md')
+        """
+        Render a markdown template with given context, applying advanced email styles.
+
+        Context values are inserted as escaped text, never interpreted as markdown or HTML.
+
+        Raises:
+            KeyError: If the template uses a name missing from ``context``.
+        """
+        compiled = self.get_template(template_name)
+        literals = compiled.literals
+        pieces = [literals[0]]
+        for (field_name, conversion, format_spec), literal in zip(compiled.fields, literals[1:]):
+            value, _ = self._formatter.get_field(field_name, (), context)
+            value = self._formatter.format_field(self._formatter.convert_field(value, conversion), format_spec)
+            pieces.append(html.escape(value))
+            pieces.append(literal)
+        self.renders += 1
+        return ''.join(pieces)
 
-        # Read main template and format it with provided context
-        main_template = self._read_template(f'{template_name}.md')
-        main_content = main_template.format(**context)
+    def stats(self) -> dict:
+        return {"compiled": len(self._compiled), "compiles": self.compiles, "renders": self.renders}
 
-        full_markdown = f"{header}\n{main_content}\n{footer}"
-        html_content = markdown2.markdown(full_markdown)
-        return self._apply_email_styles(html_content)
+# Shared by every EmailService so templates are compiled once per process, not once per request.
+template_manager = TemplateManager()
+register_metrics("email_templates", template_manager.stats)
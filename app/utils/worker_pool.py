@@ -0,0 +1,90 @@
+from builtins import RuntimeError, ValueError, float, int, max, str, tuple
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from app.utils.metrics import Histogram
+
+
+class WorkerPoolFull(RuntimeError):
+    """Raised when a call is submitted while the pool's wait queue is already at capacity."""
+
+
+def _timed_call(fn: Callable, *args) -> tuple:
+    # Runs inside the worker; the start timestamp lets the caller measure queue wait.
+    # time.monotonic() is system-wide on Linux, so it is comparable across processes.
+    return time.monotonic(), fn(*args)
+
+
+class WorkerPool:
+    """
+    Bounded executor for CPU-heavy work (password hashing) that must not run on the event loop.
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more may wait;
+    anything beyond that fails fast with WorkerPoolFull instead of piling up latency.
+
+    Args:
+        max_workers (int): Number of worker threads or processes.
+        max_queue (int): Number of calls allowed to wait for a free worker.
+        kind (str): 'thread' or 'process'. bcrypt releases the GIL, so threads are usually enough.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, kind: str = "thread"):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown worker pool kind: {kind}")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.max_queue = max(0, max_queue)
+        self.kind = kind
+        self.wait_time = Histogram()
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="worker-pool")
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submitted calls currently waiting for a free worker."""
+        return max(0, self._pending - self.max_workers)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run ``fn(*args)`` on the pool and return its result."""
+        if self._pending >= self.max_workers + self.max_queue:
+            self._rejected += 1
+            raise WorkerPoolFull("Worker pool queue is full")
+        self._pending += 1
+        submitted_at = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            started_at, result = await loop.run_in_executor(self._get_executor(), _timed_call, fn, *args)
+            self.wait_time.observe(max(0.0, started_at - submitted_at))
+            return result
+        finally:
+            self._pending -= 1
+            self._completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "pool_size": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._pending,
+            "queue_depth": self.queue_depth,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "wait_seconds": self.wait_time.snapshot(),
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
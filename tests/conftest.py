@@ -15,6 +15,7 @@ Fixtures:
 
 # Standard library imports
 from builtins import Exception, range, str
+from contextlib import ExitStack
 from datetime import timedelta
 from unittest.mock import AsyncMock, patch
 from uuid import uuid4
@@ -32,6 +33,7 @@ from app.main import app
 from app.database import Base, Database
 from app.models.user_model import User, UserRole
 from app.dependencies import get_db, get_settings
+from settings.config import override_settings
 from app.utils.security import hash_password
 from app.utils.template_manager import TemplateManager
 from app.services.email_service import EmailService
@@ -227,6 +229,12 @@ def user_token(user):
     token_data = {"sub": str(user.id), "role": user.role.name}
     return create_access_token(data=token_data, expires_delta=timedelta(minutes=30))
 
+@pytest.fixture
+def settings_override():
+    """Replace settings for the rest of the test: ``settings_override(name=value, ...)``."""
+    with ExitStack() as stack:
+        yield lambda **values: stack.enter_context(override_settings(**values))
+
 @pytest.fixture
 def email_service():
     if settings.send_real_mail == 'true':
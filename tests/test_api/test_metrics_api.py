@@ -0,0 +1,34 @@
+import pytest
+from app.utils.security import hash_password_async
+from settings.config import get_settings, override_settings
+
+
+@pytest.mark.asyncio
+async def test_metrics_as_admin(async_client, admin_token):
+    await hash_password_async("secure_password", 4)
+    response = await async_client.get("/metrics", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    pool = response.json()["password_hash_pool"]
+    assert pool["pool_size"] >= 1
+    assert "queue_depth" in pool
+    assert pool["wait_seconds"]["count"] >= 1
+    assert "checked_out" in response.json()["db_pool"]
+
+@pytest.mark.asyncio
+async def test_metrics_forbidden_for_manager(async_client, manager_token):
+    response = await async_client.get("/metrics", headers={"Authorization": f"Bearer {manager_token}"})
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_reload_settings_admin_only(async_client, admin_token, manager_token, monkeypatch):
+    response = await async_client.post("/settings/reload", headers={"Authorization": f"Bearer {manager_token}"})
+    assert response.status_code == 403
+    with override_settings():
+        monkeypatch.setenv("JWT_CACHE_TTL_SECONDS", "7")
+        response = await async_client.post("/settings/reload", headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == 200
+        assert response.json() == {"changed": ["jwt_cache_ttl_seconds"]}
+        monkeypatch.setenv("JWT_CACHE_TTL_SECONDS", "soon")
+        response = await async_client.post("/settings/reload", headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == 400 and "soon" not in response.text
+        assert get_settings().jwt_cache_ttl_seconds == 7
@@ -1,15 +1,25 @@
-from builtins import str
+from builtins import next, range, str
+import csv
+import json
+from uuid import uuid4
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.orm import sessionmaker
+from app.database import Database
 from app.main import app
 from app.models.user_model import User, UserRole
 from app.utils.nickname_gen import generate_nickname
 from app.utils.security import hash_password
+from app.utils.worker_pool import WorkerPoolFull
 from app.services.jwt_service import decode_token  # Import your FastAPI app
 from datetime import datetime, timedelta
 from tests.conftest import db_session
+from sqlalchemy import delete
 from sqlalchemy.future import select 
-from unittest.mock import patch 
+from sqlalchemy.ext.asyncio import AsyncSession
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.dependencies import get_email_service, get_read_session_factory
+from app.utils.rate_limiter import InMemoryRateLimitBackend, LoginThrottle
 
 
 
@@ -121,6 +131,18 @@ async def test_login_user_not_found(async_client):
     assert response.status_code == 401
     assert "Incorrect email or password." in response.json().get("detail", "")
 
+@pytest.mark.asyncio
+async def test_login_sheds_load_through_real_get_db(db_session, verified_user, monkeypatch):
+    # No get_db override: the request runs in the real unit of work, on the test engine.
+    factory = sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(Database, "get_session_factory", classmethod(lambda cls: factory))
+    form_data = {"username": verified_user.email, "password": "MySuperPassword$1234"}
+    with patch("app.services.user_service.verify_password_async", AsyncMock(side_effect=WorkerPoolFull("full"))):
+        async with AsyncClient(app=app, base_url="http://testserver") as client:
+            response = await client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
 @pytest.mark.asyncio
 async def test_login_incorrect_password(async_client, verified_user):
     form_data = {
@@ -640,4 +662,334 @@ async def test_filter_start_date_after_end_date(async_client, admin_token, db_se
     )
 
     assert response.status_code == 400
- 
\ No newline at end of file
+ 
+async def _login(async_client, email, password="MySuperPassword$1234"):
+    form_data = {"username": email, "password": password}
+    return await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+
+@pytest.mark.asyncio
+async def test_refresh_token_rotation(async_client, verified_user):
+    login_data = (await _login(async_client, verified_user.email)).json()
+    assert login_data["refresh_token"]
+
+    response = await async_client.post("/token/refresh", json={"refresh_token": login_data["refresh_token"]})
+    assert response.status_code == 200
+    data = response.json()
+    assert decode_token(data["access_token"])["sub"] == verified_user.email
+    assert data["refresh_token"] != login_data["refresh_token"]
+
+@pytest.mark.asyncio
+async def test_refresh_token_reuse_revokes_family(async_client, verified_user):
+    first = (await _login(async_client, verified_user.email)).json()["refresh_token"]
+    second = (await async_client.post("/token/refresh", json={"refresh_token": first})).json()["refresh_token"]
+
+    reuse = await async_client.post("/token/refresh", json={"refresh_token": first})
+    assert reuse.status_code == 401
+    # The legitimate successor is revoked too, since the family is compromised.
+    response = await async_client.post("/token/refresh", json={"refresh_token": second})
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_refresh_token_rejected_as_access_token(async_client, verified_user):
+    refresh = (await _login(async_client, verified_user.email)).json()["refresh_token"]
+    response = await async_client.get("/users/", headers={"Authorization": f"Bearer {refresh}"})
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_refresh_with_access_token_rejected(async_client, admin_token):
+    response = await async_client.post("/token/refresh", json={"refresh_token": admin_token})
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_login_throttled_before_authentication(async_client, verified_user):
+    throttle = LoginThrottle(InMemoryRateLimitBackend(window_seconds=60), per_ip=100, per_account=1, window_seconds=60)
+    with patch('app.routers.user_routes.get_login_throttle', return_value=throttle), \
+         patch('app.services.user_service.UserService.authenticate') as mock_authenticate:
+        await throttle.begin_attempt("127.0.0.1", verified_user.email)
+        response = await _login(async_client, verified_user.email)
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "60"
+        mock_authenticate.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_logout_revokes_access_token(async_client, verified_user, admin_token):
+    login_response = await _login(async_client, verified_user.email)
+    access_token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = await async_client.post("/logout", headers=headers)
+    assert response.status_code == 204
+    response = await async_client.post("/logout", headers=headers)
+    assert response.status_code == 401
+    # Other tokens keep working.
+    response = await async_client.get("/users/", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_role_change_revokes_existing_tokens(async_client, manager_user, manager_token, admin_token):
+    manager_headers = {"Authorization": f"Bearer {manager_token}"}
+    response = await async_client.get(f"/users/{manager_user.id}", headers=manager_headers)
+    assert response.status_code == 200
+    response = await async_client.put(f"/users/{manager_user.id}", json={"role": "AUTHENTICATED"},
+                                      headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    response = await async_client.get(f"/users/{manager_user.id}", headers=manager_headers)
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_stale_role_change_keeps_existing_tokens(async_client, manager_user, manager_token, admin_token):
+    manager_headers = {"Authorization": f"Bearer {manager_token}"}
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    etag = (await async_client.get(f"/users/{manager_user.id}", headers=admin_headers)).headers["ETag"]
+    await async_client.put(f"/users/{manager_user.id}", json={"bio": "Edited first"}, headers=admin_headers)
+    response = await async_client.put(f"/users/{manager_user.id}", json={"role": "AUTHENTICATED"},
+                                      headers={**admin_headers, "If-Match": etag})
+    assert response.status_code == 412
+    response = await async_client.get(f"/users/{manager_user.id}", headers=manager_headers)
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_list_users_cursor_pagination(async_client, admin_token, users_with_same_role_50_users):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/", params={"cursor": "", "limit": 20}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["page"] is None
+    assert body["total_source"] == "exact"
+    seen, pages = [], 0
+    while True:
+        pages += 1
+        seen.extend(item["id"] for item in body["items"])
+        links = {link["rel"]: link["href"] for link in body["links"]}
+        if "next" not in links:
+            break
+        response = await async_client.get(links["next"], headers=headers)
+        body = response.json()
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == body["total"]
+
+    response = await async_client.get(links["prev"], headers=headers)
+    assert [item["id"] for item in response.json()["items"]] == seen[20:40]
+
+@pytest.mark.asyncio
+async def test_list_users_invalid_cursor(async_client, admin_token):
+    response = await async_client.get("/users/", params={"cursor": "not-a-cursor"}, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_offset_pagination_links_replace_query(async_client, admin_token, users_with_same_role_50_users):
+    response = await async_client.get("/users/", params={"skip": 10, "limit": 10}, headers={"Authorization": f"Bearer {admin_token}"})
+    links = {link["rel"]: link["href"] for link in response.json()["links"]}
+    assert links["next"].endswith("/users/?skip=20&limit=10")
+
+@pytest.mark.asyncio
+async def test_search_role_is_paginated(async_client, admin_token, users_with_same_role_50_users):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.post("/users/search", params={"role": "AUTHENTICATED", "skip": 45, "limit": 10}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 50
+    assert body["page"] == 5
+    assert len(body["items"]) == 5
+
+@pytest.mark.asyncio
+async def test_search_without_criteria_not_found(async_client, admin_token):
+    response = await async_client.post("/users/search", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_filter_by_open_ended_date_is_paginated(async_client, admin_token, users_with_same_role_50_users):
+    start_date = (datetime.today().date() - timedelta(days=1)).strftime('%Y-%m-%d')
+    response = await async_client.post('/users/date', params={'start_date': start_date, 'limit': 20},
+                                       headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body['total'] == 51  # the fixture's users plus the admin
+    assert len(body['items']) == 20
+
+@pytest.mark.asyncio
+async def test_search_fuzzy_query(async_client, admin_token, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.post("/users/search", params={"q": verified_user.email[:5].upper()}, headers=headers)
+    assert response.status_code == 200
+    assert any(item["id"] == str(verified_user.id) for item in response.json()["items"])
+
+@pytest.mark.asyncio
+async def test_update_user_with_if_match(async_client, admin_token, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(f"/users/{verified_user.id}", headers=headers)
+    etag = response.headers["ETag"]
+
+    response = await async_client.put(f"/users/{verified_user.id}", json={"bio": "First edit"}, headers={**headers, "If-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["bio"] == "First edit"
+    new_etag = response.headers["ETag"]
+    assert new_etag != etag
+
+    # A second editor still holding the old ETag must not overwrite the first edit.
+    response = await async_client.put(f"/users/{verified_user.id}", json={"bio": "Second edit"}, headers={**headers, "If-Match": etag})
+    assert response.status_code == 412
+    response = await async_client.get(f"/users/{verified_user.id}", headers=headers)
+    assert response.json()["bio"] == "First edit"
+    assert response.headers["ETag"] == new_etag
+
+@pytest.mark.asyncio
+async def test_update_missing_user_with_if_match_not_found(async_client, admin_token):
+    response = await async_client.put(f"/users/{uuid4()}", json={"bio": "Nobody"},
+                                      headers={"Authorization": f"Bearer {admin_token}", "If-Match": '"1"'})
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_import_users_csv(async_client, admin_token, verified_user):
+    email_service = MagicMock()
+    email_service.send_verification_email = AsyncMock()
+    app.dependency_overrides[get_email_service] = lambda: email_service
+    body = (
+        "email,nickname,password,role,first_name\n"
+        "partner1@example.com,partner_1,Secure*1234,AUTHENTICATED,Ann\n"
+        f"{verified_user.email},partner_2,Secure*1234,AUTHENTICATED,\n"
+        "partner3@example.com,partner_3,Secure*1234,NOT_A_ROLE,\n"
+    )
+    headers = {"Authorization": f"Bearer {admin_token}", "Content-Type": "text/csv"}
+    response = await async_client.post("/users/import", content=body, headers=headers)
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["received"], report["created"], report["failed"]) == (3, 1, 2)
+    assert [(error["line"], error["email"]) for error in report["errors"]] == [
+        (3, verified_user.email), (4, "partner3@example.com"),
+    ]
+    email_service.send_verification_email.assert_awaited_once()
+    assert email_service.send_verification_email.await_args.args[0].email == "partner1@example.com"
+
+@pytest.mark.asyncio
+async def test_import_users_rejects_unknown_media_type_and_managers(async_client, admin_token, manager_token):
+    response = await async_client.post("/users/import", content="{}", headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "application/json"})
+    assert response.status_code == 415
+    response = await async_client.post("/users/import", content="", headers={"Authorization": f"Bearer {manager_token}", "Content-Type": "text/csv"})
+    assert response.status_code == 403
+
+@pytest.fixture
+def export_sessions(db_session, settings_override):
+    settings_override(user_export_batch_size=7)
+    app.dependency_overrides[get_read_session_factory] = lambda: lambda: AsyncSession(db_session.bind, expire_on_commit=False)
+
+@pytest.mark.asyncio
+async def test_export_users_ndjson(async_client, admin_token, users_with_same_role_50_users, export_sessions):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    async with async_client.stream("GET", "/users/export", headers=headers) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) async for line in response.aiter_lines() if line]
+    assert len(rows) == 51
+    assert [row["created_at"] for row in rows] == sorted(row["created_at"] for row in rows)
+    assert rows[0]["role"] in ("AUTHENTICATED", "ADMIN") and "hashed_password" not in rows[0]
+
+@pytest.mark.asyncio
+async def test_export_users_csv_with_filter(async_client, admin_token, users_with_same_role_50_users, export_sessions):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/export", params={"format": "csv", "role": "ADMIN"}, headers=headers)
+    assert response.status_code == 200
+    rows = list(csv.DictReader(response.text.splitlines()))
+    assert [row["email"] for row in rows] == ["admin@example.com"]
+    assert rows[0]["last_login_at"] == "" and rows[0]["role"] == "ADMIN"
+
+@pytest.mark.asyncio
+async def test_export_users_requires_admin(async_client, manager_token):
+    response = await async_client.get("/users/export", headers={"Authorization": f"Bearer {manager_token}"})
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_get_user_conditional_requests(async_client, admin_token, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(f"/users/{verified_user.id}", headers=headers)
+    etag, last_modified = response.headers["ETag"], response.headers["Last-Modified"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = await async_client.get(f"/users/{verified_user.id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304 and response.content == b""
+    assert response.headers["ETag"] == etag
+    response = await async_client.get(f"/users/{verified_user.id}", headers={**headers, "If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+    await async_client.put(f"/users/{verified_user.id}", json={"first_name": "Changed"}, headers=headers)
+    response = await async_client.get(f"/users/{verified_user.id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200 and response.json()["first_name"] == "Changed"
+    response = await async_client.get(f"/users/{uuid4()}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_list_users_conditional_requests(async_client, admin_token, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/?limit=5", headers=headers)
+    etag = response.headers["ETag"]
+    response = await async_client.get("/users/?limit=5", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    response = await async_client.get("/users/?cursor=", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    assert "Last-Modified" not in response.headers
+    response = await async_client.get("/users/?limit=5", headers={**headers, "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert response.status_code == 200
+
+    await async_client.delete(f"/users/{verified_user.id}", headers=headers)
+    response = await async_client.get("/users/?limit=5", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["ETag"] != etag
+
+@pytest.mark.asyncio
+async def test_list_users_etag_ignores_logins_but_not_profile_edits(async_client, admin_token, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    etag = (await async_client.get("/users/?limit=5", headers=headers)).headers["ETag"]
+    form_data = {"username": verified_user.email, "password": "MySuperPassword$1234"}
+    response = await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+    assert response.status_code == 200
+    response = await async_client.get("/users/?limit=5", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    await async_client.put(f"/users/{verified_user.id}", json={"bio": "Edited"}, headers=headers)
+    response = await async_client.get("/users/?limit=5", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["ETag"] != etag
+
+@pytest.mark.asyncio
+async def test_list_users_etag_sees_external_deletes_with_cached_count(async_client, db_session, admin_token, verified_user,
+                                                                       settings_override):
+    settings_override(user_count_mode="cached")
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/?limit=5", headers=headers)
+    etag = response.headers["ETag"]
+    # Another worker deletes the user: this worker's cached count is not invalidated.
+    async with AsyncSession(db_session.bind) as other:
+        await other.execute(delete(User).where(User.id == verified_user.id))
+        await other.commit()
+    response = await async_client.get("/users/?limit=5", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["ETag"] != etag
+
+async def _follow_next(async_client, response, headers):
+    """POST to the next link of a search page, as a client paging through results would."""
+    next_link = next(link["href"] for link in response.json()["links"] if link["rel"] == "next")
+    return await async_client.post(next_link, headers=headers)
+
+@pytest.mark.asyncio
+async def test_search_and_date_next_links_keep_filters(async_client, db_session, admin_token, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    managers = [User(nickname=f"pager_{index}", email=f"pager_{index}@example.com", hashed_password="securepassword",
+                     role=UserRole.MANAGER, created_at=datetime(2024, 3, 1, 12, index)) for index in range(3)]
+    db_session.add_all(managers)
+    await db_session.commit()
+    manager_ids = {str(user.id) for user in managers}
+
+    response = await async_client.post("/users/search", params={"role": "MANAGER", "limit": 2}, headers=headers)
+    assert response.status_code == 200 and response.json()["total"] == 3
+    seen = {user["id"] for user in response.json()["items"]}
+    response = await _follow_next(async_client, response, headers)
+    assert response.status_code == 200 and response.json()["total"] == 3
+    assert all(user["role"] == "MANAGER" for user in response.json()["items"])
+    seen |= {user["id"] for user in response.json()["items"]}
+    assert seen == manager_ids
+
+    params = {"start_date": "2024-03-01", "end_date": "2024-03-01", "limit": 2}
+    response = await async_client.post("/users/date", params=params, headers=headers)
+    assert response.status_code == 200 and response.json()["total"] == 3
+    seen = {user["id"] for user in response.json()["items"]}
+    response = await _follow_next(async_client, response, headers)
+    assert response.status_code == 200 and response.json()["total"] == 3
+    seen |= {user["id"] for user in response.json()["items"]}
+    assert seen == manager_ids
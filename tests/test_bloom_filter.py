@@ -0,0 +1,31 @@
+from builtins import range
+import pytest
+from app.utils.bloom_filter import BloomFilter
+
+
+def test_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    emails = [f"user{i}@example.com" for i in range(1000)]
+    for email in emails:
+        bloom.add(email)
+    assert all(email in bloom for email in emails)
+    assert bloom.count == 1000
+
+def test_false_positive_rate_near_target():
+    bloom = BloomFilter(capacity=2000, false_positive_rate=0.01)
+    for i in range(2000):
+        bloom.add(f"user{i}@example.com")
+    false_positives = sum(f"other{i}@example.com" in bloom for i in range(10000))
+    assert false_positives / 10000 < 0.03
+    assert bloom.false_positive_rate == pytest.approx(0.01, rel=0.5)
+
+def test_memory_footprint_matches_sizing():
+    bloom = BloomFilter(capacity=10000, false_positive_rate=0.01)
+    # ~9.6 bits per item at a 1% false positive rate.
+    assert 11000 < bloom.memory_bytes < 13000
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0)
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=10, false_positive_rate=1.5)
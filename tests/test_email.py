@@ -1,3 +1,4 @@
+import os
 import pytest
 from app.services.email_service import EmailService
 from app.utils.template_manager import TemplateManager
@@ -12,3 +13,47 @@ async def test_send_markdown_email(email_service):
     }
     await email_service.send_user_email(user_data, 'email_verification')
     # Manual verification in Mailtrap
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    (tmp_path / 'header.md').write_text('# Header\n', encoding='utf-8')
+    (tmp_path / 'footer.md').write_text('Footer\n', encoding='utf-8')
+    (tmp_path / 'greeting.md').write_text('Hello {name}, visit [the site]({url}).\n', encoding='utf-8')
+    return tmp_path
+
+
+@pytest.fixture
+def manager(templates_dir):
+    template_manager = TemplateManager()
+    template_manager.templates_dir = templates_dir
+    return template_manager
+
+
+def test_render_template_escapes_context_values(manager):
+    html = manager.render_template('greeting', name='<b>*Ann*</b>', url='http://example.com/?a=1&b=2')
+    assert 'Hello &lt;b&gt;*Ann*&lt;/b&gt;,' in html
+    assert '<a href="http://example.com/?a=1&amp;b=2">the site</a>' in html
+    assert '<h1 style=' in html and 'Footer' in html
+
+
+def test_render_template_compiles_once(manager):
+    first = manager.render_template('greeting', name='Ann', url='http://a')
+    second = manager.render_template('greeting', name='Bob', url='http://b')
+    assert manager.compiles == 1
+    assert first.replace('Ann', 'Bob').replace('http://a', 'http://b') == second
+
+
+def test_render_template_recompiles_when_a_file_changes(manager, templates_dir):
+    manager.render_template('greeting', name='Ann', url='http://a')
+    footer = templates_dir / 'footer.md'
+    footer.write_text('New footer\n', encoding='utf-8')
+    stat = footer.stat()
+    os.utime(footer, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert 'New footer' in manager.render_template('greeting', name='Ann', url='http://a')
+    assert manager.compiles == 2
+
+
+def test_render_template_requires_every_field(manager):
+    with pytest.raises(KeyError):
+        manager.render_template('greeting', name='Ann')
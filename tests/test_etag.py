@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+from app.utils.etag import format_http_date, if_none_match, make_etag, make_list_etag, parse_http_date, parse_if_match
+
+
+def test_etag_round_trip():
+    assert parse_if_match(make_etag(7)) == [7]
+
+def test_parse_if_match_lists_wildcard_and_weak_tags():
+    assert parse_if_match('"3", "4"') == [3, 4]
+    assert parse_if_match("*") is None
+    assert parse_if_match('W/"3"') == []
+    assert parse_if_match("garbage") == []
+
+def test_if_none_match_uses_weak_comparison():
+    assert if_none_match('W/"3", "4"', make_etag(3))
+    assert if_none_match("*", make_etag(3))
+    assert not if_none_match('"30"', make_etag(3))
+
+def test_list_etag_follows_revision():
+    assert make_list_etag(5) != make_list_etag(4)
+    assert make_list_etag(0) == '"r0"'
+    assert make_list_etag(3) != make_etag(3)
+
+def test_http_date_round_trip():
+    stamp = datetime(2026, 10, 17, 12, 0, 1, tzinfo=timezone.utc)
+    assert format_http_date(stamp) == "Sat, 17 Oct 2026 12:00:01 GMT"
+    assert parse_http_date(format_http_date(stamp)) == stamp
+    assert parse_http_date("yesterday") is None and parse_http_date(None) is None
@@ -0,0 +1,53 @@
+from builtins import str
+from datetime import timedelta
+import pytest
+from app.services import jwt_service
+from app.services.jwt_service import clear_token_cache, create_access_token, decode_token_cached, invalidate_cached_token
+from app.utils.ttl_cache import LRUTTLCache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_token_cache()
+    yield
+    clear_token_cache()
+
+def test_decode_token_cached_hits_on_repeat():
+    token = create_access_token(data={"sub": "user@example.com", "role": "admin"}, expires_delta=timedelta(minutes=5))
+    hits = jwt_service._claims_cache.hits
+    first = decode_token_cached(token)
+    second = decode_token_cached(token)
+    assert first["role"] == "ADMIN"
+    assert second is first
+    assert jwt_service._claims_cache.hits == hits + 1
+
+def test_decode_token_cached_rejects_invalid_token():
+    assert decode_token_cached("not-a-token") is None
+    assert len(jwt_service._claims_cache) == 0
+
+def test_decode_token_cached_skips_expired_token():
+    token = create_access_token(data={"sub": "user@example.com"}, expires_delta=timedelta(seconds=-1))
+    assert decode_token_cached(token) is None
+    assert len(jwt_service._claims_cache) == 0
+
+def test_invalidate_cached_token():
+    token = create_access_token(data={"sub": "user@example.com"}, expires_delta=timedelta(minutes=5))
+    decode_token_cached(token)
+    invalidate_cached_token(token)
+    assert len(jwt_service._claims_cache) == 0
+
+def test_lru_ttl_cache_evicts_least_recently_used():
+    cache = LRUTTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+def test_lru_ttl_cache_expires_entries():
+    cache = LRUTTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1, ttl=-1)
+    cache.set("b", 2, ttl=0.0001)
+    assert cache.get("a") is None
@@ -6,7 +6,7 @@ from uuid import uuid4
 import pytest
 from fastapi import Request
 
-from app.utils.link_generation import create_link, create_pagination_link, create_user_links, generate_pagination_links
+from app.utils.link_generation import create_link, create_pagination_link, create_user_links, generate_cursor_links, generate_pagination_links
 
 from urllib.parse import urlparse, parse_qs, urlunparse, urlencode
 
@@ -49,3 +49,17 @@ def test_generate_pagination_links(mock_request):
     assert len(links) >= 4
     expected_self_url = "http://testserver/users?limit=5&skip=10"
     assert normalize_url(str(links[0].href)) == normalize_url(expected_self_url), "Self link should match expected URL"
+
+def test_pagination_links_keep_filters(mock_request):
+    mock_request.url = "http://testserver/users/search?role=ADMIN&q=jo&skip=0&limit=10"
+    links = {link.rel: str(link.href) for link in generate_pagination_links(mock_request, 0, 10, 25)}
+    assert normalize_url(links["next"]) == normalize_url("http://testserver/users/search?role=ADMIN&q=jo&skip=10&limit=10")
+    assert normalize_url(links["last"]) == normalize_url("http://testserver/users/search?role=ADMIN&q=jo&skip=20&limit=10")
+
+def test_cursor_links_replace_only_paging_params(mock_request):
+    mock_request.url = "http://testserver/users/search?q=jo&cursor=abc&limit=5"
+    mock_request.query_params = {"cursor": "abc"}
+    links = {link.rel: str(link.href) for link in generate_cursor_links(mock_request, 5, "def", None)}
+    assert normalize_url(links["self"]) == normalize_url("http://testserver/users/search?q=jo&cursor=abc&limit=5")
+    assert normalize_url(links["next"]) == normalize_url("http://testserver/users/search?q=jo&cursor=def&limit=5")
+    assert "prev" not in links
@@ -1,8 +1,13 @@
-from builtins import repr
+from builtins import len, repr, str
 from datetime import datetime, timezone
 import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user_model import User, UserRole
+from app.models.users_revision_model import LISTED_USER_COLUMNS, UsersRevision
+from app.services.user_service import USER_CURSOR_COLUMNS
 
 @pytest.mark.asyncio
 async def test_user_role(db_session: AsyncSession, user: User, admin_user: User, manager_user: User):
@@ -139,3 +144,39 @@ async def test_update_user_role(db_session: AsyncSession, user: User):
     await db_session.commit()
     await db_session.refresh(user)
     assert user.role == UserRole.ADMIN, "Role update should persist correctly in the database"
+
+async def _users_revision(db_session: AsyncSession) -> int:
+    return (await db_session.execute(select(UsersRevision.revision))).scalar_one()
+
+def test_listed_user_columns_cover_the_list_response():
+    listed = {column.key for column in USER_CURSOR_COLUMNS} - {"id"}
+    assert set(LISTED_USER_COLUMNS) == listed
+
+@pytest.mark.asyncio
+async def test_users_revision_bumps_only_for_listed_changes(db_session: AsyncSession, user: User):
+    """
+    Tests that the trigger bumps the revision for listed data but not for login bookkeeping.
+    """
+    before = await _users_revision(db_session)
+    user.last_login_at = datetime.now(timezone.utc)
+    user.failed_login_attempts = 2
+    await db_session.commit()
+    assert await _users_revision(db_session) == before
+
+    user.bio = "Listed"
+    await db_session.commit()
+    assert await _users_revision(db_session) == before + 1
+
+    await db_session.delete(user)
+    await db_session.commit()
+    assert await _users_revision(db_session) == before + 2
+
+def test_search_indexes_are_declared_on_the_model():
+    """
+    Tests that the migration-created search indexes are in the metadata, so autogenerate keeps them.
+    """
+    indexes = {index.name: str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+               for index in User.__table__.indexes}
+    assert indexes["ix_users_nickname_lower_prefix"].endswith("(lower(nickname) text_pattern_ops)")
+    assert indexes["ix_users_email_trgm"].endswith("USING gin (email gin_trgm_ops)")
+    assert len([name for name in indexes if name.endswith(("_lower_prefix", "_trgm"))]) == 8
@@ -0,0 +1,79 @@
+from builtins import ValueError
+import pytest
+from app.utils.password_hashers import (
+    Argon2Hasher, BcryptHasher, PasswordHasher, ScryptHasher, calibrate, create_hasher, identify_hasher
+)
+from app.utils.security import get_default_hasher, hash_password, password_needs_rehash, set_default_hasher, verify_password
+
+
+@pytest.fixture
+def default_hasher():
+    """Install a temporary default hasher and restore the settings-based one afterwards."""
+    def install(hasher):
+        set_default_hasher(hasher)
+        return hasher
+    yield install
+    set_default_hasher(None)
+
+def test_scrypt_round_trip():
+    hasher = ScryptHasher(n_log2=10)
+    hashed = hasher.hash("secure_password")
+    assert hashed.startswith("$scrypt$ln=10,r=8,p=1$")
+    assert hasher.verify("secure_password", hashed) is True
+    assert hasher.verify("wrong_password", hashed) is False
+
+def test_identify_hasher():
+    assert isinstance(identify_hasher(BcryptHasher(4).hash("pw")), BcryptHasher)
+    assert isinstance(identify_hasher(ScryptHasher(10).hash("pw")), ScryptHasher)
+    assert identify_hasher("invalid_hash_format") is None
+
+def test_verify_password_any_registered_scheme():
+    hashed = ScryptHasher(n_log2=10).hash("secure_password")
+    assert verify_password("secure_password", hashed) is True
+
+def test_needs_rehash_only_below_current_cost():
+    hashed = BcryptHasher(5).hash("pw")
+    assert BcryptHasher(5).needs_rehash(hashed) is False
+    assert BcryptHasher(6).needs_rehash(hashed) is True
+    # A worker calibrated lower leaves another worker's stronger hash alone.
+    assert BcryptHasher(4).needs_rehash(hashed) is False
+    hashed = ScryptHasher(n_log2=11).hash("pw")
+    assert (ScryptHasher(n_log2=10).needs_rehash(hashed), ScryptHasher(n_log2=12).needs_rehash(hashed)) == (False, True)
+    hashed = Argon2Hasher(time_cost=3, memory_cost=1024, parallelism=1).hash("pw")
+    assert Argon2Hasher(time_cost=2, memory_cost=1024, parallelism=1).needs_rehash(hashed) is False
+    assert Argon2Hasher(time_cost=4, memory_cost=1024, parallelism=1).needs_rehash(hashed) is True
+    assert Argon2Hasher(time_cost=3, memory_cost=2048, parallelism=1).needs_rehash(hashed) is True
+
+def test_password_needs_rehash_on_algorithm_change(default_hasher):
+    hashed = BcryptHasher(4).hash("pw")
+    default_hasher(ScryptHasher(n_log2=10))
+    assert password_needs_rehash(hashed) is True
+    assert hash_password("pw").startswith("$scrypt$")
+
+def test_create_hasher_unknown_algorithm():
+    with pytest.raises(ValueError):
+        create_hasher("md5")
+
+def test_calibrate_keeps_cheapest_variant_as_floor():
+    hasher = calibrate(BcryptHasher(), target_ms=0)
+    assert hasher.rounds == BcryptHasher.min_rounds
+
+def test_argon2_round_trip():
+    hasher = Argon2Hasher(time_cost=2, memory_cost=1024, parallelism=1)
+    hashed = hasher.hash("secure_password")
+    assert hashed.startswith("$argon2id$")
+    assert verify_password("secure_password", hashed) is True
+
+def test_argon2id_from_settings(default_hasher, settings_override):
+    settings_override(password_hash_algorithm="argon2id", argon2_time_cost=2, argon2_memory_cost=1024, argon2_parallelism=1)
+    default_hasher(None)
+    assert isinstance(get_default_hasher(), Argon2Hasher)
+    hashed = hash_password("pw")
+    assert verify_password("pw", hashed) is True and password_needs_rehash(hashed) is False
+
+def test_hasher_must_implement_every_method():
+    class HashOnly(PasswordHasher):
+        def hash(self, password):
+            return password
+    with pytest.raises(TypeError):
+        HashOnly()
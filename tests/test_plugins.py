@@ -0,0 +1,26 @@
+import pytest
+from app.services.user_cache import LocalUserCacheBackend, UserCacheBackend
+from app.utils.plugins import import_class
+from app.utils.rate_limiter import RateLimitBackend
+
+
+def test_import_class():
+    assert import_class("app.services.user_cache.LocalUserCacheBackend", UserCacheBackend) is LocalUserCacheBackend
+
+@pytest.mark.parametrize("path", ["app.services.user_cache.Missing", "no_such_module.Backend", "Backend",
+                                  "app.services.user_cache.user_cache"])
+def test_import_class_rejects_bad_paths(path):
+    with pytest.raises(ValueError):
+        import_class(path, UserCacheBackend)
+
+def test_import_class_checks_the_interface():
+    with pytest.raises(ValueError, match="is not a RateLimitBackend"):
+        import_class("app.services.user_cache.LocalUserCacheBackend", RateLimitBackend)
+
+@pytest.mark.parametrize("base", [UserCacheBackend, RateLimitBackend])
+def test_backends_must_implement_every_method(base):
+    class GetOnly(base):
+        async def get(self, key):
+            return None
+    with pytest.raises(TypeError):
+        GetOnly()
@@ -0,0 +1,69 @@
+from builtins import range
+import pytest
+from app.utils.rate_limiter import InMemoryRateLimitBackend, LoginThrottle
+
+
+@pytest.fixture
+def backend():
+    return InMemoryRateLimitBackend(window_seconds=10, buckets=10)
+
+async def test_window_counts_hits(backend):
+    for _ in range(3):
+        await backend.hit("k", now=100.0)
+    await backend.hit("k", now=105.0)
+    assert await backend.count("k", now=105.0) == 4
+
+async def test_window_slides_out_old_buckets(backend):
+    await backend.hit("k", now=100.0)
+    await backend.hit("k", now=105.0)
+    assert await backend.count("k", now=110.5) == 1
+    assert await backend.count("k", now=200.0) == 0
+
+async def test_full_table_reclaims_idle_keys():
+    backend = InMemoryRateLimitBackend(window_seconds=10, buckets=10, max_keys=2)
+    await backend.hit("a", now=100.0)
+    await backend.hit("b", now=100.0)
+    await backend.hit("c", now=200.0)
+    assert backend.stats()["tracked_keys"] == 2
+    assert await backend.count("a", now=200.0) == 0 and await backend.count("c", now=200.0) == 1
+
+async def test_full_table_never_drops_active_keys():
+    backend = InMemoryRateLimitBackend(window_seconds=10, buckets=10, max_keys=2)
+    await backend.hit("a", now=100.0)
+    await backend.hit("b", now=101.0)
+    await backend.hit("a", now=102.0)
+    await backend.hit("c", now=103.0)
+    assert await backend.count("a", now=103.0) == 2 and await backend.count("b", now=103.0) == 1
+    assert backend.stats()["over_capacity"] == 1
+    # Once b ages out it is reclaimed first, even though a was inserted before it.
+    await backend.hit("d", now=111.5)
+    assert await backend.count("b", now=111.5) == 0 and await backend.count("a", now=111.5) == 1
+
+async def test_unhit_takes_back_one_hit(backend):
+    await backend.hit("k", now=100.0)
+    await backend.hit("k", now=105.0)
+    await backend.unhit("k", at=100.0)
+    assert await backend.count("k", now=105.0) == 1
+    await backend.unhit("k", at=100.0)
+    assert await backend.count("k", now=105.0) == 1
+
+async def test_login_throttle_counts_attempts_in_flight(backend):
+    throttle = LoginThrottle(backend, per_ip=100, per_account=2, window_seconds=10)
+    # Two concurrent attempts are admitted before either has been verified; the third is not.
+    assert await throttle.begin_attempt("1.2.3.4", "User@Example.com") is not None
+    started = await throttle.begin_attempt("1.2.3.4", "user@example.com")
+    assert started is not None
+    assert await throttle.begin_attempt("1.2.3.4", "user@example.com") is None
+    assert await throttle.begin_attempt("1.2.3.4", "other@example.com") is not None
+    await throttle.record_success("1.2.3.4", "user@example.com", started)
+    assert await throttle.begin_attempt("1.2.3.4", "user@example.com") is not None
+
+async def test_login_throttle_blocks_ip(backend):
+    throttle = LoginThrottle(backend, per_ip=2, per_account=100, window_seconds=10)
+    await throttle.begin_attempt("1.2.3.4", "a@example.com")
+    started = await throttle.begin_attempt("1.2.3.4", "b@example.com")
+    assert await throttle.begin_attempt("1.2.3.4", "c@example.com") is None
+    assert throttle.stats()["rejected"] == 1
+    # A successful login gives the address its attempt back.
+    await throttle.record_success("1.2.3.4", "b@example.com", started)
+    assert await throttle.begin_attempt("1.2.3.4", "c@example.com") is not None
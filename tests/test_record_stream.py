@@ -0,0 +1,43 @@
+import pytest
+from app.utils.record_stream import iter_csv_records, iter_jsonl_records
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _chunks(data: bytes, size: int = 5):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+async def _collect(records):
+    return [record async for record in records]
+
+async def test_csv_records_across_chunk_boundaries():
+    data = '﻿email,bio\r\na@example.com,"line one\nline two"\n\nb@example.com,\nc@example.com\n'.encode()
+    assert await _collect(iter_csv_records(_chunks(data))) == [
+        (2, {"email": "a@example.com", "bio": "line one\nline two"}, None),
+        (5, {"email": "b@example.com", "bio": None}, None),
+        (6, None, "Expected 2 columns, got 1"),
+    ]
+
+async def test_csv_unterminated_quote_is_reported():
+    records = await _collect(iter_csv_records(_chunks(b'email,bio\na@example.com,"open\n')))
+    assert records == [(2, None, "Unterminated quoted field")]
+
+async def test_jsonl_records():
+    data = b'{"email": "a@example.com"}\n\n[1]\n{broken\n{"email": "b@example.com"}'
+    records = await _collect(iter_jsonl_records(_chunks(data, 7)))
+    assert [(line, record) for line, record, _ in records] == [
+        (1, {"email": "a@example.com"}), (3, None), (4, None), (5, {"email": "b@example.com"}),
+    ]
+    assert records[1][2] == "Expected a JSON object"
+    assert records[2][2].startswith("Invalid JSON")
+
+async def test_jsonl_crlf_split_across_chunks_keeps_line_numbers():
+    data = b'{"email": "a@example.com"}\r\n{"email": "b@example.com"}\r\n[1]\r\n'
+    # A chunk size of 27 cuts the first CRLF between its two bytes.
+    records = await _collect(iter_jsonl_records(_chunks(data, 27)))
+    assert [line for line, _, _ in records] == [1, 2, 3]
+
+async def test_jsonl_unicode_line_separators_inside_strings():
+    data = '{"bio": "one\u2028two\u2029three"}\n'.encode()
+    assert await _collect(iter_jsonl_records(_chunks(data))) == [(1, {"bio": "one\u2028two\u2029three"}, None)]
@@ -0,0 +1,52 @@
+from builtins import range
+import time
+import pytest
+from app.utils import revocation_store as store_module
+from app.utils.revocation_store import RevocationStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(store_module.time, "time", lambda: now[0])
+    return now
+
+def test_revoked_jti_is_rejected(clock):
+    store = RevocationStore(granularity=60)
+    store.revoke_token("abc", clock[0] + 300)
+    assert store.is_revoked({"jti": "abc", "sub": "user", "iat": clock[0]})
+    assert not store.is_revoked({"jti": "other", "sub": "user", "iat": clock[0]})
+
+def test_subject_revocation_only_hits_older_tokens(clock):
+    store = RevocationStore(granularity=60)
+    store.revoke_subject("user@example.com", not_before=clock[0], expires_at=clock[0] + 900)
+    assert store.is_revoked({"sub": "user@example.com", "iat": clock[0] - 10})
+    assert store.is_revoked({"sub": "user@example.com"})
+    assert not store.is_revoked({"sub": "user@example.com", "iat": clock[0] + 0.5})
+    assert not store.is_revoked({"sub": "someone@example.com", "iat": clock[0] - 10})
+
+def test_entries_expire_with_their_tokens(clock):
+    store = RevocationStore(granularity=60)
+    for i in range(100):
+        store.revoke_token(f"jti-{i}", clock[0] + 60 + i)
+    store.revoke_subject("user", not_before=clock[0], expires_at=clock[0] + 600)
+    clock[0] += 200
+    assert not store.is_revoked({"jti": "jti-0"})
+    assert len(store) == 1
+    assert store.is_revoked({"sub": "user", "iat": clock[0] - 500})
+    clock[0] += 500
+    store.is_revoked({})
+    assert len(store) == 0
+    assert store.stats()["expired"] == 101
+
+def test_re_revoked_subject_moves_to_later_slot(clock):
+    store = RevocationStore(granularity=60)
+    store.revoke_subject("user", not_before=clock[0], expires_at=clock[0] + 100)
+    store.revoke_subject("user", not_before=clock[0] + 50, expires_at=clock[0] + 1000)
+    clock[0] += 300
+    assert store.is_revoked({"sub": "user", "iat": clock[0] - 260})
+
+def test_already_expired_revocations_are_ignored():
+    store = RevocationStore()
+    store.revoke_token("old", time.time() - 1)
+    assert len(store) == 0
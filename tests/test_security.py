@@ -1,7 +1,7 @@
 # test_security.py
 from builtins import RuntimeError, ValueError, isinstance, str
 import pytest
-from app.utils.security import hash_password, verify_password
+from app.utils.security import hash_password, hash_password_async, verify_password, verify_password_async
 
 def test_hash_password():
     """Test that hashing password returns a bcrypt hashed string."""
@@ -65,3 +65,18 @@ def test_hash_password_internal_error(monkeypatch):
     with pytest.raises(ValueError):
         hash_password("test")
 
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_password_async():
+    """Test that the pooled async helpers produce and check regular bcrypt hashes."""
+    hashed = await hash_password_async("secure_password", 10)
+    assert hashed.startswith('$2b$10$')
+    assert await verify_password_async("secure_password", hashed) is True
+    assert await verify_password_async("wrong_password", hashed) is False
+    assert verify_password("secure_password", hashed) is True
+
+@pytest.mark.asyncio
+async def test_verify_password_async_invalid_hash():
+    """Test that errors raised in the worker surface to the caller unchanged."""
+    with pytest.raises(ValueError):
+        await verify_password_async("secure_password", "invalid_hash_format")
@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import text
+from app.services import count_service
+from app.services.count_service import UserCountProvider
+from app.services.user_service import UserService
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_exact_mode_counts_every_time(db_session, users_with_same_role_50_users, settings_override):
+    settings_override(user_count_mode="exact")
+    provider = UserCountProvider()
+    assert await provider.count(db_session) == (50, "exact")
+    assert await provider.count(db_session) == (50, "exact")
+    assert provider.exact_counts == 2
+
+async def test_cached_mode_reuses_until_invalidated(db_session, verified_user, settings_override):
+    settings_override(user_count_mode="cached", user_count_cache_ttl_seconds=60)
+    provider = count_service.user_count_provider
+    provider.invalidate()
+    assert await provider.count(db_session) == (1, "exact")
+    assert await provider.count(db_session) == (1, "cached")
+    await UserService.delete(db_session, verified_user.id)
+    assert await provider.count(db_session) == (0, "exact")
+
+async def test_estimated_mode_uses_reltuples_above_threshold(db_session, users_with_same_role_50_users, settings_override):
+    await db_session.execute(text("ANALYZE users"))
+    settings_override(user_count_mode="estimated", user_count_estimate_threshold=10)
+    provider = UserCountProvider()
+    total, source = await provider.count(db_session)
+    assert source == "estimated" and total == 50
+    settings_override(user_count_estimate_threshold=1000)
+    assert await provider.count(db_session) == (50, "exact")
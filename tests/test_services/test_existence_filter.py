@@ -0,0 +1,50 @@
+import pytest
+from app.services.existence_filter import user_existence_filter
+from app.services.user_service import LoginStatus, UserService
+from app.utils.nickname_gen import generate_nickname
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+async def built_filter(db_session, verified_user):
+    await user_existence_filter.build(db_session, false_positive_rate=0.001, growth=2.0)
+    yield user_existence_filter
+    user_existence_filter.reset()
+
+async def test_filter_skips_lookup_for_unknown_email(db_session, built_filter, verified_user):
+    skipped = built_filter.skipped_lookups
+    assert await UserService.get_by_email(db_session, "nobody@example.com") is None
+    assert built_filter.skipped_lookups == skipped + 1
+    assert (await UserService.get_by_email(db_session, verified_user.email)).id == verified_user.id
+
+async def test_filter_short_circuits_login(db_session, built_filter):
+    login_status, _ = await UserService.authenticate(db_session, "nobody@example.com", "Password123!")
+    assert login_status is LoginStatus.INVALID
+
+async def test_filter_learns_created_users(db_session, built_filter, email_service):
+    user_data = {
+        "nickname": generate_nickname(),
+        "email": "filter_created@example.com",
+        "password": "ValidPassword123!",
+        "role": "AUTHENTICATED",
+    }
+    assert await UserService.create(db_session, user_data, email_service) is not None
+    assert built_filter.might_have_email("filter_created@example.com")
+    assert built_filter.might_have_nickname(user_data["nickname"])
+    assert await UserService.create(db_session, user_data, email_service) is None
+
+async def test_filter_stats(built_filter):
+    stats = built_filter.stats()
+    assert stats["ready"] is True
+    assert stats["memory_bytes"] > 0
+    assert 0 <= stats["email_false_positive_rate"] < 0.01
+
+async def test_create_duplicate_nickname_returns_none(db_session, verified_user, email_service):
+    user_data = {
+        "nickname": verified_user.nickname,
+        "email": "another_address@example.com",
+        "password": "ValidPassword123!",
+        "role": "AUTHENTICATED",
+    }
+    assert await UserService.create(db_session, user_data, email_service) is None
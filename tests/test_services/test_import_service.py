@@ -0,0 +1,44 @@
+import json
+import pytest
+from sqlalchemy import func, select
+from app.models.user_model import User
+from app.services.import_service import UserImportService
+from app.utils.record_stream import iter_jsonl_records
+from app.utils.security import verify_password
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _jsonl(*records):
+    yield "".join(json.dumps(record) + "\n" for record in records).encode()
+
+def _record(email, nickname=None, **extra):
+    return {"email": email, "nickname": nickname, "password": "Secure*1234", "role": "AUTHENTICATED", **extra}
+
+async def test_import_users_in_chunks_reports_rejected_rows(db_session, verified_user):
+    records = iter_jsonl_records(_jsonl(
+        _record("one@example.com", "partner_one", first_name="One"),
+        _record("two@example.com"),
+        _record("not-an-email"),
+        _record("one@example.com", "partner_again"),
+        _record(verified_user.email, "partner_taken"),
+        _record("three@example.com", verified_user.nickname),
+        _record("four@example.com", "partner_four"),
+    ))
+    report = await UserImportService.import_users(db_session, records, chunk_size=2)
+
+    assert report.received == 7
+    assert sorted(user.email for user in report.created) == ["four@example.com", "one@example.com", "two@example.com"]
+    assert [(error.line, error.email) for error in report.errors] == [
+        (3, "not-an-email"), (4, "one@example.com"), (5, verified_user.email), (6, "three@example.com"),
+    ]
+    assert report.errors[0].error.startswith("email:")
+    assert report.errors[1].error == "Duplicate email or nickname in this file"
+    assert report.errors[2].error == report.errors[3].error == "Email or nickname already exists"
+
+    imported = (await db_session.execute(select(User).where(User.email == "one@example.com"))).scalar_one()
+    assert imported.nickname == "partner_one" and imported.first_name == "One"
+    assert imported.version == 1 and not imported.email_verified and not imported.is_locked
+    assert imported.verification_token and imported.created_at is not None
+    assert verify_password("Secure*1234", imported.hashed_password)
+    assert await db_session.scalar(select(func.count()).select_from(User)) == 4
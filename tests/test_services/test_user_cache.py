@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import Database, UnitOfWork
+from app.services.user_cache import LocalUserCacheBackend, UserCache, UserCacheBackend, user_cache
+from app.services.user_service import UserProfile, UserService
+
+pytestmark = pytest.mark.asyncio
+
+
+class DictBackend(UserCacheBackend):
+    """Stand-in for a shared store: every UserCache built on one instance sees the same entries."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(user_cache, "enabled", True)
+    monkeypatch.setattr(user_cache, "backend", LocalUserCacheBackend(maxsize=100, ttl=60))
+    for counter in ("hits", "misses", "invalidations"):
+        monkeypatch.setattr(user_cache, counter, 0)
+    return user_cache
+
+@pytest.fixture
+def statements(db_session):
+    executed = []
+    listener = lambda conn, cursor, statement, *args: executed.append(statement)
+    event.listen(db_session.bind.sync_engine, "before_cursor_execute", listener)
+    yield executed
+    event.remove(db_session.bind.sync_engine, "before_cursor_execute", listener)
+
+def _session(db_session) -> AsyncSession:
+    return AsyncSession(db_session.bind, expire_on_commit=False)
+
+async def test_profile_hit_needs_no_query(db_session, verified_user, cache, statements):
+    async with _session(db_session) as session:
+        profile = await UserService.get_profile(session, verified_user.id)
+        statements.clear()
+        assert await UserService.get_profile(session, verified_user.id) == profile
+        assert statements == []
+    assert profile.email == verified_user.email and profile.version == verified_user.version
+    assert cache.stats()["hit_ratio"] == 0.5
+
+async def test_profile_miss_reads_the_primary(db_session, verified_user, cache, monkeypatch):
+    def replica_read(session):
+        pytest.fail("a cache miss must not be filled from a replica")
+    monkeypatch.setattr(Database, "read_session_for", replica_read)
+    async with _session(db_session) as session:
+        assert (await UserService.get_profile(session, verified_user.id)).email == verified_user.email
+
+async def test_profile_holds_no_secrets(db_session, verified_user, cache):
+    async with _session(db_session) as session:
+        await UserService.get_profile(session, verified_user.id)
+    cached = await cache.backend.get(f"user:profile:{verified_user.id}")
+    assert isinstance(cached, UserProfile)
+    assert not {"hashed_password", "verification_token"} & set(cached._fields)
+
+async def test_write_paths_invalidate(db_session, locked_user, cache):
+    async with _session(db_session) as session:
+        await UserService.get_profile(session, locked_user.id)
+        assert await UserService.unlock_user_account(session, locked_user.id)
+        assert await UserService.update(session, locked_user.id, {"first_name": "Renamed"})
+    async with _session(db_session) as session:
+        assert (await UserService.get_profile(session, locked_user.id)).first_name == "Renamed"
+        assert await UserService.delete(session, locked_user.id)
+    async with _session(db_session) as session:
+        assert await UserService.get_profile(session, locked_user.id) is None
+    assert cache.invalidations == 3
+
+async def test_invalidated_again_when_unit_of_work_commits(db_session, verified_user, cache):
+    async with _session(db_session) as session:
+        UnitOfWork.begin(session)
+        assert await UserService.reset_password(session, verified_user.id, "N3w*Password")
+        # A concurrent request reads the not yet committed row back into the cache.
+        async with _session(db_session) as other:
+            await UserService.get_profile(other, verified_user.id)
+        await UnitOfWork.finish(session)
+    assert await cache.backend.get(f"user:profile:{verified_user.id}") is None
+
+async def test_shared_backend_invalidation_reaches_every_worker(db_session, verified_user):
+    shared = DictBackend()
+    worker_a, worker_b = UserCache(shared, ttl=60), UserCache(shared, ttl=60)
+    await worker_a.put(verified_user.id, "profile")
+    assert await worker_b.get(verified_user.id) == "profile"
+    async with _session(db_session) as session:
+        await worker_a.invalidate(session, verified_user.id)
+    assert await worker_b.get(verified_user.id) is None
+    assert (worker_b.hits, worker_b.misses) == (1, 1)
@@ -1,10 +1,20 @@
 from builtins import range
+import time
 import pytest
-from sqlalchemy import select
+from datetime import date, datetime, timezone
+from sqlalchemy import select, update
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import UnitOfWork
 from app.dependencies import get_settings
 from app.models.user_model import User, UserRole
-from app.services.user_service import UserService
+from app.services.count_service import user_count_provider
+from app.services.email_service import EmailService
+from app.services.revocation_service import revocation_store
+from app.services.user_service import USER_RESPONSE_COLUMNS, LoginStatus, StaleVersionError, UserFilter, UserService
 from app.utils.nickname_gen import generate_nickname
+from app.utils.password_hashers import BcryptHasher
+from app.utils.security import set_default_hasher, verify_password
 
 pytestmark = pytest.mark.asyncio
 
@@ -31,6 +41,27 @@ async def test_create_user_with_invalid_data(db_session, email_service):
     user = await UserService.create(db_session, user_data, email_service)
     assert user is None
 
+async def test_create_side_effects_wait_for_the_unit_of_work(db_session, monkeypatch):
+    email_service = AsyncMock(spec=EmailService)
+    invalidate = MagicMock()
+    monkeypatch.setattr(user_count_provider, "invalidate", invalidate)
+    user_data = {"nickname": generate_nickname(), "email": "deferred@example.com", "password": "ValidPassword123!",
+                 "role": UserRole.AUTHENTICATED.name}
+    async with AsyncSession(db_session.bind, expire_on_commit=False) as session:
+        UnitOfWork.begin(session)
+        assert await UserService.create(session, user_data, email_service)
+        email_service.send_verification_email.assert_not_called()
+        await UnitOfWork.finish(session, commit=False)
+        # Rolled back: nobody is emailed about an account that does not exist.
+        email_service.send_verification_email.assert_not_called()
+        invalidate.assert_not_called()
+
+        UnitOfWork.begin(session)
+        user = await UserService.create(session, user_data, email_service)
+        await UnitOfWork.finish(session)
+    email_service.send_verification_email.assert_awaited_once_with(user)
+    invalidate.assert_called_once()
+
 # Test fetching a user by ID when the user exists
 async def test_get_by_id_user_exists(db_session, user):
     retrieved_user = await UserService.get_by_id(db_session, user.id)
@@ -69,6 +100,13 @@ async def test_update_user_valid_data(db_session, user):
     assert updated_user is not None
     assert updated_user.email == new_email
 
+async def test_update_is_a_compare_and_swap_on_version(db_session, user):
+    updated_user = await UserService.update(db_session, user.id, {"bio": "Edited"}, expected_versions=[1])
+    assert (updated_user.bio, updated_user.version) == ("Edited", 2)
+    with pytest.raises(StaleVersionError):
+        await UserService.update(db_session, user.id, {"bio": "Stale edit"}, expected_versions=[1])
+    assert (await UserService.get_row_by_id(db_session, user.id)).bio == "Edited"
+
 # Test updating a user with invalid data
 async def test_update_user_invalid_data(db_session, user):
     updated_user = await UserService.update(db_session, user.id, {"email": "invalidemail"})
@@ -93,6 +131,88 @@ async def test_list_users_with_pagination(db_session, users_with_same_role_50_us
     assert len(users_page_2) == 10
     assert users_page_1[0].id != users_page_2[0].id
 
+async def test_list_users_keyset_walks_forward_and_back(db_session, users_with_same_role_50_users):
+    page_1, has_more = await UserService.list_users_keyset(db_session, limit=20)
+    assert len(page_1) == 20 and has_more
+    last = page_1[-1]
+    page_2, has_more = await UserService.list_users_keyset(db_session, limit=20, after=(last.created_at, last.id))
+    page_3, has_more = await UserService.list_users_keyset(db_session, limit=20, after=(page_2[-1].created_at, page_2[-1].id))
+    assert len(page_3) == 10 and not has_more
+    assert len({user.id for user in page_1 + page_2 + page_3}) == 50
+    back, has_more = await UserService.list_users_keyset(db_session, limit=20, before=(page_2[0].created_at, page_2[0].id))
+    assert [user.id for user in back] == [user.id for user in page_1]
+    assert not has_more
+
+async def test_stream_yields_bounded_batches_in_creation_order(db_session, users_with_same_role_50_users):
+    batches = [batch async for batch in UserService.stream(db_session, UserFilter(), USER_RESPONSE_COLUMNS + (User.created_at,), 16)]
+    assert [len(batch) for batch in batches] == [16, 16, 16, 2]
+    rows = [row for batch in batches for row in batch]
+    assert [(row.created_at, row.id) for row in rows] == sorted((row.created_at, row.id) for row in rows)
+
+async def test_search_pages_and_counts_in_the_database(db_session, users_with_same_role_50_users, admin_user):
+    role_filter = UserFilter().role(UserRole.AUTHENTICATED)
+    users, total = await UserService.search(db_session, role_filter, skip=40, limit=20)
+    assert total == 50
+    assert len(users) == 10
+    assert all(user.role == UserRole.AUTHENTICATED for user in users)
+    target = users_with_same_role_50_users[0]
+    users, total = await UserService.search(db_session, UserFilter().role(UserRole.AUTHENTICATED).email(target.email))
+    assert total == 1 and users[0].id == target.id
+    users, total = await UserService.search(db_session, UserFilter().role(UserRole.ADMIN).email(target.email))
+    assert (users, total) == ([], 0)
+
+async def test_created_between_uses_half_open_utc_days(db_session, users_with_same_role_50_users):
+    first, second = users_with_same_role_50_users[:2]
+    await db_session.execute(update(User).where(User.id == first.id).values(created_at=datetime(2024, 3, 1, 23, 59, 59, tzinfo=timezone.utc)))
+    await db_session.execute(update(User).where(User.id == second.id).values(created_at=datetime(2024, 3, 2, 0, 0, tzinfo=timezone.utc)))
+    await db_session.commit()
+    users, total = await UserService.search(db_session, UserFilter().created_between(date(2024, 3, 1), date(2024, 3, 1)))
+    assert [user.id for user in users] == [first.id] and total == 1
+    users, total = await UserService.search(db_session, UserFilter().created_between(None, date(2024, 3, 2)))
+    assert total == 2
+    users, total = await UserService.search(db_session, UserFilter().created_between(date(2024, 3, 2), None), limit=5)
+    assert total == 49 and len(users) == 5
+
+async def test_fuzzy_search_matches_substrings_and_ranks_prefixes_first(db_session, users_with_same_role_50_users, monkeypatch):
+    monkeypatch.setattr(UserService, "_trigram_available", False)
+    first, second = users_with_same_role_50_users[:2]
+    await db_session.execute(update(User).where(User.id == first.id).values(last_name="Mcjonesy"))
+    await db_session.execute(update(User).where(User.id == second.id).values(nickname="jonesy_100"))
+    await db_session.commit()
+    users, total = await UserService.search(db_session, UserFilter().fuzzy("JONESY"))
+    assert total == 2
+    assert users[0].id == second.id
+    users, total = await UserService.search(db_session, UserFilter().fuzzy("100%"))
+    assert total == 0
+
+async def test_fuzzy_search_matches_short_terms_as_prefixes(db_session, users_with_same_role_50_users):
+    first, second = users_with_same_role_50_users[:2]
+    await db_session.execute(update(User).where(User.id == first.id).values(first_name="Qzara"))
+    await db_session.execute(update(User).where(User.id == second.id).values(last_name="Aqz"))
+    await db_session.commit()
+    users, total = await UserService.search(db_session, UserFilter().fuzzy("QZ"))
+    assert [user.id for user in users] == [first.id] and total == 1
+    assert "lower(users.first_name) LIKE" in str(await UserService.fuzzy_clause(db_session, "qz"))
+
+async def test_fuzzy_search_bounds_trigram_candidates_by_similarity(db_session, monkeypatch):
+    monkeypatch.setattr(UserService, "_trigram_available", True)
+    clause = str(await UserService.fuzzy_clause(db_session, "jones"))
+    assert "users.nickname %> " in clause and "LIKE" not in clause
+
+async def test_fuzzy_search_ranks_by_similarity_with_pg_trgm(db_session, verified_user):
+    if not await UserService.trigram_available(db_session):
+        pytest.skip("pg_trgm is not installed")
+    users, total = await UserService.search(db_session, UserFilter().fuzzy(verified_user.email[:6]))
+    assert users[0].id == verified_user.id
+
+async def test_read_projections_skip_sensitive_columns(db_session, verified_user, users_with_same_role_50_users):
+    row = await UserService.get_row_by_id(db_session, verified_user.id)
+    assert row.email == verified_user.email
+    assert "hashed_password" not in row._fields and "verification_token" not in row._fields
+    rows, total = await UserService.search(db_session, UserFilter().role(UserRole.AUTHENTICATED), limit=5, columns=USER_RESPONSE_COLUMNS)
+    assert len(rows) == 5 and total == 51
+    assert rows[0]._fields == tuple(column.key for column in USER_RESPONSE_COLUMNS)
+
 # Test registering a user with valid data
 async def test_register_user_with_valid_data(db_session, email_service):
     user_data = {
@@ -123,6 +243,26 @@ async def test_login_user_successful(db_session, verified_user):
     logged_in_user = await UserService.login_user(db_session, user_data["email"], user_data["password"])
     assert logged_in_user is not None
 
+# Test that a successful login upgrades a hash made with outdated parameters
+async def test_login_user_rehashes_outdated_hash(db_session, verified_user):
+    verified_user.hashed_password = BcryptHasher(4).hash("MySuperPassword$1234")
+    await db_session.commit()
+    set_default_hasher(BcryptHasher(5))
+    try:
+        logged_in_user = await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234")
+        assert logged_in_user is not None
+        await db_session.refresh(verified_user)
+        assert verified_user.hashed_password.startswith("$2b$05$")
+        assert verify_password("MySuperPassword$1234", verified_user.hashed_password)
+
+        # A worker calibrated to a lower cost keeps the stronger hash.
+        set_default_hasher(BcryptHasher(4))
+        assert await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234") is not None
+        await db_session.refresh(verified_user)
+        assert verified_user.hashed_password.startswith("$2b$05$")
+    finally:
+        set_default_hasher(None)
+
 # Test user login with incorrect email
 async def test_login_user_incorrect_email(db_session):
     user = await UserService.login_user(db_session, "nonexistentuser@noway.com", "Password123!")
@@ -139,9 +279,37 @@ async def test_account_lock_after_failed_logins(db_session, verified_user):
     for _ in range(max_login_attempts):
         await UserService.login_user(db_session, verified_user.email, "wrongpassword")
     
-    is_locked = await UserService.is_account_locked(db_session, verified_user.email)
+    is_locked = (await db_session.execute(select(User.is_locked).where(User.id == verified_user.id))).scalar()
     assert is_locked, "The account should be locked after the maximum number of failed login attempts."
 
+# Test that the attempt crossing the threshold reports the lock and later attempts stay locked
+async def test_authenticate_locks_on_threshold(db_session, verified_user):
+    max_login_attempts = get_settings().max_login_attempts
+    for _ in range(max_login_attempts - 1):
+        login_status, _ = await UserService.authenticate(db_session, verified_user.email, "wrongpassword")
+        assert login_status is LoginStatus.INVALID
+    login_status, _ = await UserService.authenticate(db_session, verified_user.email, "wrongpassword")
+    assert login_status is LoginStatus.LOCKED
+    login_status, _ = await UserService.authenticate(db_session, verified_user.email, "MySuperPassword$1234")
+    assert login_status is LoginStatus.LOCKED
+    await db_session.refresh(verified_user)
+    assert verified_user.failed_login_attempts == max_login_attempts
+
+# Test that a successful login resets the failed attempt counter
+async def test_authenticate_success_resets_failed_attempts(db_session, verified_user):
+    await UserService.authenticate(db_session, verified_user.email, "wrongpassword")
+    login_status, auth_user = await UserService.authenticate(db_session, verified_user.email, "MySuperPassword$1234")
+    assert login_status is LoginStatus.SUCCESS
+    assert auth_user.id == verified_user.id
+    await db_session.refresh(verified_user)
+    assert verified_user.failed_login_attempts == 0
+    assert verified_user.last_login_at is not None
+
+# Test that unverified users are reported separately and not counted as failures
+async def test_authenticate_unverified_user(db_session, unverified_user):
+    login_status, _ = await UserService.authenticate(db_session, unverified_user.email, "MySuperPassword$1234")
+    assert login_status is LoginStatus.UNVERIFIED
+
 # Test resetting a user's password
 async def test_reset_password(db_session, user):
     new_password = "NewPassword123!"
@@ -224,10 +392,9 @@ async def test_search_user_role(db_session):
     assert created_user is not None 
     assert created_user.role == mock_role
 
-    retrieved_user = await UserService.get_by_role(db_session, mock_role)
-    assert retrieved_user is not None 
-    assert len(retrieved_user) > 0 
-    for user in retrieved_user:
+    retrieved_users, total = await UserService.search(db_session, UserFilter().role(mock_role))
+    assert total > 0
+    for user in retrieved_users:
         assert user.role == mock_role
 
 
@@ -304,3 +471,12 @@ async def test_search_user_nickname_and_role(db_session):
     
     assert retrieved_user_by_nickname and (retrieved_user_by_nickname.role == mock_role)
 '''
+
+async def test_lockout_revokes_existing_tokens(db_session, verified_user):
+    issued_before = {"sub": str(verified_user.id), "iat": time.time() - 1}
+    assert not revocation_store.is_revoked(issued_before)
+    for _ in range(get_settings().max_login_attempts):
+        login_status, _ = await UserService.authenticate(db_session, verified_user.email, "WrongPassword!")
+    assert login_status is LoginStatus.LOCKED
+    assert revocation_store.is_revoked(issued_before)
+    assert revocation_store.is_revoked({"sub": verified_user.email, "iat": time.time() - 1})
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.services.user_service import LoginStatus, UserService
+from app.services.write_behind import LastLoginBuffer, last_login_buffer
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_flush_writes_batch_in_one_statement(db_session, verified_user, user):
+    buffer = LastLoginBuffer()
+    logged_in_at = datetime.now(timezone.utc).replace(microsecond=0)
+    buffer.record(verified_user.id, logged_in_at - timedelta(minutes=1))
+    buffer.record(verified_user.id, logged_in_at)
+    buffer.record(user.id, logged_in_at)
+    assert len(buffer) == 2
+
+    assert await buffer.flush(db_session) == 2
+    assert len(buffer) == 0
+    await db_session.refresh(verified_user)
+    await db_session.refresh(user)
+    assert verified_user.last_login_at == logged_in_at
+    assert user.last_login_at == logged_in_at
+    assert buffer.stats()["rows_flushed"] == 2
+
+async def test_flush_never_moves_timestamp_backwards(db_session, verified_user):
+    newer = datetime.now(timezone.utc).replace(microsecond=0)
+    verified_user.last_login_at = newer
+    await db_session.commit()
+    buffer = LastLoginBuffer()
+    buffer.record(verified_user.id, newer - timedelta(hours=1))
+    await buffer.flush(db_session)
+    await db_session.refresh(verified_user)
+    assert verified_user.last_login_at == newer
+
+async def test_authenticate_buffers_last_login(db_session, verified_user, settings_override):
+    settings_override(last_login_write_behind=True)
+    login_status, _ = await UserService.authenticate(db_session, verified_user.email, "MySuperPassword$1234")
+    assert login_status is LoginStatus.SUCCESS
+    try:
+        await db_session.refresh(verified_user)
+        assert verified_user.last_login_at is None
+        assert await last_login_buffer.flush(db_session) == 1
+        await db_session.refresh(verified_user)
+        assert verified_user.last_login_at is not None
+    finally:
+        last_login_buffer._pending.clear()
+
+async def test_authenticate_resets_failures_synchronously(db_session, verified_user, settings_override):
+    settings_override(last_login_write_behind=True)
+    await UserService.authenticate(db_session, verified_user.email, "wrongpassword")
+    login_status, _ = await UserService.authenticate(db_session, verified_user.email, "MySuperPassword$1234")
+    assert login_status is LoginStatus.SUCCESS
+    await db_session.refresh(verified_user)
+    assert verified_user.failed_login_attempts == 0
+    assert len(last_login_buffer) == 0
@@ -0,0 +1,32 @@
+import pytest
+from pydantic import ValidationError
+from settings.config import get_settings, override_settings, reload_settings
+
+
+def test_snapshot_is_shared_and_immutable():
+    assert get_settings() is get_settings()
+    with pytest.raises(ValidationError):
+        get_settings().debug = True
+
+def test_override_is_undone_on_exit():
+    original = get_settings()
+    with override_settings(max_login_attempts=99):
+        assert get_settings().max_login_attempts == 99
+        with override_settings(debug=True):
+            assert get_settings().max_login_attempts == 99 and get_settings().debug
+    assert get_settings() is original
+
+def test_reload_swaps_snapshot_and_reports_changes(monkeypatch):
+    with override_settings():
+        before = get_settings()
+        monkeypatch.setenv("USER_EXPORT_BATCH_SIZE", str(before.user_export_batch_size + 1))
+        assert reload_settings() == ["user_export_batch_size"]
+        assert get_settings().user_export_batch_size == before.user_export_batch_size + 1
+
+def test_invalid_reload_keeps_current_snapshot(monkeypatch):
+    with override_settings():
+        current = get_settings()
+        monkeypatch.setenv("DB_POOL_SIZE", "many")
+        with pytest.raises(ValidationError):
+            reload_settings()
+        assert get_settings() is current
@@ -0,0 +1,34 @@
+from builtins import range
+import asyncio
+import threading
+import pytest
+from app.utils.worker_pool import WorkerPool, WorkerPoolFull
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(max_workers=1, max_queue=1)
+    yield pool
+    pool.shutdown()
+
+async def test_run_returns_result_and_records_wait(pool):
+    assert await pool.run(pow, 2, 10) == 1024
+    stats = pool.stats()
+    assert stats["completed"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["wait_seconds"]["count"] == 1
+
+async def test_run_rejects_when_queue_full(pool):
+    release = threading.Event()
+    running = [asyncio.create_task(pool.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert pool.queue_depth == 1
+    with pytest.raises(WorkerPoolFull):
+        await pool.run(release.wait)
+    release.set()
+    await asyncio.gather(*running)
+    assert pool.stats()["rejected"] == 1
+
+def test_invalid_kind():
+    with pytest.raises(ValueError):
+        WorkerPool(max_workers=1, max_queue=0, kind="fiber")